@@ -0,0 +1,162 @@
+# coding: utf-8
+
+"""
+
+    Asyncio Interface for EasyPeasy
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+# Imports
+import asyncio
+import functools
+
+from easymoney.money import EasyPeasy
+
+# The loop running the current coroutine (``get_running_loop()`` was added in Python 3.7).
+_running_loop = getattr(asyncio, 'get_running_loop', asyncio.get_event_loop)
+
+
+class AsyncEasyPeasy(object):
+    """
+
+    | An ``asyncio`` interface to ``EasyPeasy()``.
+    |
+    | Downloading and parsing data, as well as all computations, are performed in an executor,
+    | so the event loop is never blocked. Concurrent requests to load (or refresh) the same data
+    | share a single in-flight load.
+    |
+    | Usage: ``aep = await AsyncEasyPeasy.create(fuzzy_threshold=True)``.
+
+    :param easy_peasy: an ``EasyPeasy()`` instance to wrap.
+    :type easy_peasy: ``EasyPeasy``
+    :param executor: the executor used to run blocking work. Defaults to None (the event loop's default executor).
+    :type executor: ``concurrent.futures.Executor`` or ``None``
+    """
+
+    # In-flight loads, of the form {(event loop, EasyPeasy() parameters): future}.
+    _loading = dict()
+
+    def __init__(self, easy_peasy, executor=None):
+        """
+
+        Initialize the ``AsyncEasyPeasy()`` class.
+
+        """
+        self.easy_peasy = easy_peasy
+        self._executor = executor
+        self._refreshing = dict()
+
+    @classmethod
+    async def create(cls, executor=None, **kwargs):
+        """
+
+        Load the data required by ``EasyPeasy()`` without blocking the event loop.
+
+        :param executor: see ``AsyncEasyPeasy()``.
+        :type executor: ``concurrent.futures.Executor`` or ``None``
+        :param kwargs: parameters for ``EasyPeasy()``.
+        :type kwargs: ``dict``
+        :return: an ``AsyncEasyPeasy()`` instance.
+        :rtype: ``AsyncEasyPeasy``
+        """
+        loop = _running_loop()
+        try:
+            key = (loop, tuple(sorted(kwargs.items())))
+            hash(key)
+        except TypeError:
+            key = None
+
+        future = cls._loading.get(key) if key is not None else None
+        if future is None:
+            future = loop.run_in_executor(executor, functools.partial(EasyPeasy, **kwargs))
+            if key is not None:
+                cls._loading[key] = future
+                future.add_done_callback(lambda f: cls._loading.pop(key, None))
+
+        # Shield the shared load from the cancellation of any one awaiter.
+        return cls(await asyncio.shield(future), executor)
+
+    async def _run(self, method, *args, **kwargs):
+        """
+
+        Run a method of the wrapped ``EasyPeasy()`` instance in the executor.
+
+        :param method: a (bound) method.
+        :type method: ``callable``
+        :return: the result of the method.
+        """
+        loop = _running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(method, *args, **kwargs))
+
+    async def refresh(self, exchange=True, inflation=True, incremental=False):
+        """
+
+        Reload the data without blocking the event loop. See ``EasyPeasy().refresh()``.
+        Concurrent calls with the same parameters share a single refresh.
+
+        :return: see ``EasyPeasy().refresh()``.
+        :rtype: ``bool``
+        """
+        key = (exchange, inflation, incremental)
+        future = self._refreshing.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._run(self.easy_peasy.refresh, exchange, inflation, incremental))
+            self._refreshing[key] = future
+            future.add_done_callback(lambda f: self._refreshing.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def region_map(self, *args, **kwargs):
+        """
+
+        See ``EasyPeasy().region_map()``.
+
+        """
+        return await self._run(self.easy_peasy.region_map, *args, **kwargs)
+
+    async def resolve(self, *args, **kwargs):
+        """
+
+        See ``EasyPeasy().resolve()``.
+
+        """
+        return await self._run(self.easy_peasy.resolve, *args, **kwargs)
+
+    async def currency_converter(self, *args, **kwargs):
+        """
+
+        See ``EasyPeasy().currency_converter()``.
+
+        """
+        return await self._run(self.easy_peasy.currency_converter, *args, **kwargs)
+
+    async def inflation(self, *args, **kwargs):
+        """
+
+        See ``EasyPeasy().inflation()``.
+
+        """
+        return await self._run(self.easy_peasy.inflation, *args, **kwargs)
+
+    async def inflation_calculator(self, *args, **kwargs):
+        """
+
+        See ``EasyPeasy().inflation_calculator()``.
+
+        """
+        return await self._run(self.easy_peasy.inflation_calculator, *args, **kwargs)
+
+    async def normalize(self, *args, **kwargs):
+        """
+
+        See ``EasyPeasy().normalize()``.
+
+        """
+        return await self._run(self.easy_peasy.normalize, *args, **kwargs)
+
+    async def options(self, *args, **kwargs):
+        """
+
+        See ``EasyPeasy().options()``.
+
+        """
+        return await self._run(self.easy_peasy.options, *args, **kwargs)
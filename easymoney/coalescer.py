@@ -0,0 +1,215 @@
+# coding: utf-8
+
+"""
+
+    Micro-Batching of Concurrent Conversion Requests
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+# Imports
+import time
+import threading
+
+try:
+    from concurrent.futures import Future
+except ImportError:
+    # Python 2, without the `futures` backport.
+    Future = None
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+
+# Sentinel used to stop the worker thread.
+_STOP = object()
+
+
+class ConversionCoalescer(object):
+    """
+
+    | Collect single currency conversion requests, which may be issued concurrently from many threads
+    | (or coroutines), into small batches and convert each batch with ``EasyPeasy().currency_converter_batch()``.
+    |
+    | A batch is closed once it holds `max_batch` requests or `max_delay` seconds after its first request arrived,
+    | whichever comes first. Results (and exceptions) are identical to those of ``EasyPeasy().currency_converter()``.
+    |
+    | Usage: ``coalescer = ConversionCoalescer(EasyPeasy())``, then
+    |        ``coalescer.currency_converter(100, "USD", "EUR")`` (threads) or
+    |        ``await coalescer.submit_async(100, "USD", "EUR")`` (asyncio).
+
+    :param easy_peasy: the instance used to perform conversions.
+    :type easy_peasy: ``EasyPeasy``
+    :param max_batch: maximum number of requests in a batch. Defaults to 256.
+    :type max_batch: ``int``
+    :param max_delay: maximum number of seconds a request waits for other requests to join its batch.
+                      Defaults to 0.002.
+    :type max_delay: ``float``
+    """
+
+    def __init__(self, easy_peasy, max_batch=256, max_delay=0.002):
+        """
+
+        Initialize the ``ConversionCoalescer()`` class.
+
+        """
+        if Future is None:
+            raise ImportError("\n`ConversionCoalescer` requires `concurrent.futures`.\n\n"
+                              " - python 2: $ pip install futures\n")
+        if not isinstance(max_batch, int) or max_batch < 1:
+            raise ValueError("`max_batch` must be a positive integer.")
+        if not isinstance(max_delay, (float, int)) or max_delay < 0:
+            raise ValueError("`max_delay` must be a non-negative number.")
+
+        self._easy_peasy = easy_peasy
+        self._max_batch = max_batch
+        self._max_delay = max_delay
+
+        # Threading
+        self._queue = queue.Queue()
+        self._thread = None
+        self._closed = False
+        self._start_lock = threading.Lock()
+
+    def _enqueue(self, request):
+        """
+
+        Queue a request, starting the worker thread if required.
+
+        :param request: a tuple of the form ``(future, record, (frequency, how))``.
+        :type request: ``tuple``
+        """
+        with self._start_lock:
+            if self._closed:
+                raise RuntimeError("The coalescer has been closed.")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="EasyPeasyConversionCoalescer")
+                self._thread.daemon = True
+                self._thread.start()
+            self._queue.put(request)
+
+    def submit(self, amount, from_currency, to_currency, date="latest", frequency='daily', how='mean'):
+        """
+
+        Queue a conversion request. See ``EasyPeasy().currency_converter()``.
+
+        :return: a future which will hold the converted amount.
+        :rtype: ``concurrent.futures.Future``
+        """
+        future = Future()
+        self._enqueue((future, (amount, from_currency, to_currency, date), (frequency, how)))
+        return future
+
+    def submit_async(self, amount, from_currency, to_currency, date="latest", frequency='daily', how='mean'):
+        """
+
+        Queue a conversion request from a coroutine. See ``EasyPeasy().currency_converter()``.
+
+        :return: an ``asyncio`` future (bound to the current event loop) which will hold the converted amount.
+        :rtype: ``asyncio.Future``
+        """
+        import asyncio
+        return asyncio.wrap_future(self.submit(amount, from_currency, to_currency, date, frequency, how))
+
+    def currency_converter(self, amount, from_currency, to_currency, date="latest", pretty_print=False,
+                           frequency='daily', how='mean'):
+        """
+
+        A drop-in (blocking) replacement for ``EasyPeasy().currency_converter()``.
+
+        :return: see ``EasyPeasy().currency_converter()``.
+        :rtype: ``float``
+        """
+        if pretty_print:
+            # Printing is performed by the caller's thread, so this request is not batched.
+            return self._easy_peasy.currency_converter(amount, from_currency, to_currency, date, pretty_print,
+                                                       frequency, how)
+        return self.submit(amount, from_currency, to_currency, date, frequency, how).result()
+
+    def _next_batch(self):
+        """
+
+        Block until a request arrives and then collect requests until the batch is full or its window has passed.
+
+        :return: the requests in the batch and whether or not the worker should stop afterwards.
+        :rtype: ``tuple``
+        """
+        item = self._queue.get()
+        if item is _STOP:
+            return [], True
+
+        batch = [item]
+        deadline = time.time() + self._max_delay
+        while len(batch) < self._max_batch:
+            try:
+                remaining = deadline - time.time()
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _convert(self, batch):
+        """
+
+        Convert a batch of requests and hand each result (or exception) to the request's future.
+
+        :param batch: a list of ``(future, record, (frequency, how))`` tuples.
+        :type batch: ``list``
+        """
+        # Drop requests which were cancelled while waiting.
+        batch = [b for b in batch if b[0].set_running_or_notify_cancel()]
+
+        groups = dict()
+        for future, record, resample in batch:
+            groups.setdefault(resample, []).append((future, record))
+
+        for (frequency, how), requests in groups.items():
+            try:
+                results = self._easy_peasy.currency_converter_batch([r for _, r in requests], frequency, how,
+                                                                    return_exceptions=True)
+            except Exception as e:
+                results = [e] * len(requests)
+            for (future, _), result in zip(requests, results):
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def _run(self):
+        """
+
+        Body of the worker thread.
+
+        """
+        stop = False
+        while not stop:
+            batch, stop = self._next_batch()
+            if len(batch):
+                self._convert(batch)
+
+    def close(self, timeout=None):
+        """
+
+        Stop accepting requests and stop the worker thread once all queued requests have been converted.
+
+        :param timeout: maximum number of seconds to wait for the thread to finish. Defaults to None (no limit).
+        :type timeout: ``float``, ``int`` or ``None``
+        """
+        with self._start_lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._thread is not None:
+                self._queue.put(_STOP)
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
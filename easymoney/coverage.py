@@ -0,0 +1,287 @@
+# coding: utf-8
+
+"""
+
+    Indexes of the Data Available in a Snapshot
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+# Imports
+import numpy as np
+
+from easymoney.options_tools import first_last_present
+from easymoney.support_tools import to_epoch_days
+
+
+# Reason codes reported by ``EasyPeasy().batch_preflight()``.
+# Rows with the codes in ``FALL_BACK_REASONS`` can be served if falling back to the closest date (year) is enabled.
+PREFLIGHT_REASONS = ('ok', 'unknown_currency', 'invalid_date', 'unknown_region', 'invalid_year',
+                     'no_rate_on_date', 'no_cpi_for_year')
+FALL_BACK_REASONS = ('no_rate_on_date', 'no_cpi_for_year')
+
+
+def epoch_days_to_years(days):
+    """
+
+    Vectorized conversion of days since 01/01/1970 into years.
+
+    :param days: days since the epoch.
+    :type days: ``ndarray``
+    :return: the years.
+    :rtype: ``ndarray``
+    """
+    return np.asarray(days, dtype='int64').astype('datetime64[D]').astype('datetime64[Y]').astype('int64') + 1970
+
+
+def availability_bitmaps(rate_matrix):
+    """
+
+    | Summarize, for each currency, the dates for which an exchange rate was reported as a bitmap over the date axis
+    | (i.e., the rows of `rate_matrix`), packed eight dates to a byte.
+    |
+    | Together with the first and last row for which each currency has a rate, this replaces lists of date strings:
+    | checking whether a rate was reported on a given day is a single bit test.
+
+    :param rate_matrix: a (date x currency) matrix of exchange rates (NaN where no rate was reported).
+    :type rate_matrix: ``ndarray``
+    :return: a (currency x bytes) array of bitmaps, as well as the first and last row with a rate for each
+             currency (-1 for currencies without any).
+    :rtype: ``tuple``
+    """
+    has, first, last = first_last_present(rate_matrix)
+    bits = np.packbits(~np.isnan(rate_matrix.T), axis=1)
+    return bits, np.where(has, first, -1), np.where(has, last, -1)
+
+
+def bitmap_contains(bitmap, row):
+    """
+
+    Check whether the bit for a given row is set in a (packed) bitmap.
+
+    :param bitmap: a bitmap, as returned by ``availability_bitmaps()``.
+    :type bitmap: ``ndarray``
+    :param row: a row.
+    :type row: ``int``
+    :return: True if the bit is set, else False.
+    :rtype: ``bool``
+    """
+    return bool((bitmap[row >> 3] >> (7 - (row & 7))) & 1)
+
+
+def closest_available(bitmap, axis, day, first, last):
+    """
+
+    Find the row of the closest day (to `day`) for which the bit in `bitmap` is set.
+    Ties are resolved in favour of the earlier day.
+
+    :param bitmap: a bitmap, as returned by ``availability_bitmaps()``.
+    :type bitmap: ``ndarray``
+    :param axis: the date axis (days since the epoch, ascending).
+    :type axis: ``ndarray``
+    :param day: days since the epoch.
+    :type day: ``int``
+    :param first: the first row for which the bit is set.
+    :type first: ``int``
+    :param last: the last row for which the bit is set.
+    :type last: ``int``
+    :return: the row.
+    :rtype: ``int``
+    """
+    if day <= axis[first]:
+        return int(first)
+    elif day >= axis[last]:
+        return int(last)
+    position = int(np.searchsorted(axis, day))
+    present = np.unpackbits(bitmap, count=axis.size).view(bool)
+    after = position + int(np.argmax(present[position:last + 1]))
+    before = position - 1 - int(np.argmax(present[first:position][::-1]))
+    return before if day - axis[before] <= axis[after] - day else after
+
+
+class CoverageIndex(object):
+    """
+
+    | Precomputed summary of the data held by a ``DataSnapshot()``, which answers availability questions
+    | (e.g., "which regions have inflation and exchange rate information from 2005 to 2015?") with a handful of
+    | array operations, i.e., without building the ``options()`` table.
+    |
+    | Regions are summarized by the first and last year for which they have inflation (CPI) information and
+    | for which one of their currencies has an exchange rate; currencies by the first and last day for which
+    | they have an exchange rate.
+
+    :param snapshot: the snapshot to index.
+    :type snapshot: ``DataSnapshot``
+    :param regions: ISO alpha 2 country codes.
+    :type regions: ``iterable``
+    :param alpha2_currency_dict: a dictionary mapping alpha2 codes to (lists of) currencies.
+    :type alpha2_currency_dict: ``dict``
+    :param summary: if supplied, the index is built from this summary of the data, rather than from the matrices of
+                    `snapshot`: a tuple of the form ``({currency: (first day, last day)}, {alpha2: (first year,
+                    last year)})``, e.g., as returned by ``SQLiteSnapshot().coverage_summary()``. Defaults to None.
+    :type summary: ``tuple``
+    :param currencies_on: if supplied, a function which finds the currencies with an exchange rate on a given day
+                          (see ``currencies_with()``), used instead of the rate matrix of `snapshot`. Defaults to None.
+    :type currencies_on: ``callable``
+
+    .. note::
+
+        ``rates_reported()`` and ``cpi_reported()`` always use the matrices of `snapshot`.
+    """
+
+    def __init__(self, snapshot, regions, alpha2_currency_dict, summary=None, currencies_on=None):
+        """
+
+        Initialize the ``CoverageIndex()`` class.
+
+        """
+        self.snapshot = snapshot
+        self.regions = np.array(sorted(regions), dtype=object)
+        self._currencies_on = currencies_on
+
+        if summary is None:
+            # Currencies, in the order of the columns of the rate matrix.
+            self.currencies = np.array(sorted(snapshot.currency_index, key=snapshot.currency_index.get), dtype=object)
+            _, first_row, last_row = snapshot.currency_availability
+            self.has_rate = last_row >= 0
+            axis = snapshot.date_axis
+            self.rate_first_day = axis[np.maximum(first_row, 0)] if len(axis) else first_row
+            self.rate_last_day = axis[np.maximum(last_row, 0)] if len(axis) else last_row
+
+            # Years for which each region has inflation information.
+            has_cpi, first_row, last_row = first_last_present(snapshot.cpi_matrix)
+            cpi_years = np.array(snapshot.cpi_years, dtype='int64')
+            columns = np.array([snapshot.region_index.get(a, -1) for a in self.regions], dtype='int64')
+            if has_cpi.size and cpi_years.size:
+                columns_present = np.maximum(columns, 0)
+                self.has_inflation = (columns >= 0) & has_cpi[columns_present]
+                first_year, last_year = cpi_years[first_row[columns_present]], cpi_years[last_row[columns_present]]
+            else:
+                self.has_inflation = np.zeros(self.regions.size, dtype=bool)
+                first_year = last_year = 0
+        else:
+            currency_ranges, region_ranges = summary
+            self.currencies = np.array(sorted(currency_ranges), dtype=object)
+            self.has_rate = np.ones(self.currencies.size, dtype=bool)
+            self.rate_first_day = np.array([currency_ranges[c][0] for c in self.currencies], dtype='int64')
+            self.rate_last_day = np.array([currency_ranges[c][1] for c in self.currencies], dtype='int64')
+
+            self.has_inflation = np.array([a in region_ranges for a in self.regions], dtype=bool)
+            first_year = np.array([region_ranges.get(a, (0, 0))[0] for a in self.regions], dtype='int64')
+            last_year = np.array([region_ranges.get(a, (0, 0))[1] for a in self.regions], dtype='int64')
+        self.inflation_first_year = np.where(self.has_inflation, first_year, 0)
+        self.inflation_last_year = np.where(self.has_inflation, last_year, 0)
+
+        # Years for which (any of) each region's currencies has an exchange rate.
+        rate_first_year, rate_last_year = epoch_days_to_years(self.rate_first_day), \
+                                          epoch_days_to_years(self.rate_last_day)
+        currency_index = {c: i for i, c in enumerate(self.currencies)}
+        first_years, last_years = list(), list()
+        for a in self.regions:
+            currency_columns = [currency_index[c.upper()] for c in alpha2_currency_dict.get(a, [])
+                                if c.upper() in currency_index and self.has_rate[currency_index[c.upper()]]]
+            first_years.append(min(rate_first_year[currency_columns]) if len(currency_columns) else 0)
+            last_years.append(max(rate_last_year[currency_columns]) if len(currency_columns) else 0)
+        self.exchange_first_year = np.array(first_years, dtype='int64')
+        self.exchange_last_year = np.array(last_years, dtype='int64')
+        self.has_exchange = self.exchange_last_year > 0
+
+    def regions_with(self, start_year=None, end_year=None, info='all'):
+        """
+
+        Find the regions with data from `start_year` to `end_year` (inclusive).
+
+        :param start_year: the first year which must be covered. Defaults to None (no limit).
+        :type start_year: ``int`` or ``None``
+        :param end_year: the last year which must be covered. Defaults to None (no limit).
+        :type end_year: ``int`` or ``None``
+        :param info: 'inflation', 'exchange' or 'all' (both). Defaults to 'all'.
+        :type info: ``str``
+        :return: ISO alpha 2 country codes (sorted).
+        :rtype: ``list``
+        """
+        if info not in ('inflation', 'exchange', 'all'):
+            raise ValueError("`info` must be one of: 'inflation', 'exchange' or 'all'.")
+        mask = np.ones(self.regions.size, dtype=bool)
+        for kind, has, first, last in (('inflation', self.has_inflation, self.inflation_first_year,
+                                        self.inflation_last_year),
+                                       ('exchange', self.has_exchange, self.exchange_first_year,
+                                        self.exchange_last_year)):
+            if info in (kind, 'all'):
+                mask &= has
+                if start_year is not None:
+                    mask &= first <= int(start_year)
+                if end_year is not None:
+                    mask &= last >= int(end_year)
+        return self.regions[mask].tolist()
+
+    def currencies_with(self, date=None, start_date=None, end_date=None):
+        """
+
+        Find the currencies with an exchange rate on `date`, or from `start_date` to `end_date` (inclusive).
+
+        :param date: a date (see ``to_epoch_days()``) on which a rate must have been reported. Defaults to None.
+        :type date: ``str``, ``datetime`` or ``None``
+        :param start_date: a date; the first rate reported must not be later. Defaults to None.
+        :type start_date: ``str``, ``datetime`` or ``None``
+        :param end_date: a date; the last rate reported must not be earlier. Defaults to None.
+        :type end_date: ``str``, ``datetime`` or ``None``
+        :return: currency codes (sorted).
+        :rtype: ``list``
+        """
+        if date is not None:
+            if start_date is not None or end_date is not None:
+                raise ValueError("`date` cannot be combined with `start_date` or `end_date`.")
+            day = to_epoch_days(date)
+            if self._currencies_on is not None:
+                return self._currencies_on(day)
+            axis = self.snapshot.date_axis
+            row = int(np.searchsorted(axis, day))
+            if row == len(axis) or axis[row] != day:
+                return list()
+            return self.currencies[~np.isnan(self.snapshot.rate_matrix[row])].tolist()
+
+        mask = self.has_rate.copy()
+        if start_date is not None:
+            mask &= self.rate_first_day <= to_epoch_days(start_date)
+        if end_date is not None:
+            mask &= self.rate_last_day >= to_epoch_days(end_date)
+        return self.currencies[mask].tolist()
+
+    def rates_reported(self, days, columns):
+        """
+
+        Vectorized check of whether daily exchange rates were reported.
+
+        :param days: days since the epoch, with shape ``(n,)``.
+        :type days: ``ndarray``
+        :param columns: columns of the rate matrix, with shape ``(n, k)`` (negative for none).
+        :type columns: ``ndarray``
+        :return: a boolean array with shape ``(n, k)``; True where a rate was reported for the currency on the day.
+        :rtype: ``ndarray``
+        """
+        return self._reported(self.snapshot.date_axis, self.snapshot.rate_matrix, days, columns)
+
+    def cpi_reported(self, years, columns):
+        """
+
+        Vectorized check of whether inflation (CPI) information was reported.
+
+        :param years: years, with shape ``(n,)``.
+        :type years: ``ndarray``
+        :param columns: columns of the CPI matrix, with shape ``(n, k)`` (negative for none).
+        :type columns: ``ndarray``
+        :return: a boolean array with shape ``(n, k)``; True where CPI information is available for the region
+                 in the year.
+        :rtype: ``ndarray``
+        """
+        return self._reported(np.array(self.snapshot.cpi_years, dtype='int64'), self.snapshot.cpi_matrix,
+                              years, columns)
+
+    @staticmethod
+    def _reported(axis, matrix, keys, columns):
+        keys, columns = np.asarray(keys, dtype='int64'), np.asarray(columns, dtype='int64')
+        if not axis.size or not matrix.shape[1]:
+            return np.zeros(columns.shape, dtype=bool)
+        rows = np.minimum(np.searchsorted(axis, keys), axis.size - 1)
+        values = matrix[rows[:, None], np.maximum(columns, 0)]
+        return (axis[rows] == keys)[:, None] & (columns >= 0) & ~np.isnan(values)
@@ -65,46 +65,10 @@ def _pandas_dictkey_to_key_unpack(pandas_series, unpack_dict, convert_values_to_
     return pandas_series.replace(unpack_dict).map(lambda x: np.NaN if 'nan' in pstr(x) else strlist_to_list(pstr(x)))
 
 
-def _standard_pd_nester(data_frame, nest_col_a, nest_col_b, nest_col_c, keys_to_str=True):
+def _pd_nester(data_frame, nest_col_a, nest_col_b, nest_col_c, keys_to_str=True):
     """
 
-    Method to produce a nested dict from a large pandas dataframe.
-    Reliable technique (although slow with large DataFrames).
-
-    :param data_frame: see ``twoD_nested_dict()``.
-    :type data_frame: ``Pandas DataFrame``
-    :param nest_col_a: see ``twoD_nested_dict()``.
-    :type nest_col_a: ``str``
-    :param nest_col_b: see ``twoD_nested_dict()``.
-    :type nest_col_b: ``str``
-    :param nest_col_c: see ``twoD_nested_dict()``.
-    :type nest_col_c: ``str``
-    :param keys_to_str: see ``twoD_nested_dict()``.
-    :type keys_to_str: ``bool``
-    :return: nested dict of the form: ``{nest_col_a: {nest_col_b: nest_col_c}}``.
-    :rtype: dict
-    """
-    # Initialize
-    df_slice = None
-
-    # Make columns that are to become keys strings.
-    if keys_to_str:
-        data_frame[nest_col_a] = data_frame[nest_col_a].astype(str).str.upper()
-        data_frame[nest_col_b] = data_frame[nest_col_b].astype(str)
-
-    # Create a dict from keys()
-    nested_dict = dict.fromkeys(data_frame[nest_col_a].unique())
-    for k in nested_dict.keys():
-        df_slice = data_frame[data_frame[nest_col_a] == k]
-        nested_dict[k] = dict(zip(df_slice[nest_col_b], df_slice[nest_col_c]))
-
-    return nested_dict
-
-
-def _fast_pd_nester(data_frame, nest_col_a, nest_col_b, nest_col_c, keys_to_str=True):
-    """
-
-    | This is a fast way to produce a nested dict from a large Pandas DataFrames.
+    | Produce a nested dict from a pandas dataframe in a single pass over its rows, i.e., in O(n) time.
     | Can handle DataFrames with several nest_col_a entries that are the same,
     | e.g.,
     |         nest_col_a    nest_col_b  nest_col_c
@@ -113,39 +77,36 @@ def _fast_pd_nester(data_frame, nest_col_a, nest_col_b, nest_col_c, keys_to_str=
     | 2       1999-01-05      CHF          2
     | 3       1999-01-05      CYP          3
     |
-    | WARNING: Not well-tested. This procedure may produce inaccuracies.
+    | Keys appear in the order they are first encountered. If a (nest_col_a, nest_col_b) pair occurs more than once,
+    | the last value is kept.
 
     :param data_frame: see ``twoD_nested_dict()``.
-    :type data_frame: Pandas DataFrame
+    :type data_frame: ``Pandas DataFrame``
     :param nest_col_a: see ``twoD_nested_dict()``.
-    :type nest_col_a: str
+    :type nest_col_a: ``str``
     :param nest_col_b: see ``twoD_nested_dict()``.
-    :type nest_col_b: str
+    :type nest_col_b: ``str``
     :param nest_col_c: see ``twoD_nested_dict()``.
-    :type nest_col_c: str
+    :type nest_col_c: ``str``
     :param keys_to_str: see ``twoD_nested_dict()``.
     :type keys_to_str: ``bool``
-    :return: nested dict of the form {nest_col_a: {nest_col_b: nest_col_c}}.
-    :rtype: dict
+    :return: nested dict of the form: ``{nest_col_a: {nest_col_b: nest_col_c}}``.
+    :rtype: ``dict``
     """
-    # Group nest_col_b and nest_col_c by nest_col_a
-    col_b_groupby = data_frame.groupby(nest_col_a)[nest_col_b].apply(lambda x: x.tolist()).reset_index()
-    col_c_groupby = data_frame.groupby(nest_col_a)[nest_col_c].apply(lambda x: x.tolist()).reset_index()
+    keys_a, keys_b = data_frame[nest_col_a], data_frame[nest_col_b]
 
-    # Merge on nest_col_a
-    grouped_data_frame = pd.merge(col_b_groupby, col_c_groupby, on=nest_col_a, how='outer')
-
-    # Convert columns that will become keys to a string
+    # Make columns that are to become keys strings.
     if keys_to_str:
-        grouped_data_frame[nest_col_a] = grouped_data_frame[nest_col_a].astype(str)
-        grouped_data_frame[nest_col_b] = grouped_data_frame[nest_col_b].map(lambda x: [pstr(i) for i in x])
+        keys_a, keys_b = keys_a.astype(str).str.upper(), keys_b.astype(str)
 
-    # Generate a dictionary by zipping the nest_col_b and nest_col_c columns
-    grouped_data_frame['dict_zipped'] = grouped_data_frame[[nest_col_b, nest_col_c]].apply(
-        lambda x: dict(zip(x[0], x[1])), axis=1)
+    nested_dict = dict()
+    for a, b, c in zip(keys_a.tolist(), keys_b.tolist(), data_frame[nest_col_c].tolist()):
+        inner = nested_dict.get(a)
+        if inner is None:
+            inner = nested_dict[a] = dict()
+        inner[b] = c
 
-    # Return as a nested dict
-    return dict(zip(grouped_data_frame[nest_col_a], grouped_data_frame['dict_zipped']))
+    return nested_dict
 
 
 def twoD_nested_dict(data_frame
@@ -179,17 +140,24 @@ def twoD_nested_dict(data_frame
     :param keys_to_str: Convert the columns that will become keys to strings. Default to True.
                         WARNING: will OVERRIDE *to_float* and *to_int* if they reference nest_col_a or nest_col_b.
     :type keys_to_str: ``bool``
-    :param engine: 'standard' for a slower (but well-tested) method of generating a nested dict; 'fast' to employ a
-                    speedy (but *not well-tested*) method for generating a nested dict. Default to 'standard'.
+    :param engine: retained for compatibility; 'standard' and 'fast' now use the same (single pass) method.
+                   Default to 'standard'.
     :type engine: ``str``
     :return: nested dict of the form: ``{nest_col_a: {nest_col_b: nest_col_c}``.
     :rtype: ``dict``
     """
+    if engine not in ('standard', 'fast'):
+        raise ValueError("`engine` must be one of: 'standard' or 'fast'.")
+
     if all(v is None for v in [nest_col_a, nest_col_b, nest_col_c]):
         nest_col_a = data_frame.columns[0]
         nest_col_b = data_frame.columns[1]
         nest_col_c = data_frame.columns[2]
 
+    # Cast columns on a copy (so `data_frame` itself is left unaltered).
+    if to_float != None or to_int != None:
+        data_frame = data_frame.copy()
+
     # Convert selected columns to float
     if to_float != None:
         for i in to_float: data_frame[i] = data_frame[i].astype(float)
@@ -198,12 +166,7 @@ def twoD_nested_dict(data_frame
     if to_int != None:
         for j in to_int: data_frame[j] = data_frame[j].astype(int)
 
-    # Use one of two engines to generate the nested dict
-    if engine == 'standard':
-        return _standard_pd_nester(data_frame, nest_col_a, nest_col_b, nest_col_c, keys_to_str)
-
-    elif engine == 'fast':
-        return _fast_pd_nester(data_frame, nest_col_a, nest_col_b, nest_col_c, keys_to_str)
+    return _pd_nester(data_frame, nest_col_a, nest_col_b, nest_col_c, keys_to_str)
 
 
 def pandas_list_column_to_str(data_frame, columns, join_on=", ", bracket_wrap=False):
@@ -0,0 +1,97 @@
+# coding: utf-8
+
+"""
+
+    Handles for Resolved Regions and Currencies
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+# Imports
+import weakref
+
+
+class ResolvedEntity(object):
+    """
+
+    | A region or currency resolved by ``EasyPeasy().resolve()``.
+    |
+    | Handles hold the ISO alpha 2 and alpha 3 codes of a region (None if the entity is only a currency)
+    | and its currency code, so they can be passed in place of a region or currency to any method of
+    | ``EasyPeasy()`` without looking the entity up again. The column of the region in the CPI matrix and that of
+    | the currency in the rate matrix are computed for each snapshot of data the first time it is used.
+
+    :param name: the region or currency which was resolved.
+    :type name: ``str``
+    :param alpha2: ISO alpha 2 country code.
+    :type alpha2: ``str`` or ``None``
+    :param alpha3: ISO alpha 3 country code.
+    :type alpha3: ``str`` or ``None``
+    :param currency: ISO alpha 3 currency code.
+    :type currency: ``str`` or ``None``
+    """
+
+    __slots__ = ('name', 'alpha2', 'alpha3', 'currency', '_binding')
+
+    def __init__(self, name, alpha2, alpha3, currency):
+        """
+
+        Initialize the ``ResolvedEntity()`` class.
+
+        """
+        self.name = name
+        self.alpha2 = alpha2
+        self.alpha3 = alpha3
+        self.currency = currency
+
+        # Of the form (weak reference to the snapshot, cpi_column, rate_column); replaced as a whole so readers always
+        # see columns computed for the same snapshot. The reference is weak, so handles which outlive a refresh
+        # do not keep the previous snapshot alive.
+        self._binding = None
+
+    def __reduce__(self):
+        # The columns are recomputed (rather than pickled along with the snapshot they refer to).
+        return ResolvedEntity, (self.name, self.alpha2, self.alpha3, self.currency)
+
+    def __repr__(self):
+        return "ResolvedEntity(name=%r, alpha2=%r, alpha3=%r, currency=%r)" % (
+            self.name, self.alpha2, self.alpha3, self.currency)
+
+    def __str__(self):
+        return str(self.name)
+
+    def columns(self, snapshot):
+        """
+
+        Get the columns of the entity in a snapshot's CPI and rate matrices.
+
+        :param snapshot: a snapshot of data.
+        :type snapshot: ``DataSnapshot``
+        :return: the column of the region in ``snapshot.cpi_matrix`` and that of the currency in
+                 ``snapshot.rate_matrix`` (None where absent).
+        :rtype: ``tuple``
+        """
+        binding = self._binding
+        if binding is None or binding[0]() is not snapshot:
+            binding = (weakref.ref(snapshot),
+                       snapshot.region_index.get(self.alpha2) if self.alpha2 is not None else None,
+                       snapshot.currency_index.get(self.currency) if self.currency is not None else None)
+            self._binding = binding
+        return binding[1], binding[2]
+
+    @property
+    def cpi_column(self):
+        """
+
+        The column of the region in the CPI matrix of the snapshot the handle was last used with.
+
+        """
+        return self._binding[1] if self._binding is not None else None
+
+    @property
+    def rate_column(self):
+        """
+
+        The column of the currency in the rate matrix of the snapshot the handle was last used with.
+
+        """
+        return self._binding[2] if self._binding is not None else None
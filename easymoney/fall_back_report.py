@@ -0,0 +1,147 @@
+# coding: utf-8
+
+"""
+
+    Aggregated Reports of the Fall Backs Made by EasyPeasy
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+# Imports
+import threading
+import pandas as pd
+from collections import defaultdict
+from contextlib import contextmanager
+
+
+class FallBackReport(object):
+    """
+
+    | Thread-safe tally of the fall backs made by ``EasyPeasy()``, i.e., each time data for the closest date
+    | (period or year) was used because no data was available for the one requested.
+    |
+    | Fall backs are counted by type ('exchange' or 'inflation'), currency (region) as well as the date requested
+    | and the date used, so recording one costs a dictionary update rather than formatting a warning.
+    | Each thread counts in its own dictionary, so recording a fall back never takes a lock; the dictionaries are
+    | only merged when the report is read. Reports can also be collected for a single block of work in a given
+    | thread (see ``collect()``).
+
+    """
+
+    def __init__(self):
+        """
+
+        Initialize the ``FallBackReport()`` class.
+
+        """
+        self._local = threading.local()
+
+        # Of the form [(thread, counts)], with the counts of threads which have finished merged into `_retired`.
+        self._thread_counts = list()
+        self._retired = defaultdict(int)
+
+        # Counts as of the last reset (subtracted from those reported).
+        self._offset = dict()
+
+        # Taken when a thread records its first fall back and when the report is read.
+        self._lock = threading.Lock()
+
+    def _counts_for_thread(self):
+        """
+
+        Get the dictionary in which the current thread counts fall backs (created on its first fall back).
+
+        :return: a dictionary of the form ``{(kind, key, requested, used): count}``.
+        :rtype: ``defaultdict``
+        """
+        counts = defaultdict(int)
+        with self._lock:
+            self._thread_counts.append((threading.current_thread(), counts))
+        self._local.counts = counts
+        return counts
+
+    def record(self, kind, key, requested, used):
+        """
+
+        Record a fall back.
+
+        :param kind: 'exchange' or 'inflation'.
+        :type kind: ``str``
+        :param key: the currency (or region) concerned.
+        :type key: ``str``
+        :param requested: the date (period or year) requested.
+        :type requested: ``str`` or ``int``
+        :param used: the date (period or year) used instead.
+        :type used: ``str`` or ``int``
+        """
+        entry = (kind, key, str(requested), str(used))
+        counts = getattr(self._local, 'counts', None)
+        if counts is None:
+            counts = self._counts_for_thread()
+        counts[entry] += 1
+        for collector in getattr(self._local, 'collectors', ()):
+            collector[entry] += 1
+
+    @contextmanager
+    def collect(self):
+        """
+
+        Collect the fall backs recorded by the current thread while the block is executed (in addition to
+        recording them in this report).
+
+        :return: a dictionary of the form ``{(kind, key, requested, used): count}``, filled as the block runs.
+        :rtype: ``dict``
+        """
+        collector = defaultdict(int)
+        collectors = getattr(self._local, 'collectors', ())
+        self._local.collectors = collectors + (collector,)
+        try:
+            yield collector
+        finally:
+            self._local.collectors = collectors
+
+    def counts(self, reset=False):
+        """
+
+        Get the fall backs recorded.
+
+        :param reset: if True, clear the report afterwards. Defaults to False.
+        :type reset: ``bool``
+        :return: a dictionary of the form ``{(kind, key, requested, used): count}``.
+        :rtype: ``dict``
+        """
+        with self._lock:
+            # Note: copying a dictionary is atomic, so the owning thread may keep counting while it is read.
+            live = list()
+            for thread, counts in self._thread_counts:
+                if thread.is_alive():
+                    live.append((thread, counts))
+                else:
+                    for entry, count in dict(counts).items():
+                        self._retired[entry] += count
+            self._thread_counts = live
+
+            total = defaultdict(int, self._retired)
+            for _, counts in live:
+                for entry, count in dict(counts).items():
+                    total[entry] += count
+
+            offset = self._offset
+            if reset:
+                self._offset = dict(total)
+        return {k: v - offset.get(k, 0) for k, v in total.items() if v > offset.get(k, 0)}
+
+
+def fall_back_frame(counts):
+    """
+
+    Tabulate fall back counts.
+
+    :param counts: a dictionary of the form ``{(kind, key, requested, used): count}``.
+    :type counts: ``dict``
+    :return: a dataframe with the columns 'Type', 'Key', 'Requested', 'Used' and 'Count' (most frequent first).
+    :rtype: ``Pandas DataFrame``
+    """
+    columns = ['Type', 'Key', 'Requested', 'Used', 'Count']
+    fall_back_df = pd.DataFrame([k + (v,) for k, v in counts.items()], columns=columns)
+    return fall_back_df.sort_values(['Count', 'Type', 'Key', 'Requested'], ascending=[False, True, True, True]
+                                    ).reset_index(drop=True)
@@ -7,6 +7,7 @@
 
 """
 # Imports
+import bisect
 import pycountry
 import numpy as np
 import pandas as pd
@@ -18,29 +19,49 @@ from datetime import datetime
 # Support Tools
 from easymoney.support_tools import mint
 from easymoney.support_tools import min_max
-from easymoney.support_tools import closest_date
 from easymoney.support_tools import year_extract
 from easymoney.support_tools import min_max_dates
-from easymoney.support_tools import closest_value
-from easymoney.support_tools import fast_date_range
 from easymoney.support_tools import date_format_check
-from easymoney.support_tools import sort_range_reverse
+from easymoney.support_tools import to_epoch_days
+from easymoney.support_tools import is_datetime_like
+from easymoney.support_tools import epoch_days_to_date
 
 # Pycountry Wrap
 from easymoney.pycountry_wrap import PycountryWrap
 
 # options_tools
-from easymoney.options_tools import options_ranking
+from easymoney.options_tools import options_rankings
+from easymoney.options_tools import closest_sorted
 from easymoney.options_tools import year_date_overlap
-from easymoney.options_tools import alpha2_by_cpi_years
+from easymoney.options_tools import epoch_days_to_labels
+
+# Resample Tools
+from easymoney.resample_tools import period_key
+from easymoney.resample_tools import closest_period
+from easymoney.resample_tools import RESAMPLE_HOWS
+from easymoney.resample_tools import RESAMPLE_FREQUENCIES
 
 # Easy Pandas
-from easymoney.easy_pandas import pandas_null_drop
 from easymoney.easy_pandas import pandas_pretty_print
 
-# Online Data Sources
-from easymoney.sources.ecb_interface import ecb_xml_exchange_data
-from easymoney.sources.world_bank_interface import world_bank_pull
+# Data Snapshots
+from easymoney.entity import ResolvedEntity
+from easymoney.coverage import CoverageIndex
+from easymoney.coverage import bitmap_contains
+from easymoney.coverage import closest_available
+from easymoney.coverage import FALL_BACK_REASONS
+from easymoney.coverage import PREFLIGHT_REASONS
+from easymoney.fall_back_report import FallBackReport
+from easymoney.fall_back_report import fall_back_frame
+from easymoney.snapshot import read_snapshot
+from easymoney.snapshot import build_snapshot
+from easymoney.snapshot import write_snapshot
+from easymoney.snapshot import SQLiteSnapshot
+from easymoney.sqlite_store import SQLiteStore
+from easymoney.registry import DATA_REGISTRY
+from easymoney.registry import load_shared_data
+from easymoney.sources.ecb_interface import ECB_URL
+from easymoney.sources.world_bank_interface import CPI_INDICATOR
 
 
 class EasyPeasy(object):
@@ -66,20 +87,103 @@ class EasyPeasy(object):
     :type fuzzy_threshold: ``int``, ``float`` or ``bool``
     :param data_path: alternative path to the database file(s). Defaults to None.
     :type data_path: ``str``
+    :param ecb_url: alternative URL for the European Central Bank's website, e.g., a mirror.
+                    Defaults to None (``"http://www.ecb.europa.eu/"``).
+    :type ecb_url: ``str``
+    :param snapshot_path: path to a snapshot file (see ``save_snapshot()``) to load all data from, rather than from
+                          the European Central Bank and the World Bank. ``refresh()`` then reloads this file.
+                          Defaults to None.
+    :type snapshot_path: ``str``
+    :param sqlite_path: path to a SQLite database (created if required) in which to keep the data. If the database
+                        already holds data, nothing is downloaded when the instance is created. ``refresh()`` upserts
+                        new data into it, and ``exchange_rates()`` queries it directly. Conversions (and inflation)
+                        only read the data for the currencies and regions involved (see ``SQLiteSnapshot()``), and
+                        ``options()``, ``available_regions()`` and ``available_currencies()`` are answered with
+                        aggregate queries; only ``options(range_table_dates=False)`` reads all of it.
+                        Defaults to None.
+    :type sqlite_path: ``str``
+    :param shared: if True, share the data loaded (and any refreshes of it) with every other instance in this process
+                   using the same sources and `data_path`, so only the first such instance downloads it. The data is
+                   kept until every such instance has been closed (see ``close()``) or garbage collected.
+                   If False, the instance loads (and refreshes) a private copy of the data. Defaults to True.
+    :type shared: ``bool``
+    :param ecb_source: path to (or URL of) a copy of the European Central Bank's exchange rate information, used
+                       instead of `ecb_url`: an XML file (e.g., 'eurofxref-hist.xml'), a CSV file or a ZIP archive
+                       containing either (e.g., 'eurofxref-hist.zip', which is far faster to load than the XML).
+                       ``refresh()`` rereads the file if it has been modified. Defaults to None.
+    :type ecb_source: ``str``
+    :param world_bank_source: path to a local copy of the World Bank's CPI information, used instead of its API:
+                              a JSON file (as returned by the API) or a CSV file. ``refresh()`` rereads the file
+                              if it has been modified. Alternatively, a dictionary of the form ``{indicator: path}``
+                              (CPI information is ``"FP.CPI.TOTL"``), e.g., for `indicators`. Defaults to None.
+    :type world_bank_source: ``str`` or ``dict``
+    :param indicators: World Bank Indicators to load (concurrently) in addition to CPI information, e.g.,
+                       ``["NY.GDP.DEFL.ZS"]`` (the GDP deflator). Each can be used in place of CPI information via the
+                       `deflator` parameter of ``inflation()``, ``inflation_calculator()`` and ``normalize()``.
+                       Defaults to None.
+    :type indicators: ``list`` or ``tuple``
+    :param currencies: if supplied, only load exchange rates for these currency codes (e.g., ``["USD", "CAD"]``).
+                       Other rates are skipped while the data is parsed, so less memory (and time) is required.
+                       Defaults to None (all currencies).
+    :type currencies: ``str``, ``list`` or ``tuple``
+    :param regions: if supplied, only load CPI information (and the data for `indicators`) for these ISO alpha 2
+                    country codes (e.g., ``["US", "CA"]``). Defaults to None (all regions).
+    :type regions: ``str``, ``list`` or ``tuple``
+    :param start_date: if supplied, only load exchange rates from this date (DD/MM/YYYY, a datetime or a year) on,
+                       and inflation information from its year on. Defaults to None (no limit).
+    :type start_date: ``str``, ``datetime`` or ``int``
+    :param end_date: as `start_date`, but the latest date to load. Defaults to None (no limit).
+    :type end_date: ``str``, ``datetime`` or ``int``
+    :param fall_back_warnings: if True, warn the first time `fall_back` is used for each currency (region); later
+                               fall backs for it are only recorded. Fall backs are always recorded (see
+                               ``fall_back_report()``), so warnings can be disabled altogether for large batches.
+                               Defaults to True.
+    :type fall_back_warnings: ``bool``
+
+    .. note::
+
+        Snapshot files (`snapshot_path`) are always loaded in full, i.e., `currencies`, `regions`, `start_date`
+        and `end_date` only apply to data loaded from the European Central Bank and the World Bank (or local copies).
     """
 
     # Fix: `EasyPeasy()` does not handle currencies like 'EEK' properly.
     #       They may not been appearing in options() correctly.
     #       See: _user_currency_input() below.
 
-    def __init__(self, precision=2, fall_back=True, fuzzy_threshold=False, data_path=None):
+    def __init__(self, precision=2, fall_back=True, fuzzy_threshold=False, data_path=None, ecb_url=None,
+                 snapshot_path=None, sqlite_path=None, shared=True, ecb_source=None, world_bank_source=None,
+                 indicators=None, currencies=None, regions=None, start_date=None, end_date=None,
+                 fall_back_warnings=True):
         """
 
         Initialize the ``EasyPeasy()`` class.
 
         """
+        self._initialize(precision, fall_back, fuzzy_threshold, data_path, ecb_url, snapshot_path, sqlite_path, shared,
+                         ecb_source, world_bank_source, indicators, currencies, regions, start_date, end_date,
+                         fall_back_warnings)
+
+    def _initialize(self, precision, fall_back, fuzzy_threshold, data_path, ecb_url, snapshot_path, sqlite_path,
+                    shared, ecb_source=None, world_bank_source=None, indicators=None, currencies=None, regions=None,
+                    start_date=None, end_date=None, fall_back_warnings=True, snapshot=None):
+        """
+
+        Configure the instance and obtain its data. See ``EasyPeasy()``.
+
+        :param snapshot: data to use if none is already loaded (rather than downloading it). Defaults to None.
+        :type snapshot: ``DataSnapshot``
+        """
+        self._config = {"precision": precision, "fall_back": fall_back, "fuzzy_threshold": fuzzy_threshold,
+                        "data_path": data_path, "ecb_url": ecb_url, "snapshot_path": snapshot_path,
+                        "sqlite_path": sqlite_path, "shared": shared, "ecb_source": ecb_source,
+                        "world_bank_source": world_bank_source, "indicators": indicators, "currencies": currencies,
+                        "regions": regions, "start_date": start_date, "end_date": end_date,
+                        "fall_back_warnings": fall_back_warnings}
         self._precision = precision
         self._fall_back = fall_back
+        self._fall_back_warnings = fall_back_warnings
+        self._fall_backs = FallBackReport()
+        self._fall_backs_warned = set()
 
         fuzzy_search_threshold = fuzzy_threshold
         recommended_fuzzy_threshold = 90
@@ -99,24 +203,173 @@ class EasyPeasy(object):
                  "likelihood of innaccurate results." % (str(fuzzy_threshold)))
 
         path_to_data = data_path if isinstance(data_path, str) else None
-        self._pycountry_wrap = PycountryWrap(path_to_data, fuzzy_search_threshold)
-        self._pycountries_alpha_2 = set([c.alpha_2 for c in list(pycountry.countries)])
 
-        # CPI Dictionaries
-        self._cpi_dict = world_bank_pull(return_as='dict')
-        self._alpha2_cpi_record = alpha2_by_cpi_years(regions=self._pycountries_alpha_2, cpi_dictionary=self._cpi_dict)
-
-        # Exchange Dict
-        self._exchange_dict, self._ecb_currency_codes, self._currency_date_record = ecb_xml_exchange_data(
-            return_as='dict')
+        # Load all CPI and exchange rate information into a single (immutable) snapshot,
+        # or share the snapshot (and region information) of existing instances using the same sources.
+        # Note: methods read `self._snapshot` once and use that snapshot throughout,
+        #       so `refresh()` can swap in a new one at any time.
+        self._source_options = {"ecb_url": ecb_url if isinstance(ecb_url, str) else ECB_URL,
+                                "snapshot_path": snapshot_path if isinstance(snapshot_path, str) else None,
+                                "sqlite_path": sqlite_path if isinstance(sqlite_path, str) else None,
+                                "ecb_source": ecb_source if isinstance(ecb_source, str) else None,
+                                "world_bank_source": world_bank_source if isinstance(world_bank_source, str) else None,
+                                "indicators": tuple(sorted(set(indicators or ()) - {CPI_INDICATOR})),
+                                "currencies": self._scope_codes(currencies, 3, 'currencies'),
+                                "cpi_regions": self._scope_codes(regions, 2, 'regions'),
+                                "start_date": self._scope_date(start_date, 'start_date'),
+                                "end_date": self._scope_date(end_date, 'end_date')}
+        if isinstance(world_bank_source, dict):
+            # Note: the options are used as a (hashable) key by `DATA_REGISTRY`.
+            self._source_options['world_bank_source'] = tuple(sorted(world_bank_source.items()))
+        self._store = SQLiteStore(sqlite_path) if isinstance(sqlite_path, str) else None
+        self._shared = shared
+        if shared:
+            self._data = DATA_REGISTRY.acquire(self._source_options, path_to_data, snapshot)
+            # Released by `close()` or, failing that, once this instance is garbage collected.
+            self._release = DATA_REGISTRY.releaser(self, self._data)
+        else:
+            self._data = load_shared_data(self._source_options, path_to_data, snapshot=snapshot)
+            self._release = None
 
-        # Min max for _currency_date_record
-        self._currency_date_record_range = {k: fast_date_range(v, '%d/%m/%Y') for k, v in
-                                            self._currency_date_record.items()}
+        self._pycountry_wrap = PycountryWrap(path_to_data, fuzzy_search_threshold,
+                                             alpha2_currency_dict=self._data.alpha2_currency_dict,
+                                             countries=self._data.countries)
+        self._pycountries_alpha_2 = self._data.regions
 
         # Column Order for options
         self._table_col_order = ['RegionFull', 'Region', 'Alpha2', 'Alpha3', 'Currencies',
                                  'InflationDates', 'ExchangeDates', 'Overlap']
+        self._region_name_table = None
+        self._options_cache = (None, dict())
+
+    def _coverage(self, snap):
+        """
+
+        | Get the ``CoverageIndex()`` of a snapshot (built once per snapshot and shared by every instance using it).
+        |
+        | The index of a ``SQLiteSnapshot()`` is built from a summary of the database, so no data is read.
+
+        :param snap: the snapshot of data to use.
+        :type snap: ``DataSnapshot``
+        :return: the index.
+        :rtype: ``CoverageIndex``
+        """
+        coverage = self._data.coverage
+        if coverage is None or coverage.snapshot is not snap:
+            summary = dict()
+            if isinstance(snap, SQLiteSnapshot):
+                summary = {'summary': snap.coverage_summary(), 'currencies_on': snap.currencies_on}
+            coverage = self._data.coverage = CoverageIndex(snap, self._pycountries_alpha_2,
+                                                           self._pycountry_wrap.alpha2_currency_dict, **summary)
+        return coverage
+
+    @staticmethod
+    def _scope_codes(codes, length, name):
+        """
+
+        Normalize the codes used to restrict the data loaded (see the `currencies` and `regions` parameters).
+
+        :param codes: a code or an iterable of them (None for all codes).
+        :type codes: ``str``, ``iterable`` or ``None``
+        :param length: the length of a valid code.
+        :type length: ``int``
+        :param name: the name of the parameter (used in error messages).
+        :type name: ``str``
+        :return: the (upper case) codes, sorted.
+        :rtype: ``tuple`` or ``None``
+        """
+        if codes is None:
+            return None
+        codes = [codes] if isinstance(codes, str) else list(codes)
+        if not all(isinstance(c, str) and len(c.strip()) == length for c in codes):
+            raise ValueError("`%s` must be a list of %s-letter ISO codes." % (name, length))
+        return tuple(sorted(set(c.strip().upper() for c in codes)))
+
+    @staticmethod
+    def _scope_date(date, name):
+        """
+
+        Normalize a date used to restrict the data loaded (see the `start_date` and `end_date` parameters).
+
+        :param date: a date of the form DD/MM/YYYY or YYYY-MM-DD, a datetime or a year (None for no limit).
+        :type date: ``str``, ``datetime``, ``int`` or ``None``
+        :param name: 'start_date' or 'end_date'. A year is taken to mean its first or last day, respectively.
+        :type name: ``str``
+        :return: a date of the form DD/MM/YYYY.
+        :rtype: ``str`` or ``None``
+        """
+        if date is None:
+            return None
+        elif isinstance(date, int) or (isinstance(date, str) and date.strip().isdigit()):
+            return ("01/01/%s" if name == 'start_date' else "31/12/%s") % (int(date))
+        elif is_datetime_like(date) or (isinstance(date, str) and len(date) == 10 and date[4] == '-'):
+            return epoch_days_to_date(to_epoch_days(date))
+        elif isinstance(date, str) and date_format_check(date):
+            return date
+        raise ValueError("`%s` must be a date of the form DD/MM/YYYY, YYYY-MM-DD, a datetime or a year." % (name))
+
+    @property
+    def _snapshot(self):
+        """
+
+        The current snapshot of data.
+
+        :rtype: ``DataSnapshot``
+        """
+        return self._data.snapshot
+
+    def _query_snapshot(self, regions_or_currencies):
+        """
+
+        | Get the snapshot of data to answer a query about given regions and currencies with.
+        |
+        | If the data is kept in a SQLite database (see the `sqlite_path` parameter), only the data for these
+        | regions and currencies (and the currencies of the regions) is read from it (see ``SQLiteSnapshot()``).
+        | Otherwise, all of the data is held in memory and the current snapshot is used as is.
+
+        :param regions_or_currencies: the regions and currencies of the query (see ``resolve()``).
+        :type regions_or_currencies: ``iterable``
+        :return: a snapshot holding the data required by the query.
+        :rtype: ``DataSnapshot``
+        """
+        snap = self._snapshot
+        if not isinstance(snap, SQLiteSnapshot):
+            return snap
+        entities = [self._resolve(snap, r) for r in set(regions_or_currencies)]
+        return snap.scoped(currencies=[e.currency for e in entities if e.currency is not None],
+                           regions=[e.alpha2 for e in entities if e.alpha2 is not None])
+
+    def close(self):
+        """
+
+        | Release the data shared by this instance (see the `shared` parameter).
+        | The instance cannot be used afterwards.
+        |
+        | Instances which are not closed release their data when they are garbage collected.
+
+        """
+        release, self._release = getattr(self, '_release', None), None
+        self._data = None
+        if release is not None:
+            release()
+        if getattr(self, '_store', None) is not None:
+            self._store.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __getstate__(self):
+        # Only the configuration and the (compact, see ``DataSnapshot()``) current snapshot are pickled.
+        # If the unpickling process already holds data from the same sources (e.g., a forked worker), it is used instead.
+        # Instances loaded from a snapshot file simply refer to that file.
+        snapshot = self._snapshot if self._source_options['snapshot_path'] is None else None
+        return {"config": self._config, "snapshot": snapshot}
+
+    def __setstate__(self, state):
+        self._initialize(snapshot=state['snapshot'], **state['config'])
 
     def _params_check(self, amount="void", pretty_print="void"):
         """
@@ -145,8 +398,9 @@ class EasyPeasy(object):
                 - ``EasyPeasy().region_map(region='CA', map_to='alpha_2')``       :math:`=` 'CA'
                 - ``EasyPeasy().region_map(region='Canada', map_to='alpha_3')``   :math:`=` 'CAN'
 
-        :param region: a 'region' in the format of a ISO Alpha2, ISO Alpha3 or currency code, as well as natural name.
-        :type region: ``str``
+        :param region: a 'region' in the format of a ISO Alpha2, ISO Alpha3 or currency code, as well as natural name
+                       (or a handle returned by ``resolve()``).
+        :type region: ``str`` or ``ResolvedEntity``
         :param map_to:  - for region: 'alpha_2', 'alpha_3', 'name' or 'official_name'.
                         - for currency: 'currency_alpha_3', 'currency_numeric' or 'currency_name'.
                         Defaults to 'alpha_2'.
@@ -154,22 +408,214 @@ class EasyPeasy(object):
         :return: the desired mapping from region to ISO Alpha2.
         :rtype: ``str`` or ``tuple``
         """
+        if isinstance(region, ResolvedEntity):
+            if region.alpha2 is None:
+                return None
+            elif map_to in ('alpha_2', 'alpha_3'):
+                return region.alpha2 if map_to == 'alpha_2' else region.alpha3
+            elif map_to == 'currency_alpha_3':
+                return region.currency
+            region = region.alpha2
+
         # handle currency transitions here.
         return self._pycountry_wrap.map_region_to_type(region=region, extract_type=map_to)
 
-    def _cpi_years(self, region, warn=True):
+    def resolve(self, region_or_currency):
+        """
+
+        | Resolve a region or currency (e.g., 'Canada', 'CA', 'CAN' or 'CAD') once, so that it can be used repeatedly
+        | without being looked up again.
+        |
+        | The handle returned may be passed to any method of ``EasyPeasy()`` in place of a region or currency.
+        | It holds the region's ISO alpha 2 and alpha 3 codes and its currency code (see ``ResolvedEntity()``).
+
+        :param region_or_currency: a region (name, ISO alpha 2 or alpha 3 code) or a currency code.
+        :type region_or_currency: ``str``
+        :return: a handle for `region_or_currency`.
+        :rtype: ``ResolvedEntity``
+        """
+        entity = self._resolve(self._snapshot, region_or_currency)
+        if entity.alpha2 is None and entity.currency is None:
+            raise ValueError("Could not resolve '%s' to a region or currency." % (region_or_currency))
+        return entity
+
+    def _resolve(self, snap, region_or_currency):
+        """
+
+        Resolve a region or currency using a given snapshot of data. See ``resolve()``.
+
+        :param snap: the snapshot of data to use.
+        :type snap: ``DataSnapshot``
+        :param region_or_currency: a region or currency (handles are returned as is).
+        :type region_or_currency: ``str`` or ``ResolvedEntity``
+        :return: a handle for `region_or_currency` (its codes are None if it could not be resolved).
+        :rtype: ``ResolvedEntity``
+        """
+        if isinstance(region_or_currency, ResolvedEntity):
+            return region_or_currency
+
+        alpha2, alpha3, region_currency = self._pycountry_wrap.map_region_to_types(
+            region_or_currency, ('alpha_2', 'alpha_3', 'currency_alpha_3'))
+
+        # As ``_user_currency_input()``, but without looking the region up again.
+        if region_or_currency in snap.ecb_currency_codes:
+            currency = region_or_currency
+        else:
+            try:
+                currency = pycountry.currencies.lookup(region_or_currency).alpha_3
+            except:
+                currency = region_currency
+        return ResolvedEntity(region_or_currency, alpha2, alpha3, currency)
+
+    def refresh(self, exchange=True, inflation=True, incremental=False):
+        """
+
+        Reload the data cached by this instance (and, if shared, by every instance sharing its data).
+
+        The new data is loaded into a new snapshot which then replaces the current one in a single step,
+        so calls made from other threads while the refresh is underway continue to use the previous data
+        and never block. Exchange rate information is requested conditionally, i.e., it is only downloaded
+        if the European Central Bank's data has changed.
+
+        :param exchange: if True, reload exchange rate information from the European Central Bank. Defaults to True.
+        :type exchange: ``bool``
+        :param inflation: if True, reload inflation (CPI) information from the World Bank. Defaults to True.
+        :type inflation: ``bool``
+        :param incremental: if True, only download the exchange rates published in the last 90 days and merge them
+                            into the data currently cached. Defaults to False.
+        :type incremental: ``bool``
+        :return: True if new data was swapped in; False if the data was unchanged.
+        :rtype: ``bool``
+        """
+        # Only writers take the lock (to avoid duplicate downloads and lost updates).
+        data = self._data
+        with data.refresh_lock:
+            snap = build_snapshot(exchange, inflation, base=data.snapshot, incremental=incremental,
+                                  **self._source_options)
+            if snap is data.snapshot:
+                return False
+            data.snapshot = snap
+            return True
+
+    def save_snapshot(self, path):
+        """
+
+        | Save the data currently cached by this instance to a (binary) snapshot file.
+        |
+        | The file is written atomically, so it can be published to a shared directory while other processes
+        | are reading from it (e.g., with ``EasyPeasy(snapshot_path=path)`` or ``load_snapshot()``).
+        | See the `snapshot_file` module for a description of the format.
+
+        :param path: the path of the file.
+        :type path: ``str``
+        """
+        write_snapshot(self._snapshot, path)
+
+    def load_snapshot(self, path, verify=True):
+        """
+
+        Replace the data cached by this instance (and, if shared, by every instance sharing its data)
+        with the data in a snapshot file. See ``save_snapshot()``.
+
+        :param path: the path of the file.
+        :type path: ``str``
+        :param verify: if True, verify the checksum of all data in the file. Defaults to True.
+        :type verify: ``bool``
+        :return: True if new data was swapped in; False if the file holds the data already cached.
+        :rtype: ``bool``
+        """
+        snap = read_snapshot(path, verify)
+        data = self._data
+        with data.refresh_lock:
+            if snap.created == data.snapshot.created and snap.source_info == data.snapshot.source_info:
+                return False
+            data.snapshot = snap
+            return True
+
+    def _fell_back(self, kind, key, requested, used, warn_msg, *msg_args):
+        """
+
+        | Record a fall back (see ``fall_back_report()``) and, if `fall_back_warnings` is True, warn.
+        |
+        | Only the first fall back for each (`kind`, `key`) is warned about (until the report is reset), so a batch
+        | which falls back for every record issues a bounded number of warnings.
+
+        :param kind: 'exchange' or 'inflation'.
+        :type kind: ``str``
+        :param key: the currency (or region) concerned.
+        :type key: ``str``
+        :param requested: the date (period or year) requested.
+        :type requested: ``str`` or ``int``
+        :param used: the date (period or year) used instead.
+        :type used: ``str`` or ``int``
+        :param warn_msg: the warning. Only formatted (with `msg_args`) if it is issued.
+        :type warn_msg: ``str``
+        """
+        self._fall_backs.record(kind, key, requested, used)
+        if self._fall_back_warnings and (kind, key) not in self._fall_backs_warned:
+            self._fall_backs_warned.add((kind, key))
+            warn((warn_msg % tuple(a() if callable(a) else a for a in msg_args)) +
+                 "\nFurther fall backs for '%s' will only be recorded (see fall_back_report())." % (key))
+
+    def fall_back_report(self, reset=False):
+        """
+
+        | Summarize the fall backs made by this instance (see the `fall_back` parameter), i.e., each time the
+        | closest date (or year) for which data was available was used in place of the one requested.
+
+        :param reset: if True, clear the report afterwards (and warn about the next fall back for each currency or
+                      region again). Defaults to False.
+        :type reset: ``bool``
+        :return: a dataframe with the columns 'Type' ('exchange' or 'inflation'), 'Key' (the currency or region),
+                 'Requested', 'Used' and 'Count' (most frequent first).
+        :rtype: ``Pandas DataFrame``
+        """
+        counts = self._fall_backs.counts(reset)
+        if reset:
+            self._fall_backs_warned = set()
+        return fall_back_frame(counts)
+
+    def _deflator_table(self, snap, deflator):
+        """
+
+        Get the table of an indicator loaded in addition to CPI information (see the `indicators` parameter).
+
+        :param snap: the snapshot of data to use.
+        :type snap: ``DataSnapshot``
+        :param deflator: a World Bank Indicator.
+        :type deflator: ``str``
+        :return: the (sorted) years, a dictionary of the form ``{alpha2: column}`` and a (year x region) matrix.
+        :rtype: ``tuple``
+        """
+        table = snap.indicator_tables.get(deflator)
+        if table is None:
+            raise ValueError("'%s' has not been loaded. Loaded indicators: %s." % (
+                deflator, ", ".join(sorted(snap.indicator_tables)) or "none"))
+        return table
+
+    def _cpi_years(self, snap, region, warn=True, deflator=None):
         """
 
-        Get Years for which CPI information is available for a given region.
+        Get Years for which CPI information is available for a given region (see ``cpi_year_index()``).
 
+        :param snap: the snapshot of data to use.
+        :type snap: ``DataSnapshot``
         :param region: ISO Alpha 2 Code.
         :type region: ``str``
         :param warn: warn if data could not be obtained.
         :type warn: ``bool``
-        :return: list of years for which CPI information is available.
-        :rtype: ``list``
+        :param deflator: an indicator to use instead of CPI information (see ``inflation()``). Defaults to None.
+        :type deflator: ``str``
+        :return: the (sorted) years for which CPI information is available.
+        :rtype: ``ndarray``
         """
-        cpi_years_list = self._alpha2_cpi_record.get(region, [])
+        if deflator is None:
+            cpi_years_list = snap.cpi_year_index.get(region, ())
+        else:
+            years, region_index, matrix = self._deflator_table(snap, deflator)
+            column = region_index.get(region)
+            rows = np.flatnonzero(~np.isnan(matrix[:, column])) if column is not None else []
+            cpi_years_list = np.array(years, dtype='int64')[rows]
 
         if len(cpi_years_list):
             return cpi_years_list
@@ -179,16 +625,20 @@ class EasyPeasy(object):
         else:
             return None
 
-    def _cpi_match(self, region, year):
+    def _cpi_match(self, snap, region, year, deflator=None):
         """
 
         Match region to the best possible year.
 
+        :param snap: the snapshot of data to use.
+        :type snap: ``DataSnapshot``
         :param region: region of the form allowed by `EasyPeasy().region_map()`
         :type region: ``str``
         :param year: a year for which CPI information is desired.
                      Can also be one of: 'oldest' or 'latest'.
         :type year: ``int`` or ``str``
+        :param deflator: see ``inflation()``. Defaults to None.
+        :type deflator: ``str``
         :return: best matching of CPI information for the given region w.r.t. the year supplied.
         :rtype: ``float``, ``int`` or ``str``
         """
@@ -197,46 +647,77 @@ class EasyPeasy(object):
         natural_region_name = None
 
         # replace year_b if it is 'oldest' or 'latest'
-        available_years = list(map(int, self._cpi_years(region)))
+        available_years = self._cpi_years(snap, region, deflator=deflator)
         error_msg = "\nInflation (CPI) data for %s in '%s' could not be obtained from the\n" \
                     "International Monetary Fund database currently cached."
         warn_msg = error_msg + "\nFalling back to %s."
 
         if year == 'oldest':
-            return min(available_years)
+            return available_years[0].item()
         elif year == 'latest':
-            return max(available_years)
-        elif int(float(year)) not in available_years:
+            return available_years[-1].item()
+        elif not self._sorted_contains(available_years, int(float(year))):
             if self._fall_back:
-                natural_region_name = self._pycountry_wrap.map_region_to_type(region, 'name')
-                fall_back_year = closest_value(float(year), available_years)
-                warn(warn_msg % (year, natural_region_name, str(fall_back_year)))
+                fall_back_year = closest_sorted(float(year), available_years)
+                self._fell_back('inflation', region, year, fall_back_year, warn_msg, year,
+                                lambda: self._pycountry_wrap.map_region_to_type(region, 'name'), str(fall_back_year))
                 return fall_back_year
             else:
                 raise AttributeError(error_msg % (year, natural_region_name))
         else:
             return year
 
-    def _cpi_region_year(self, region, year):
+    @staticmethod
+    def _sorted_contains(sorted_values, value):
+        """
+
+        Check whether a value is present in a sorted array, using a binary search.
+
+        :param sorted_values: an array sorted in ascending order.
+        :type sorted_values: ``ndarray``
+        :param value: a value.
+        :type value: ``int``
+        :return: True if `value` is in `sorted_values`, else False.
+        :rtype: ``bool``
+        """
+        position = int(np.searchsorted(sorted_values, value))
+        return position < len(sorted_values) and sorted_values[position] == value
+
+    def _cpi_region_year(self, snap, region, year, deflator=None):
         """
 
         Get the Consumer Price Index (CPI) in a given region for a given year.
 
+        :param snap: the snapshot of data to use.
+        :type snap: ``DataSnapshot``
         :param region: region of the form allowed by `EasyPeasy().region_map()`
-        :type region: ``str``
+        :type region: ``str`` or ``ResolvedEntity``
         :param year: a year for which CPI information is desired.
                      Can also be one of: 'oldest' or 'latest'.
         :type year: ``int`` or ``str``
+        :param deflator: see ``inflation()``. Defaults to None.
+        :type deflator: ``str``
         :return: CPI for a given year.
         :rtype: ``float``
         """
-        cpi = self._cpi_dict.get(str(int(float(year))), {}).get(self.region_map(region, 'alpha_2'), None)
+        if deflator is None and not isinstance(region, ResolvedEntity):
+            cpi = snap.cpi_dict.get(str(int(float(year))), {}).get(self.region_map(region, 'alpha_2'), None)
+        else:
+            # Handles hold the region's column in the CPI matrix (no lookup of the region is required).
+            if deflator is None:
+                years, column, matrix = snap.cpi_years, region.columns(snap)[0], snap.cpi_matrix
+            else:
+                years, region_index, matrix = self._deflator_table(snap, deflator)
+                column = region_index.get(self.region_map(region, 'alpha_2'))
+            row = bisect.bisect_left(years, str(int(float(year))))
+            found = row < len(years) and years[row] == str(int(float(year))) and column is not None
+            cpi = float(matrix[row, column]) if found and not np.isnan(matrix[row, column]) else None
         if cpi is not None:
             return float(cpi)
         else:
             raise KeyError("Could not obtain inflation information for '%s' in '%s'." % (str(region), str(year)))
 
-    def inflation(self, region, year_a, year_b=None, return_raw_cpi_dict=False, pretty_print=False):
+    def inflation(self, region, year_a, year_b=None, return_raw_cpi_dict=False, pretty_print=False, deflator=None):
         """
 
         Calculator to compute the inflation rate from Consumer Price Index (CPI) information.
@@ -250,7 +731,7 @@ class EasyPeasy(object):
         |   :math:`c_{2}` = CPI of the region in *year_a*.
 
         :param region: a region.
-        :type region: ``str``
+        :type region: ``str`` or ``ResolvedEntity``
         :param year_a: start year.
         :type year_a: ``int``
         :param year_b: end year. Defaults to None -- can only be left to this default if *return_raw_cpi_dict* is True.
@@ -259,29 +740,47 @@ class EasyPeasy(object):
         :type return_raw_cpi_dict: ``bool``
         :param pretty_print: if True, pretty prints the result otherwise returns the result as a float. Defaults to False.
         :type pretty_print: ``bool``
+        :param deflator: a World Bank Indicator (loaded via the `indicators` parameter of ``EasyPeasy()``)
+                         to use in place of CPI information, e.g., "NY.GDP.DEFL.ZS". Defaults to None (CPI).
+        :type deflator: ``str``
         :return: (a) the rate of inflation between year_a and year_h.
 
                  (b) a dictionary of CPI information with the years as keys, CPI as values.
         :rtype: ``float``, ``dict`` or ``NaN``
         """
+        return self._inflation(self._query_snapshot([region]), region, year_a, year_b, return_raw_cpi_dict,
+                               pretty_print, deflator)
+
+    def _inflation(self, snap, region, year_a, year_b=None, return_raw_cpi_dict=False, pretty_print=False,
+                   deflator=None):
+        """
+
+        Compute the inflation rate using a given snapshot of data. See ``inflation()``.
+
+        :param snap: the snapshot of data to use.
+        :type snap: ``DataSnapshot``
+        :return: see ``inflation()``.
+        :rtype: ``float``, ``dict`` or ``NaN``
+        """
         # Check Params
         self._params_check(pretty_print=pretty_print)
 
         # Map Region to its alpha 2 code
         mapped_region = self.region_map(region, 'alpha_2')
+        cpi_region = region if isinstance(region, ResolvedEntity) else mapped_region
 
         # Set to_year
-        to_year = self._cpi_match(mapped_region, year_b) if year_b is not None else None
+        to_year = self._cpi_match(snap, mapped_region, year_b, deflator) if year_b is not None else None
 
         # Set from_year
         if year_a is not None:
-            from_year = self._cpi_match(mapped_region, year_a)
+            from_year = self._cpi_match(snap, mapped_region, year_a, deflator)
         else:
             raise ValueError("year_a cannot be NoneType.")
 
         # Get the CPI for to_year and year_a
-        c1 = self._cpi_region_year(mapped_region, to_year) if to_year is not None else None
-        c2 = self._cpi_region_year(mapped_region, from_year)
+        c1 = self._cpi_region_year(snap, cpi_region, to_year, deflator) if to_year is not None else None
+        c2 = self._cpi_region_year(snap, cpi_region, from_year, deflator)
 
         # Return dict, if requested
         if return_raw_cpi_dict != False:
@@ -303,7 +802,7 @@ class EasyPeasy(object):
         else:
             print(rate, "%")
 
-    def inflation_calculator(self, amount, region, year_a, year_b, pretty_print=False):
+    def inflation_calculator(self, amount, region, year_a, year_b, pretty_print=False, deflator=None):
         """
 
         Adjusts a given amount of money for inflation.
@@ -311,7 +810,7 @@ class EasyPeasy(object):
         :param amount: a monetary amount.
         :type amount: ``float`` or ``int``
         :param region: a geographical region.
-        :type region: ``str``
+        :type region: ``str`` or ``ResolvedEntity``
         :param year_a: start year.
         :type year_a: ``int``
         :param year_b: end year.
@@ -319,9 +818,24 @@ class EasyPeasy(object):
         :param pretty_print: if True, pretty prints the result otherwise returns the result as a float.
                              Defaults to False.
         :type pretty_print: ``bool``
+        :param deflator: see ``inflation()``. Defaults to None (CPI).
+        :type deflator: ``str``
         :return: :math:`amount \cdot inflation \space rate`.
         :rtype: ``float`` or ``NaN``
         """
+        return self._inflation_calculator(self._query_snapshot([region]), amount, region, year_a, year_b,
+                                          pretty_print, deflator)
+
+    def _inflation_calculator(self, snap, amount, region, year_a, year_b, pretty_print=False, deflator=None):
+        """
+
+        Adjust an amount of money for inflation using a given snapshot of data. See ``inflation_calculator()``.
+
+        :param snap: the snapshot of data to use.
+        :type snap: ``DataSnapshot``
+        :return: see ``inflation_calculator()``.
+        :rtype: ``float`` or ``NaN``
+        """
         # Check Params
         self._params_check(amount, pretty_print)
 
@@ -330,7 +844,8 @@ class EasyPeasy(object):
             return mint(amount, self._precision, self.region_map(region, map_to='currency_alpha_3'), pretty_print)
 
         # Get the CPI information
-        inflation_dict, years = self.inflation(region, year_a, year_b, return_raw_cpi_dict='complete')
+        inflation_dict, years = self._inflation(snap, region, year_a, year_b, return_raw_cpi_dict='complete',
+                                                deflator=deflator)
 
         # Block division by zero
         if inflation_dict[years['year_a']] == 0:
@@ -343,11 +858,13 @@ class EasyPeasy(object):
         # Print or Return
         return mint(adjusted_amount, self._precision, self.region_map(region, map_to='currency_alpha_3'), pretty_print)
 
-    def _exchange_dates(self, currencies, min_max_rslt=False, date_format='%d/%m/%Y'):
+    def _exchange_dates(self, snap, currencies, min_max_rslt=False, date_format='%d/%m/%Y'):
         """
 
         Get all dates for which there is data for a given list of currencies
 
+        :param snap: the snapshot of data to use.
+        :type snap: ``DataSnapshot``
         :param currencies: a list of currencies
         :type currencies: ``list``
         :param min_max_rslt: compute the earliest and latest date for which exchange rate information is available.
@@ -358,7 +875,7 @@ class EasyPeasy(object):
         :return:
         :rtype: 1D ``list`` or 2D ``list``
         """
-        d = self._currency_date_record_range if min_max_rslt else self._currency_date_record
+        d = snap.currency_date_record_range if min_max_rslt else snap.currency_date_record
         dates = [d.get(c.upper(), None) for c in currencies]
 
         # Remove None
@@ -368,72 +885,154 @@ class EasyPeasy(object):
 
         return dates[0] if len(dates) == 1 else dates
 
-    def _user_currency_input(self, currency_or_region):
+    def _user_currency_input(self, snap, currency_or_region):
         """
 
         Converts User supplied reference to a currency into an actual ISO Alpha 3 Currency Code.
 
+        :param snap: the snapshot of data to use.
+        :type snap: ``DataSnapshot``
         :param currency_or_region: reference to a currency
-        :type currency_or_region: ``str``
+        :type currency_or_region: ``str`` or ``ResolvedEntity``
         :return: ISO Alpha 3 Currency Code
         :rtype: ``pycountry object``
         """
+        if isinstance(currency_or_region, ResolvedEntity):
+            return currency_or_region.currency
+
         # Note: 'temp. fix' has been added to handle currencies like 'EEK'.
         #        This capability should be integrated into region_map() in the future.
         try:
             return pycountry.currencies.lookup(currency_or_region).alpha_3
         except:
-            if currency_or_region in self._ecb_currency_codes:  # temp fix
+            if currency_or_region in snap.ecb_currency_codes:  # temp fix
                 return currency_or_region
             else:
                 return self.region_map(currency_or_region, "currency_alpha_3")
 
-    def _base_cur_to_lcu(self, currency, date):
+    def _resampled_cur_to_lcu(self, snap, currency, date, frequency, how):
         """
 
-        Convert from a base currency (Euros) to a local currency unit, e.g., CAD.
+        Convert from a base currency (Euros) to a local currency unit using a resampled exchange rate table.
 
-        :param currency: a currency code or region
+        :param snap: the snapshot of data to use.
+        :type snap: ``DataSnapshot``
+        :param currency: a currency code.
         :type currency: ``str``
-        :param date: date of allowed form (currently limited to DD/MM/YYYY).
-        :type date: ``str``
+        :param date: a date (DD/MM/YYYY, YYYY-MM-DD or a datetime), 'oldest' or 'latest'.
+                     If `frequency` is 'annual', a year (e.g., 2015) is also accepted.
+        :type date: ``str``, ``datetime`` or ``int``
+        :param frequency: one of: 'monthly', 'quarterly' or 'annual'.
+        :type frequency: ``str``
+        :param how: the statistic used to summarize each period. One of: 'mean', 'last' or 'first'.
+        :type how: ``str``
+        :return: exchange_rate w.r.t. the Euro as a base currency.
+        :rtype: ``float``
+        """
+        error_msg = "\nCould not obtain the %s (%s) exchange rate for '%s' in %s from the\n" \
+                    "European Central Bank database currently cached."
+        warn_msg = error_msg + "\nFalling back to %s."
+
+        if frequency not in RESAMPLE_FREQUENCIES or how not in RESAMPLE_HOWS:
+            raise ValueError("`frequency` must be one of: 'daily', %s; `how` must be one of: %s." % (
+                ", ".join(["'%s'" % f for f in RESAMPLE_FREQUENCIES]), ", ".join(["'%s'" % h for h in RESAMPLE_HOWS])))
+
+        available_data = snap.rate_tables[(frequency, how)].get(currency, None)
+        if not available_data:
+            raise AttributeError("Data could not obtained for '%s' from the\n" \
+                                 "European Central Bank database currently cached." % (currency))
+
+        if date == 'oldest':
+            period = snap.rate_tables_range[(frequency, how)][currency][0]
+        elif date == 'latest':
+            period = snap.rate_tables_range[(frequency, how)][currency][1]
+        else:
+            try:
+                period = period_key(date, frequency)
+            except (TypeError, ValueError):
+                date_format_check(date, from_format="%d/%m/%Y")
+                raise
+
+        if period not in available_data:
+            if self._fall_back:
+                fall_back_period = closest_period(period, available_data.keys())
+                self._fell_back('exchange', currency, period, fall_back_period, warn_msg, how, frequency, currency,
+                                period, fall_back_period)
+                period = fall_back_period
+            else:
+                raise AttributeError(error_msg % (how, frequency, currency, period))
+
+        return available_data[period]
+
+    def _base_cur_to_lcu(self, snap, currency, date, frequency='daily', how='mean'):
+        """
+
+        Convert from a base currency (Euros) to a local currency unit, e.g., CAD.
+
+        :param snap: the snapshot of data to use.
+        :type snap: ``DataSnapshot``
+        :param currency: a currency code (or a handle returned by ``resolve()``).
+        :type currency: ``str`` or ``ResolvedEntity``
+        :param date: a date of the form DD/MM/YYYY or YYYY-MM-DD, or a datetime.
+        :type date: ``str`` or ``datetime``
+        :param frequency: 'daily' to use the rate reported on `date`; 'monthly', 'quarterly' or 'annual'
+                          to use a resampled rate for the period containing `date`. Defaults to 'daily'.
+        :type frequency: ``str``
+        :param how: statistic used to summarize a period when `frequency` is not 'daily'.
+                    One of: 'mean', 'last' or 'first'. Defaults to 'mean'.
+        :type how: ``str``
         :return: exchange_rate w.r.t. the Euro as a base currency.
         """
         error_msg = "\nCould not obtain the exchange rate for '%s' on %s from the\n" \
                     "European Central Bank database currently cached."
         warn_msg = error_msg + "\nFalling back to %s."
 
+        # Handles hold the column of their currency in the rate matrix.
+        if isinstance(currency, ResolvedEntity):
+            column, currency = currency.columns(snap)[1], currency.currency
+        else:
+            column = snap.currency_index.get(currency, None)
+
         # Handle Base Currency
         if currency.upper() == 'EUR':
             return 1.0
 
-        available_data = self._currency_date_record.get(currency, None)
-        if available_data == None:
+        # Use a Resampled Table, if requested
+        if frequency != 'daily':
+            return self._resampled_cur_to_lcu(snap, currency, date, frequency, how)
+
+        # Note: the dates for which rates are available are looked up in a bitmap (see ``availability_bitmaps()``).
+        bitmaps, first_row, last_row = snap.currency_availability
+        if column is None or last_row[column] < 0:
             raise AttributeError("Data could not obtained for '%s' from the\n" \
                                  "European Central Bank database currently cached." % (currency))
 
         if date == 'oldest':
-            exchange_date = self._currency_date_record_range.get(currency)[0]
+            row = first_row[column]
         elif date == 'latest':
-            exchange_date = self._currency_date_record_range.get(currency)[1]
-        elif isinstance(date, str) and date not in available_data:
-            if self._fall_back:
-                exchange_date = closest_date(date, available_data)
-                warn(warn_msg % (currency, date, exchange_date))
-            else:
-                raise AttributeError(msg % (currency, exchange_date))
-        elif isinstance(date, str) and date_format_check(date, from_format="%d/%m/%Y"):
-            exchange_date = date
+            row = last_row[column]
+        elif isinstance(date, str) or is_datetime_like(date):
+            axis, day = snap.date_axis, to_epoch_days(date)
+            row = int(np.searchsorted(axis, day))
+            if row == axis.size or axis[row] != day or not bitmap_contains(bitmaps[column], row):
+                requested = date if isinstance(date, str) else epoch_days_to_date(day)
+                if not self._fall_back:
+                    raise AttributeError(error_msg % (currency, requested))
+                row = closest_available(bitmaps[column], axis, day, first_row[column], last_row[column])
+                exchange_date = epoch_days_to_date(int(axis[row]))
+                self._fell_back('exchange', currency, requested, exchange_date, warn_msg, currency, requested,
+                                exchange_date)
         else:
-            raise ValueError("Invalid Date Supplied. Dates must be of the form DD/MM/YYYY.")
+            raise ValueError("Invalid Date Supplied. Dates must be of the form DD/MM/YYYY, YYYY-MM-DD or datetimes.")
 
-        exchange_rate = self._exchange_dict.get(exchange_date, {}).get(currency, None)
-        if not isinstance(exchange_rate, type(None)):
-            return exchange_rate
+        exchange_rate = snap.rate_matrix[row, column]
+        if not np.isnan(exchange_rate):
+            return float(exchange_rate)
         else:
-            raise AttributeError(error_msg % (currency, exchange_date))
+            raise AttributeError(error_msg % (currency, epoch_days_to_date(int(snap.date_axis[row]))))
 
-    def currency_converter(self, amount, from_currency, to_currency, date="latest", pretty_print=False):
+    def currency_converter(self, amount, from_currency, to_currency, date="latest", pretty_print=False,
+                           frequency='daily', how='mean'):
         """
 
         Function to perform currency conversion based on, **not** directly reported from, data obtained
@@ -463,21 +1062,43 @@ class EasyPeasy(object):
         :param amount: an amount of money to be converted.
         :type amount: ``float`` or ``int``
         :param from_currency: the currency of the amount.
-        :type from_currency: ``str``
+        :type from_currency: ``str`` or ``ResolvedEntity``
         :param to_currency: the currency the amount is to be converted into.
-        :type to_currency: ``str``
-        :param date: date of data to perform the conversion with. Dates must be of the form: ``DD/MM/YYYY``.
-        :type date: ``str``
+        :type to_currency: ``str`` or ``ResolvedEntity``
+        :param date: date of data to perform the conversion with. Dates must be of the form ``DD/MM/YYYY`` or
+                     ``YYYY-MM-DD``, or a ``datetime``, ``date``, ``numpy.datetime64`` or ``pandas.Timestamp``.
+        :type date: ``str`` or ``datetime``
         :param pretty_print: if True, pretty prints the table otherwise returns the table as a pandas DataFrame. Defaults to False.
         :type pretty_print: ``bool``
+        :param frequency: 'daily' to use the rates reported on `date`. Alternatively, 'monthly', 'quarterly' or 'annual'
+                          to use rates resampled over the period containing `date` (for 'annual', `date` may also
+                          be a year, e.g., 2015). Defaults to 'daily'.
+        :type frequency: ``str``
+        :param how: statistic used to resample rates when `frequency` is not 'daily'.
+                    One of: 'mean', 'last' or 'first'. Defaults to 'mean'.
+        :type how: ``str``
         :return: converted currency.
         :rtype: ``float``
         """
+        return self._currency_converter(self._query_snapshot([from_currency, to_currency]), amount, from_currency,
+                                        to_currency, date, pretty_print, frequency, how)
+
+    def _currency_converter(self, snap, amount, from_currency, to_currency, date="latest", pretty_print=False,
+                            frequency='daily', how='mean'):
+        """
+
+        Convert between currencies using a given snapshot of data. See ``currency_converter()``.
+
+        :param snap: the snapshot of data to use.
+        :type snap: ``DataSnapshot``
+        :return: see ``currency_converter()``.
+        :rtype: ``float``
+        """
         # Check Params
         self._params_check(amount, pretty_print)
 
         # to/from_currency --> Currency Alpha 3 Code
-        ca3 = [self._user_currency_input(c) if c not in self._ecb_currency_codes else c for c in
+        ca3 = [self._user_currency_input(snap, c) if c not in snap.ecb_currency_codes else c for c in
                (to_currency, from_currency)]
         to_currency_fn, from_currency_fn = ca3
 
@@ -488,15 +1109,452 @@ class EasyPeasy(object):
         if any(x == None or x is None for x in [to_currency_fn, from_currency_fn]):
             raise ValueError("Could not convert '%s' to '%s'." % (from_currency, to_currency))
 
+        # Pass handles on, so the columns they hold are used.
+        to_lcu, from_lcu = [c if isinstance(c, ResolvedEntity) else fn for c, fn in
+                            ((to_currency, to_currency_fn), (from_currency, from_currency_fn))]
+
         # from_currency --> Base Currency --> to_currency
-        conversion_to_invert = self._base_cur_to_lcu(from_currency_fn, date)
+        conversion_to_invert = self._base_cur_to_lcu(snap, from_lcu, date, frequency, how)
         if conversion_to_invert == 0.0:
             raise ZeroDivisionError("Cannot converted from '%s' on %s." % (from_currency, date))
-        converted_amount = (conversion_to_invert ** -1) * self._base_cur_to_lcu(to_currency_fn, date) * float(amount)
+        converted_amount = (conversion_to_invert ** -1) * self._base_cur_to_lcu(snap, to_lcu, date, frequency, how) \
+                           * float(amount)
 
         # Return results (or pretty print)
         return mint(converted_amount, self._precision, to_currency_fn, pretty_print)
 
+    @staticmethod
+    def _unpack_record(record):
+        """
+
+        Unpack a conversion record (see ``convert_stream()``).
+
+        :param record: a tuple of the form ``(amount, from_currency, to_currency[, date])`` or a dict with the keys
+                       'amount', 'from_currency', 'to_currency' and (optionally) 'date'.
+        :type record: ``tuple`` or ``dict``
+        :return: a tuple of the form ``(amount, from_currency, to_currency, date)``.
+        :rtype: ``tuple``
+        """
+        if isinstance(record, dict):
+            return record['amount'], record['from_currency'], record['to_currency'], record.get('date', 'latest')
+        elif len(record) == 3:
+            return tuple(record) + ('latest',)
+        else:
+            amount, from_currency, to_currency, date = record
+            return amount, from_currency, to_currency, date
+
+    def currency_converter_batch(self, records, frequency='daily', how='mean', return_exceptions=False,
+                                 return_fall_backs=False):
+        """
+
+        Convert many amounts at once.
+
+        | Each record must be either a tuple of the form ``(amount, from_currency, to_currency[, date])``
+        | or a dict with the keys 'amount', 'from_currency', 'to_currency' and (optionally) 'date'.
+        |
+        | Currencies are resolved once per batch and the (daily) rates for all records are looked up in a single
+        | vectorized operation. Records which cannot be served directly from the rates reported on their date
+        | (e.g., weekends) are handed to ``currency_converter()``, and therefore obey the same fall back rules.
+        | Results are identical to those of calling ``currency_converter()`` for each record.
+
+        :param records: an iterable of records.
+        :type records: ``iterable``
+        :param frequency: see ``currency_converter()``. Defaults to 'daily'.
+        :type frequency: ``str``
+        :param how: see ``currency_converter()``. Defaults to 'mean'.
+        :type how: ``str``
+        :param return_exceptions: if True, the exception raised by a record which could not be converted is returned
+                                  in place of its result; otherwise it is raised. Defaults to False.
+        :type return_exceptions: ``bool``
+        :param return_fall_backs: if True, also return a summary of the fall backs made while converting `records`
+                                  (see ``fall_back_report()``). Defaults to False.
+        :type return_fall_backs: ``bool``
+        :return: converted amounts, in the order of `records` (and the summary, if `return_fall_backs` is True).
+        :rtype: ``list`` or ``tuple``
+        """
+        records = [self._unpack_record(r) for r in records]
+        snap = self._query_snapshot(c for r in records for c in r[1:3])
+        if not return_fall_backs:
+            return self._currency_converter_batch(snap, records, frequency, how, return_exceptions)
+        with self._fall_backs.collect() as fall_backs:
+            results = self._currency_converter_batch(snap, records, frequency, how, return_exceptions)
+        return results, fall_back_frame(fall_backs)
+
+    def _currency_converter_batch(self, snap, records, frequency='daily', how='mean', return_exceptions=False):
+        """
+
+        Convert many amounts using a given snapshot of data. See ``currency_converter_batch()``.
+
+        :param snap: the snapshot of data to use.
+        :type snap: ``DataSnapshot``
+        :param records: ``(amount, from_currency, to_currency, date)`` tuples, as returned by ``_unpack_record()``.
+        :type records: ``list``
+        :return: see ``currency_converter_batch()``.
+        :rtype: ``list``
+        """
+        results = [None] * len(records)
+        served = [False] * len(records)
+
+        # Resolve each (currency, date) pair to a row of the rate matrix once per batch.
+        # Note: like currency_converter(), 'oldest' and 'latest' are resolved for each currency separately.
+        resolved_currencies, resolved_rows = dict(), dict()
+
+        def resolve(currency, date):
+            if currency not in resolved_currencies:
+                try:
+                    resolved_currencies[currency] = currency if currency in snap.ecb_currency_codes else \
+                        self._user_currency_input(snap, currency)
+                except Exception:
+                    resolved_currencies[currency] = None
+            currency_fn = resolved_currencies[currency]
+            if (currency_fn, date) not in resolved_rows:
+                row = -1
+                if currency_fn in snap.currency_index:
+                    try:
+                        if date in ('oldest', 'latest'):
+                            _, first_row, last_row = snap.currency_availability
+                            row = int((first_row if date == 'oldest' else last_row)[snap.currency_index[currency_fn]])
+                        else:
+                            day = to_epoch_days(date)
+                            position = int(np.searchsorted(snap.date_axis, day))
+                            if position < len(snap.date_axis) and snap.date_axis[position] == day:
+                                row = position
+                    except Exception:
+                        pass
+                resolved_rows[(currency_fn, date)] = row
+            return currency_fn, resolved_rows[(currency_fn, date)]
+
+        # Records which can be served directly from the rate matrix.
+        fast, from_rows, from_cols, to_rows, to_cols = [], [], [], [], []
+        for i, (amount, from_currency, to_currency, date) in enumerate(records):
+            if frequency != 'daily' or not isinstance(amount, (float, int)) or \
+                    not (isinstance(date, str) or is_datetime_like(date)):
+                continue
+            from_currency_fn, from_row = resolve(from_currency, date)
+            to_currency_fn, to_row = resolve(to_currency, date)
+            if from_currency_fn is not None and from_currency_fn == to_currency_fn:
+                results[i], served[i] = mint(amount, self._precision), True
+            elif from_row >= 0 and to_row >= 0:
+                fast.append(i)
+                from_rows.append(from_row)
+                from_cols.append(snap.currency_index[from_currency_fn])
+                to_rows.append(to_row)
+                to_cols.append(snap.currency_index[to_currency_fn])
+
+        if len(fast):
+            from_rates = snap.rate_matrix[from_rows, from_cols]
+            to_rates = snap.rate_matrix[to_rows, to_cols]
+            amounts = np.array([records[i][0] for i in fast], dtype='float64')
+            with np.errstate(divide='ignore', invalid='ignore'):
+                converted = (from_rates ** -1) * to_rates * amounts
+            usable = ~np.isnan(converted) & (from_rates != 0.0)
+            for i, value, ok in zip(fast, converted.tolist(), usable.tolist()):
+                if ok:
+                    results[i], served[i] = mint(value, self._precision), True
+
+        # Everything else.
+        for i, (amount, from_currency, to_currency, date) in enumerate(records):
+            if served[i]:
+                continue
+            try:
+                results[i] = self._currency_converter(snap, amount, from_currency, to_currency, date,
+                                                      frequency=frequency, how=how)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results[i] = e
+
+        return results
+
+    @staticmethod
+    def _preflight_column(values, rows, name):
+        """
+
+        Arrange a column of a batch as a 2D array with one row per request (see ``batch_preflight()``).
+
+        :param values: values with shape ``(rows,)`` or ``(rows, k)``.
+        :type values: ``iterable``
+        :param rows: the number of requests.
+        :type rows: ``int`` or ``None``
+        :param name: the name of the parameter (used in error messages).
+        :type name: ``str``
+        :return: an array with shape ``(rows, k)``.
+        :rtype: ``ndarray``
+        """
+        values = np.asarray(values)
+        values = values.reshape(-1, 1) if values.ndim == 1 else values
+        if values.ndim != 2 or (rows is not None and values.shape[0] != rows):
+            raise ValueError("`%s` must have one value (or row of values) for each request." % (name))
+        return values
+
+    @staticmethod
+    def _preflight_lookup(values, resolve):
+        """
+
+        Resolve each distinct value of an array once and map the results back onto the array.
+
+        :param values: an array of values.
+        :type values: ``ndarray``
+        :param resolve: a function mapping a value to an integer (negative if the value cannot be resolved).
+        :type resolve: ``callable``
+        :return: an array of integers with the shape of `values`.
+        :rtype: ``ndarray``
+        """
+        inverse, distinct = pd.factorize(values.ravel())
+        return np.array([resolve(v) for v in distinct.tolist()], dtype='int64')[inverse].reshape(values.shape)
+
+    def batch_preflight(self, currencies=None, dates=None, regions=None, years=None):
+        """
+
+        | Check a batch of requests against the data currently cached *before* processing them, so that requests
+        | which would fail (or fall back to the closest date or year) can be split off first.
+        |
+        | Each parameter is a column of the batch, with one entry per request. `currencies` and `years` may also be
+        | 2D (one row per request), e.g., ``np.column_stack([from_currencies, to_currencies])``; a request is
+        | only 'ok' if every entry in its row is. Distinct values are resolved once; everything else is a
+        | vectorized lookup against an index of the snapshot of data.
+        |
+        | Reason codes (the first which applies is reported):
+        |     - 'ok': can be served from the data reported for the date (year) requested.
+        |     - 'unknown_currency': no exchange rate information for the currency.
+        |     - 'invalid_date': not a date of the form DD/MM/YYYY, 'oldest' or 'latest'.
+        |     - 'unknown_region': no inflation information for the region.
+        |     - 'invalid_year': not a year, 'oldest' or 'latest'.
+        |     - 'no_rate_on_date': no (daily) exchange rate was reported on the date.
+        |     - 'no_cpi_for_year': no inflation information was reported for the year.
+
+        :param currencies: currencies (or regions), as accepted by ``currency_converter()``. Defaults to None.
+        :type currencies: ``iterable``
+        :param dates: dates (DD/MM/YYYY, YYYY-MM-DD, datetimes or 'oldest'/'latest') for the rates of `currencies`.
+                      Defaults to None.
+        :type dates: ``iterable``
+        :param regions: regions, as accepted by ``inflation()``. Defaults to None.
+        :type regions: ``iterable``
+        :param years: years (or 'oldest'/'latest') for which inflation information for `regions` is required.
+                      Defaults to None.
+        :type years: ``iterable``
+        :return: a boolean array which is True for requests which can be served (including those which would
+                 fall back, if `fall_back` is enabled) and an array of reason codes.
+        :rtype: ``tuple``
+        """
+        if (dates is not None and currencies is None) or (years is not None and regions is None):
+            raise ValueError("`dates` requires `currencies` and `years` requires `regions`.")
+
+        rows = None
+        columns = dict()
+        for name, values in (('currencies', currencies), ('dates', dates), ('regions', regions), ('years', years)):
+            if values is not None:
+                columns[name] = self._preflight_column(values, rows, name)
+                rows = columns[name].shape[0]
+        if rows is None:
+            raise ValueError("At least one of `currencies` or `regions` must be supplied.")
+        for name in ('dates', 'regions'):
+            if name in columns and columns[name].shape[1] != 1:
+                raise ValueError("`%s` must have exactly one value for each request." % (name))
+        snap = self._query_snapshot(set(v for name in ('currencies', 'regions') if name in columns
+                                        for v in columns[name].ravel().tolist()))
+        coverage = self._coverage(snap)
+        reasons = np.zeros(rows, dtype='int64')
+
+        def flag(mask, reason):
+            reasons[mask & (reasons == 0)] = PREFLIGHT_REASONS.index(reason)
+
+        def currency_column(currency):
+            try:
+                code = currency if currency in snap.ecb_currency_codes else self._user_currency_input(snap, currency)
+            except Exception:
+                return -1
+            return snap.currency_index.get(code, -1)
+
+        def region_column(region):
+            try:
+                column = snap.region_index.get(self.region_map(region, 'alpha_2'), -1)
+            except Exception:
+                return -1
+            return column if column >= 0 and column_has_cpi[column] else -1
+
+        # Note: dates and years are mapped to integers (days since the epoch and years, respectively);
+        #       'oldest' and 'latest' are mapped to `extreme` and invalid values to `invalid`.
+        extreme, invalid = -2 ** 62, -2 ** 62 - 1
+
+        def day_or_year(parse):
+            def lookup(value):
+                if value in ('oldest', 'latest'):
+                    return extreme
+                try:
+                    return parse(value)
+                except (TypeError, ValueError):
+                    return invalid
+            return lookup
+
+        # Exchange rates
+        if currencies is not None:
+            currency_columns = self._preflight_lookup(columns['currencies'], currency_column)
+            flag((currency_columns < 0).any(axis=1), 'unknown_currency')
+        if dates is not None:
+            if np.issubdtype(columns['dates'].dtype, np.datetime64):
+                missing = np.isnat(columns['dates'][:, 0])
+                days = np.full(rows, invalid, dtype='int64')
+                days[~missing] = to_epoch_days(columns['dates'][~missing, 0])
+            else:
+                days = self._preflight_lookup(columns['dates'], day_or_year(to_epoch_days))[:, 0]
+            flag(days == invalid, 'invalid_date')
+            # Note: 'oldest' and 'latest' always have data; the Euro is always 1.0.
+            reported = coverage.rates_reported(days, currency_columns)
+            reported |= (days == extreme)[:, None] | (currency_columns == snap.currency_index.get('EUR', -1))
+            flag(~reported.all(axis=1), 'no_rate_on_date')
+
+        # Inflation
+        if regions is not None:
+            column_has_cpi = ~np.isnan(snap.cpi_matrix).all(axis=0)
+            region_columns = self._preflight_lookup(columns['regions'], region_column)
+            flag(region_columns[:, 0] < 0, 'unknown_region')
+        if years is not None:
+            requested_years = self._preflight_lookup(columns['years'], day_or_year(lambda y: int(float(y))))
+            flag((requested_years == invalid).any(axis=1), 'invalid_year')
+            reported = coverage.cpi_reported(requested_years.ravel(),
+                                             np.repeat(region_columns, requested_years.shape[1], axis=0))
+            reported = reported.reshape(requested_years.shape) | (requested_years == extreme)
+            flag(~reported.all(axis=1), 'no_cpi_for_year')
+
+        servable = reasons == 0
+        if self._fall_back:
+            servable |= np.in1d(reasons, [PREFLIGHT_REASONS.index(r) for r in FALL_BACK_REASONS])
+        return servable, np.array(PREFLIGHT_REASONS, dtype=object)[reasons]
+
+    def convert_stream(self, records):
+        """
+
+        Convert a stream of records, e.g., events ordered by timestamp, lazily.
+
+        | Each record must be either a tuple of the form ``(amount, from_currency, to_currency, date)``
+        | or a dict with the keys 'amount', 'from_currency', 'to_currency' and (optionally) 'date'.
+        |
+        | While the dates in the stream are non-decreasing, the date axis of the exchange rate data is walked
+        | with a cursor; a binary search is only used when the order breaks. Records which cannot be served
+        | directly from the date under the cursor (e.g., weekends or 'latest') are handed to ``currency_converter()``,
+        | and therefore obey the same fall back rules.
+        | If the data is refreshed while the stream is being consumed, subsequent records use the new data.
+
+        :param records: an iterable (which may be unbounded) of records.
+        :type records: ``iterable``
+        :return: a generator yielding the converted amounts, in the order of `records`.
+        :rtype: ``generator``
+        """
+        # Initialize
+        stream_base, stream_snap, seen, resolved_currencies = None, None, list(), dict()
+
+        for record in records:
+            amount, from_currency, to_currency, date = self._unpack_record(record)
+
+            # Only the data for the currencies seen so far is required (see ``_query_snapshot()``).
+            base = self._snapshot
+            if base is not stream_base or from_currency not in resolved_currencies \
+                    or to_currency not in resolved_currencies:
+                stream_base = base
+                seen += [c for c in (from_currency, to_currency) if c not in seen]
+                snap = self._query_snapshot(seen)
+
+            # (Re)start the walk if this is the first record or the data has been refreshed (or widened).
+            if snap is not stream_snap:
+                stream_snap = snap
+                axis, matrix, currency_index = snap.date_axis.tolist(), snap.rate_matrix, snap.currency_index
+                axis_length = len(axis)
+                cursor = 0
+                last_date, last_day = None, None
+                resolved_currencies = dict()
+
+            # to/from_currency --> column of the rate matrix (resolved once per stream).
+            for c in (from_currency, to_currency):
+                if c not in resolved_currencies:
+                    fn = self._user_currency_input(snap, c) if c not in snap.ecb_currency_codes else c
+                    resolved_currencies[c] = (fn, currency_index.get(fn))
+            (from_currency_fn, from_column), (to_currency_fn, to_column) = \
+                resolved_currencies[from_currency], resolved_currencies[to_currency]
+
+            if date in ('oldest', 'latest') or None in (from_currency_fn, to_currency_fn) \
+                    or not isinstance(amount, (float, int)):
+                yield self._currency_converter(snap, amount, from_currency, to_currency, date)
+                continue
+
+            # Move the cursor to the last date on the axis which is <= `date`.
+            day = last_day if date == last_date else to_epoch_days(date)
+            if last_day is not None and day >= last_day:
+                while cursor + 1 < axis_length and axis[cursor + 1] <= day:
+                    cursor += 1
+            else:
+                cursor = max(bisect.bisect_right(axis, day) - 1, 0)
+            last_date, last_day = date, day
+
+            if from_currency_fn == to_currency_fn:
+                yield mint(amount, self._precision)
+                continue
+
+            # Note: NaN (i.e., no rate reported) is the only value which is not equal to itself.
+            reported = axis_length and axis[cursor] == day and None not in (from_column, to_column)
+            from_rate = matrix.item(cursor, from_column) if reported else None
+            to_rate = matrix.item(cursor, to_column) if reported else None
+
+            if from_rate and from_rate == from_rate and to_rate is not None and to_rate == to_rate:
+                yield mint((from_rate ** -1) * to_rate * float(amount), self._precision)
+            else:
+                yield self._currency_converter(snap, amount, from_currency, to_currency, date)
+
+    def exchange_rates(self, currencies, start_date=None, end_date=None, base_currency='EUR'):
+        """
+
+        | Get the daily exchange rates for one or more currencies over a range of dates.
+        |
+        | If this instance keeps its data in a SQLite database (see `sqlite_path`), the currency and date filters
+        | are applied by the database (using its indexes); otherwise, the rate matrix cached in memory is sliced.
+
+        :param currencies: a currency (or region) or a list of them.
+        :type currencies: ``str``, ``ResolvedEntity`` or ``list``
+        :param start_date: earliest date to include (DD/MM/YYYY, YYYY-MM-DD or a datetime). Defaults to None (no limit).
+        :type start_date: ``str``, ``datetime`` or ``None``
+        :param end_date: latest date to include (DD/MM/YYYY, YYYY-MM-DD or a datetime). Defaults to None (no limit).
+        :type end_date: ``str``, ``datetime`` or ``None``
+        :param base_currency: the currency the rates are expressed with respect to. Defaults to 'EUR'.
+        :type base_currency: ``str`` or ``ResolvedEntity``
+        :return: a DataFrame with a 'Date' column and a column of rates for each currency
+                 (NaN where no rate was reported). Dates on which none of the currencies were reported are omitted.
+        :rtype: ``Pandas DataFrame``
+        """
+        requested = [currencies] if isinstance(currencies, (str, ResolvedEntity)) else list(currencies)
+        snap = self._query_snapshot(requested + [base_currency])
+
+        # Resolve currencies
+        resolved = list()
+        for c in requested + [base_currency]:
+            currency = c if c in snap.currency_index else self._user_currency_input(snap, c)
+            if currency not in snap.currency_index:
+                raise ValueError("No exchange rate information is available for '%s'." % (c))
+            resolved.append(currency)
+        columns, base = resolved[:-1], resolved[-1]
+        queried = sorted(set(resolved) - {'EUR'})
+
+        start_day = to_epoch_days(start_date) if start_date is not None else None
+        end_day = to_epoch_days(end_date) if end_date is not None else None
+
+        if self._store is not None:
+            rows = self._store.exchange_rates(queried, start_day, end_day)
+            df = pd.DataFrame(rows, columns=['Day', 'Currency', 'Rate']).pivot(index='Day', columns='Currency',
+                                                                               values='Rate')
+            df = df.reindex(columns=queried)
+        else:
+            first = np.searchsorted(snap.date_axis, start_day, 'left') if start_day is not None else 0
+            last = np.searchsorted(snap.date_axis, end_day, 'right') if end_day is not None else len(snap.date_axis)
+            df = pd.DataFrame(snap.rate_matrix[first:last, [snap.currency_index[c] for c in queried]],
+                              index=snap.date_axis[first:last], columns=queried)
+            df = df.dropna(how='all')
+        df['EUR'] = 1.0
+
+        # Express the rates w.r.t. `base_currency`.
+        rates = df[columns].div(df[base], axis=0) if base != 'EUR' else df[columns]
+        rates = rates.loc[:, ~rates.columns.duplicated()]
+        rates.insert(0, 'Date', [epoch_days_to_date(d) for d in rates.index])
+        return rates.reset_index(drop=True)
+
     def normalize(self
                   , amount
                   , region
@@ -504,7 +1562,10 @@ class EasyPeasy(object):
                   , to_year="latest"
                   , base_currency="EUR"
                   , exchange_date="latest"
-                  , pretty_print=False):
+                  , pretty_print=False
+                  , frequency='daily'
+                  , how='mean'
+                  , deflator=None):
         """
 
         | Convert a Nominal Amount of money to a Real Amount in the same, or another, currency.
@@ -520,7 +1581,7 @@ class EasyPeasy(object):
         :type amount: ``float`` or ``int``
         :param currency: a region or currency.
                          Legal options: Region Name, ISO Alpha2, Alpha3 or Currency Code (see ``options()``).
-        :type currency: ``str``
+        :type currency: ``str`` or ``ResolvedEntity``
         :param from_year: a year. For valid values see ``options()``.
         :type from_year: ``int``
         :param to_year: a year. For valid values see ``options()``.
@@ -528,17 +1589,36 @@ class EasyPeasy(object):
         :type to_year: ``str`` or ``int``
         :param base_currency:  a region or currency. Legal: Region Name, ISO Alpha2, Alpha3 or Currency Code
                                (see ``options()``). Defaults to 'EUR'.
-        :type base_currency: ``str``
+        :type base_currency: ``str`` or ``ResolvedEntity``
         :param pretty_print: Pretty print the result if True; return amount if False. Defaults to False.
         :type pretty_print: ``bool``
+        :param frequency: 'daily' to convert at the rate reported on `exchange_date`. Alternatively, 'monthly', 'quarterly'
+                          or 'annual' to convert at a rate resampled over the period containing `exchange_date`.
+                          For example, ``frequency='annual'`` with ``exchange_date=to_year`` pairs annual CPI data with
+                          the average exchange rate for that year. Defaults to 'daily'.
+        :type frequency: ``str``
+        :param how: statistic used to resample rates when `frequency` is not 'daily'.
+                    One of: 'mean', 'last' or 'first'. Defaults to 'mean'.
+        :type how: ``str``
+        :param deflator: see ``inflation()``. Defaults to None (CPI).
+        :type deflator: ``str``
         :return: amount adjusted for inflation and converted into the base currency.
         :rtype: ``float``
         """
         # Check Params
         self._params_check(amount, pretty_print)
 
+        # Use a single snapshot of the data throughout
+        snap = self._query_snapshot([region, base_currency])
+
+        # Look `region` and `base_currency` up once (rather than in each of the steps below).
+        region = self._resolve(snap, region)
+        base_currency_code = base_currency if base_currency in snap.ecb_currency_codes \
+            else self._user_currency_input(snap, base_currency)
+
         exchange_year = year_extract(exchange_date)
-        if exchange_date not in ['oldest', 'latest'] and not str(exchange_year).isdigit():
+        if exchange_date not in ['oldest', 'latest'] and not str(exchange_year).isdigit() \
+                and not (frequency == 'annual' and str(exchange_date).isdigit()):
             warn("\n`exchange_date` is likely formatted improperly.")
 
             # Check delta between `to_year` and `exchange_date`.
@@ -547,13 +1627,15 @@ class EasyPeasy(object):
                      "for inflation is %s, whereas the exchange rate year is %s." % (str(to_year), str(exchange_year)))
 
         # Adjust input for inflation
-        real_amount = self.inflation_calculator(amount, region, year_a=from_year, year_b=to_year)
+        real_amount = self._inflation_calculator(snap, amount, region, year_a=from_year, year_b=to_year,
+                                                 deflator=deflator)
 
         # Compute Exchange
-        normalize_amount = self.currency_converter(real_amount, region, base_currency, date=exchange_date)
+        normalize_amount = self._currency_converter(snap, real_amount, region, base_currency_code or base_currency,
+                                                    date=exchange_date, frequency=frequency, how=how)
 
         # Return results (or pretty print)
-        return mint(normalize_amount, self._precision, self._user_currency_input(base_currency), pretty_print)
+        return mint(normalize_amount, self._precision, base_currency_code, pretty_print)
 
     def _options_info_error(self, rformat):
         """
@@ -576,82 +1658,152 @@ class EasyPeasy(object):
 
         raise ValueError(options_error_msg + append)
 
-    def _options_table(self, info, table_overlap_only=False, range_table_dates=True):
+    def _region_names(self):
         """
 
-        Tool to Generate Information for ``options()`` in table form.
+        Get the names and ISO Alpha 3 code of every region (these do not change when the data is refreshed).
 
-        :param info: 'exchange', 'inflation' or 'all' ('all' requires rformat is set to 'table').
-        :type info: ``str``
-        :param table_overlap_only:
-        :param table_overlap_only: when info is set to 'all', keep only those rows for which exchange rate and inflation data overlap.
-        :type table_overlap_only: ``bool``
-        :param range_table_dates: if True, only report the minimum and maximum date for which data is available;
-                              if False, all dates for which data is available will be reported. Defaults to True.
+        :return: a dictionary of the form ``{alpha2: (name, official name, alpha3)}``.
+        :rtype: ``dict``
+        """
+        if self._region_name_table is None:
+            self._region_name_table = {a: tuple(self._pycountry_wrap.map_region_to_type(a, t)
+                                                for t in ('name', 'official_name', 'alpha_3'))
+                                       for a in self._pycountries_alpha_2}
+        return self._region_name_table
+
+    def _options_frame(self, snap, range_table_dates=True):
+        """
+
+        Build the complete ``options()`` table (i.e., before it is filtered), using column operations over
+        the ``CoverageIndex()`` of the snapshot.
+
+        :param snap: the snapshot of data to use.
+        :type snap: ``DataSnapshot``
+        :param range_table_dates: see ``options()``.
         :type range_table_dates: ``bool``
-        :return: dataframe summarizing databases currently cached by ``EasyPeasy()``.
+        :return: the table, with a 'TempRanking' column (see ``options_ranking()``).
         :rtype: ``Pandas DataFrame``
         """
         # Note: does not currently handle currency transitions
 
         # Use CurrencyRelationshipsDB as Base
         d = [i for i in list(self._pycountry_wrap.alpha2_currency_dict.items()) if i[0] in self._pycountries_alpha_2]
-        options_df = pd.DataFrame(d).rename(columns={0: "Alpha2", 1: "Currencies"})
-
-        # Add Names
-        options_df['Region'] = [self._pycountry_wrap.map_region_to_type(c, 'name') for c in list(options_df['Alpha2'])]
-        options_df['RegionFull'] = [self._pycountry_wrap.map_region_to_type(c, 'official_name') for c in
-                                    list(options_df['Alpha2'])]
-
-        # Add Alpha3
-        options_df['Alpha3'] = [self._pycountry_wrap.map_region_to_type(c, 'alpha_3') for c in
-                                list(options_df['Alpha2'])]
-
-        # Map available Inflation Data onto this Base
-        options_df['InflationDates'] = options_df['Alpha2'].map(
-            lambda x: sort_range_reverse(self._cpi_years(x, warn=False),
-                                         ('reverse' if not range_table_dates else 'range')), 'ignore'
-        )
-
-        # Map available Exchange Rate Data onto this Base
-        options_df['ExchangeDates'] = options_df['Currencies'].map(
-            lambda x: self._exchange_dates(x, min_max_rslt=range_table_dates), na_action='ignore'
-        )
-
-        # Add Overlap
-        options_df['Overlap'] = options_df.apply(
-            lambda x: year_date_overlap(x['InflationDates'], x['ExchangeDates'], date_format="%d/%m/%Y"), axis=1
-        )
-
-        # Fill NaNs
-        options_df = options_df.fillna(np.NaN)
+        alpha2 = [a for a, _ in d]
+
+        # Add Names and Alpha3
+        names = self._region_names()
+        options_df = pd.DataFrame({"Alpha2": alpha2, "Currencies": [c for _, c in d]}, columns=["Alpha2", "Currencies"])
+        for position, column in enumerate(['Region', 'RegionFull', 'Alpha3']):
+            options_df[column] = [names[a][position] if names[a][position] is not None else np.NaN for a in alpha2]
+
+        # Years for which inflation information is available, by region.
+        coverage = self._coverage(snap)
+        region_row = {a: i for i, a in enumerate(coverage.regions)}
+        rows = np.array([region_row[a] for a in alpha2], dtype='int64')
+        has_inflation = coverage.has_inflation[rows]
+        first_year = [str(y) for y in coverage.inflation_first_year[rows]]
+        last_year = [str(y) for y in coverage.inflation_last_year[rows]]
+        if range_table_dates:
+            options_df['InflationDates'] = [[f, l] if h else np.NaN
+                                            for h, f, l in zip(has_inflation, first_year, last_year)]
+        else:
+            options_df['InflationDates'] = [snap.cpi_year_index[a].astype(str).tolist() if h else np.NaN
+                                            for h, a in zip(has_inflation, alpha2)]
+
+        # Dates for which exchange rate information is available, by currency.
+        has_rate, first_day, last_day = coverage.has_rate, coverage.rate_first_day, coverage.rate_last_day
+        first_labels, last_labels = epoch_days_to_labels(first_day), epoch_days_to_labels(last_day)
+        currency_position = {c: i for i, c in enumerate(coverage.currencies)}
+        available = [[currency_position[c.upper()] for c in currencies
+                      if c.upper() in currency_position and has_rate[currency_position[c.upper()]]]
+                     for currencies in options_df['Currencies']]
+        codes = coverage.currencies
+        exchange_dates = list()
+        for currency_columns in available:
+            if range_table_dates:
+                dates = [[first_labels[j], last_labels[j]] for j in currency_columns]
+            else:
+                dates = [snap.currency_date_record[codes[j]] for j in currency_columns]
+            exchange_dates.append(np.NaN if not len(dates) else (dates[0] if len(dates) == 1 else dates))
+        options_df['ExchangeDates'] = exchange_dates
+        has_exchange = np.array([len(c) > 0 for c in available], dtype=bool)
+
+        # Add Overlap (from the first day of the first year with CPI information to the last day of the last year).
+        single = has_inflation & np.array([len(c) == 1 for c in available], dtype=bool)
+        currency_column = np.array([c[0] if len(c) else 0 for c in available], dtype='int64')
+        year_start = np.array([int(y) if h else 1970 for h, y in zip(has_inflation, first_year)]) - 1970
+        year_end = np.array([int(y) if h else 1970 for h, y in zip(has_inflation, last_year)]) - 1969
+        floor = np.maximum(year_start.astype('datetime64[Y]').astype('datetime64[D]').astype('int64'),
+                           first_day[currency_column] if first_day.size else 0)
+        ceiling = np.minimum(year_end.astype('datetime64[Y]').astype('datetime64[D]').astype('int64') - 1,
+                             last_day[currency_column] if last_day.size else 0)
+        floor_labels, ceiling_labels = epoch_days_to_labels(floor), epoch_days_to_labels(ceiling)
+        options_df['Overlap'] = [
+            [floor_labels[i], ceiling_labels[i]] if single[i] else
+            (year_date_overlap(options_df['InflationDates'].iat[i], options_df['ExchangeDates'].iat[i])
+             if has_inflation[i] and has_exchange[i] else np.NaN)
+            for i in range(len(alpha2))]
 
         # Weight Rows by Completeness; Sort by Data Overlap and Alpha2 Code
-        options_df['TempRanking'] = options_df.apply(lambda x: options_ranking(x['InflationDates'], x['ExchangeDates']),
-                                                     axis=1)
-        options_df = options_df.sort_values(['TempRanking', 'Region'], ascending=[False, True])
+        options_df['TempRanking'] = options_rankings(has_inflation, has_exchange)
+        return options_df.sort_values(['TempRanking', 'Region'], ascending=[False, True])
 
-        if table_overlap_only and info == 'all':
-            options_df = pandas_null_drop(options_df, subset=['InflationDates', 'ExchangeDates'])
-        elif table_overlap_only and info != 'all':
-            warn("`table_overlap_only` can only take effect if `info` is equal to 'all'.")
+    def _options_table(self, snap, info, table_overlap_only=False, range_table_dates=True):
+        """
 
-        # Subset
-        col_order = self._table_col_order
-        if info == 'exchange':
-            col_order = [c for c in self._table_col_order if c != 'InflationDates']
-        elif info == 'inflation':
-            col_order = [c for c in self._table_col_order if c != 'ExchangeDates']
-        elif info != 'all':
-            self._options_info_error('table')
+        | Tool to Generate Information for ``options()`` in table form.
+        |
+        | Tables are cached for each (`info`, `table_overlap_only`, `range_table_dates`) until the data is refreshed.
 
-        return options_df.drop('TempRanking', axis=1)[col_order].reset_index(drop=True)
+        :param snap: the snapshot of data to use.
+        :type snap: ``DataSnapshot``
+        :param info: 'exchange', 'inflation' or 'all' ('all' requires rformat is set to 'table').
+        :type info: ``str``
+        :param table_overlap_only: when info is set to 'all', keep only those rows for which exchange rate and inflation data overlap.
+        :type table_overlap_only: ``bool``
+        :param range_table_dates: if True, only report the minimum and maximum date for which data is available;
+                              if False, all dates for which data is available will be reported. Defaults to True.
+        :type range_table_dates: ``bool``
+        :return: dataframe summarizing databases currently cached by ``EasyPeasy()``.
+        :rtype: ``Pandas DataFrame``
+        """
+        if info not in ('exchange', 'inflation', 'all'):
+            self._options_info_error('table')
+        if table_overlap_only and info != 'all':
+            warn("`table_overlap_only` can only take effect if `info` is equal to 'all'.")
 
-    def _options_lists(self, info):
+        # Note: the cache is replaced (rather than cleared) when the snapshot changes, so other threads
+        #       holding the previous snapshot are unaffected.
+        cached_snap, cache = self._options_cache
+        if cached_snap is not snap:
+            cache = dict()
+            self._options_cache = (snap, cache)
+
+        key = (info, bool(table_overlap_only and info == 'all'), bool(range_table_dates))
+        options_df = cache.get(key)
+        if options_df is None:
+            options_df = self._options_frame(snap, range_table_dates)
+            if key[1]:
+                options_df = options_df[options_df['TempRanking'] == 3]
+
+            # Subset
+            col_order = self._table_col_order
+            if info == 'exchange':
+                col_order = [c for c in self._table_col_order if c != 'InflationDates']
+            elif info == 'inflation':
+                col_order = [c for c in self._table_col_order if c != 'ExchangeDates']
+
+            options_df = cache[key] = options_df[col_order].reset_index(drop=True)
+        return options_df.copy()
+
+    def _options_lists(self, snap, info):
         """
 
         Tool to Generate Information for ``options()`` in list form.
 
+        :param snap: the snapshot of data to use.
+        :type snap: ``DataSnapshot``
         :param info: 'exchange', 'inflation' or 'all' ('all' requires rformat is set to 'table').
         :type info: ``str``
         :return: list of requested information.
@@ -660,7 +1812,13 @@ class EasyPeasy(object):
         if info.strip().lower() not in ['exchange', 'inflation']:
             self._options_info_error('list')
 
-        d = self._exchange_dict if info.strip().lower() == 'exchange' else self._cpi_dict
+        if isinstance(snap, SQLiteSnapshot):
+            currency_ranges, region_ranges = snap.coverage_summary()
+            if info.strip().lower() == 'exchange':
+                return sorted(c for c in currency_ranges if c != 'EUR')
+            return sorted(region_ranges)
+
+        d = snap.exchange_dict if info.strip().lower() == 'exchange' else snap.cpi_dict
 
         full = [list(v.keys()) for k, v in d.items()]
         return sorted(set([i for s in full for i in s]))
@@ -688,10 +1846,10 @@ class EasyPeasy(object):
         """
         pretty_df = None
         if rformat == 'list':
-            request = self._options_lists(info)
+            request = self._options_lists(self._snapshot, info)
             return request if not pretty_print else pprint(request, width=65, compact=True)
         elif rformat == 'table':
-            request = self._options_table(info, table_overlap_only, range_table_dates)
+            request = self._options_table(self._snapshot, info, table_overlap_only, range_table_dates)
             if pretty_print:
                 pretty_df = request.drop('RegionFull', axis=1)
                 pretty_df['Currencies'] = pretty_df['Currencies'].str.join("; ")
@@ -702,3 +1860,43 @@ class EasyPeasy(object):
             raise ValueError("`rformat` must be one of:\n"
                              " - 'list', for a list of the requested information.\n"
                              " - 'table', for a table (dataframe) of the requested information.")
+
+    def available_regions(self, start_year=None, end_year=None, info='all'):
+        """
+
+        | Find the regions for which data is available from `start_year` to `end_year`, e.g., those with
+        | inflation and exchange rate information covering 2005-2015.
+        |
+        | A region is included if the first and last years for which it has data (see the 'InflationDates' and
+        | 'ExchangeDates' columns of ``options()``) span this range. Queries are answered from an index built once
+        | per snapshot of data, so they are far cheaper than building (and filtering) the ``options()`` table.
+
+        :param start_year: the first year which must be covered. Defaults to None (no limit).
+        :type start_year: ``int``
+        :param end_year: the last year which must be covered. Defaults to None (no limit).
+        :type end_year: ``int``
+        :param info: 'inflation', 'exchange' or 'all' (both). Defaults to 'all'.
+        :type info: ``str``
+        :return: ISO Alpha 2 Codes (sorted).
+        :rtype: ``list``
+        """
+        return self._coverage(self._snapshot).regions_with(start_year, end_year, info)
+
+    def available_currencies(self, date=None, start_date=None, end_date=None):
+        """
+
+        | Find the currencies with an exchange rate reported on `date` or, alternatively, with exchange rates
+        | from `start_date` to `end_date` (as given by the 'ExchangeDates' column of ``options()``).
+        |
+        | See ``available_regions()``.
+
+        :param date: a date (DD/MM/YYYY, YYYY-MM-DD or a datetime). Defaults to None.
+        :type date: ``str`` or ``datetime``
+        :param start_date: a date (DD/MM/YYYY, YYYY-MM-DD or a datetime). Defaults to None (no limit).
+        :type start_date: ``str`` or ``datetime``
+        :param end_date: a date (DD/MM/YYYY, YYYY-MM-DD or a datetime). Defaults to None (no limit).
+        :type end_date: ``str`` or ``datetime``
+        :return: Currency Alpha 3 Codes (sorted).
+        :rtype: ``list``
+        """
+        return self._coverage(self._snapshot).currencies_with(date, start_date, end_date)
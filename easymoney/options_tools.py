@@ -8,6 +8,7 @@
 """
 # Imports
 import numpy as np
+import pandas as pd
 from datetime import datetime
 from collections import defaultdict
 
@@ -44,6 +45,59 @@ def options_ranking(inflation, exchange):
         return 0
 
 
+def options_rankings(has_inflation, has_exchange):
+    """
+
+    Vectorized version of ``options_ranking()``.
+
+    :param has_inflation: whether or not inflation data is available, for each row.
+    :type has_inflation: ``ndarray``
+    :param has_exchange: whether or not exchange data is available, for each row.
+    :type has_exchange: ``ndarray``
+    :return: completeness of each row (see ``options_ranking()``).
+    :rtype: ``ndarray``
+    """
+    return np.where(has_inflation & has_exchange, 3, np.where(has_exchange, 2, np.where(has_inflation, 1, 0)))
+
+
+def first_last_present(matrix):
+    """
+
+    Find the first and last row of each column of a matrix which is not NaN.
+
+    :param matrix: a 2D array, e.g., a (year x region) CPI matrix.
+    :type matrix: ``ndarray``
+    :return: whether or not each column has any values, and the first and last row with a value (0 if none).
+    :rtype: ``tuple``
+    """
+    present = ~np.isnan(matrix)
+    if not present.shape[0]:
+        none = np.zeros(present.shape[1], dtype='int64')
+        return none.astype(bool), none, none
+    has = present.any(axis=0)
+    first = np.argmax(present, axis=0)
+    last = present.shape[0] - 1 - np.argmax(present[::-1], axis=0)
+    return has, first, last
+
+
+def epoch_days_to_labels(days, date_format="%d/%m/%Y"):
+    """
+
+    Vectorized conversion of days since 01/01/1970 into date strings.
+
+    :param days: days since the epoch.
+    :type days: ``ndarray`` or ``list``
+    :param date_format: the format of the dates returned. Defaults to "%d/%m/%Y".
+    :type date_format: ``str``
+    :return: the dates.
+    :rtype: ``list``
+    """
+    days = np.asarray(days, dtype='int64')
+    if not days.size:
+        return list()
+    return pd.to_datetime(days, unit='D').strftime(date_format).tolist()
+
+
 def year_date_overlap(years, full_dates, date_format="%d/%m/%Y"):
     """
 
@@ -85,14 +139,61 @@ def alpha2_by_cpi_years(regions, cpi_dictionary):
     :type regions: ``iterable``
     :param cpi_dictionary: dictionary of CPI information as returned by ``world_bank_pull(return_as='dict')``.
     :param cpi_dictionary: ``dict``
-    :return: dictionary of years for which CPI information is available for a given country.
+    :return: dictionary of years (most recent first) for which CPI information is available for a given country.
     :rtype: ``dict``
     """
-    # Note: not strictly for `EasyPeasy().options()` as this is also used in `EasyPeasy()._cpi_years()`.
+    # Note: a single pass over the CPI information (rather than one per region).
+    regions = set(regions)
     cpi_years_dict = defaultdict(list)
-    for r in regions:
-        for y in sorted(list(cpi_dictionary.keys()), reverse=True):
-            if cpi_dictionary.get(y, {}).get(r, None) != None:
+    for y in sorted(cpi_dictionary.keys(), reverse=True):
+        for r, cpi in cpi_dictionary[y].items():
+            if cpi is not None and r in regions:
                 cpi_years_dict[r].append(y)
 
     return dict(cpi_years_dict)
+
+
+def cpi_year_index(cpi_years, region_index, cpi_matrix):
+    """
+
+    | Construct an index of the form ``{CountryAlpha2: array of the years for which CPI info is available}``
+    | with a single pass over a (year x region) CPI matrix.
+    |
+    | Years are sorted (ascending) integers, so the closest year for which information is available can be found
+    | with a binary search (see ``closest_sorted()``).
+
+    :param cpi_years: the years of the rows of `cpi_matrix`, sorted (ascending).
+    :type cpi_years: ``list``
+    :param region_index: a dictionary of the form ``{alpha2: column}``.
+    :type region_index: ``dict``
+    :param cpi_matrix: a (year x region) matrix (NaN where no information was reported).
+    :type cpi_matrix: ``ndarray``
+    :return: the index (regions without any information are omitted).
+    :rtype: ``dict``
+    """
+    # Note: the positions of the values present in the transposed matrix are ordered by region, then year.
+    columns, rows = np.nonzero(~np.isnan(cpi_matrix.T))
+    years = np.array(cpi_years, dtype='int64')[rows]
+    bounds = np.searchsorted(columns, np.arange(cpi_matrix.shape[1] + 1))
+    return {r: years[bounds[c]:bounds[c + 1]] for r, c in region_index.items() if bounds[c + 1] > bounds[c]}
+
+
+def closest_sorted(value, sorted_values):
+    """
+
+    Get the value closest to `value` in an array sorted in ascending order, using a binary search.
+    Ties are resolved in favour of the larger value.
+
+    :param value: a numeric value.
+    :type value: ``int`` or ``float``
+    :param sorted_values: a non-empty array, sorted in ascending order.
+    :type sorted_values: ``ndarray``
+    :return: item in `sorted_values` closest to `value`.
+    :rtype: ``int`` or ``float``
+    """
+    position = int(np.searchsorted(sorted_values, value))
+    if position == len(sorted_values):
+        return sorted_values[-1].item()
+    elif position == 0 or sorted_values[position] - value <= value - sorted_values[position - 1]:
+        return sorted_values[position].item()
+    return sorted_values[position - 1].item()
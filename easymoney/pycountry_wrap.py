@@ -23,19 +23,26 @@ class PycountryWrap(object):
     :param fuzzy_match_threshold: a threshold for fuzzy matching confidence (requires the ``fuzzywuzzy`` package).
                                   For more, see ``EasyPeasy()`` in the `money` module.
     :type fuzzy_threshold: ``int`` or ``float``
+    :param alpha2_currency_dict: a (previously computed) mapping of alpha2 codes to currencies, which is then
+                                 shared rather than read from `path_to_data`. Defaults to None.
+    :type alpha2_currency_dict: ``dict``
+    :param countries: a (previously computed) list of country names to share. Defaults to None.
+    :type countries: ``list``
     """
 
-    def __init__(self, path_to_data=None, fuzzy_threshold=False):
+    def __init__(self, path_to_data=None, fuzzy_threshold=False, alpha2_currency_dict=None, countries=None):
         """
 
         Initialize the ``PycountryWrap()`` class.
 
         """
         # Compute the dict mapping alpha2 codes to currencies
-        self.alpha2_currency_dict = currency_mapping_to_dict(path_to_data)
+        if alpha2_currency_dict is None:
+            alpha2_currency_dict = dict(currency_mapping_to_dict(path_to_data))
+        self.alpha2_currency_dict = alpha2_currency_dict
 
         # Get a list of country names
-        self.countries = [c.name for c in list(pycountry.countries)]
+        self.countries = countries if countries is not None else [c.name for c in list(pycountry.countries)]
 
         # FuzzyWuzzy Settings
         self.fuzzy_threshold = fuzzy_threshold
@@ -51,6 +58,18 @@ class PycountryWrap(object):
                                   " - python 3: $ pip3 install fuzzywuzzy python-Levenshtein\n\n"
                                   "You may need to create a new Python instance for these changes to take effect.")
 
+    def __getstate__(self):
+        # `extractOne` is re-imported (rather than pickled) by ``__setstate__()``.
+        state = dict(self.__dict__)
+        state.pop('extractOne', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.fuzzy_threshold != False:
+            from fuzzywuzzy import process
+            self.extractOne = process.extractOne
+
     def _country_extract(self, country, extract_type='alpha_2'):
         """
 
@@ -165,34 +184,30 @@ class PycountryWrap(object):
             else:
                 return None
 
-    def map_region_to_type(self, region, extract_type='alpha_2'):
+    def _extract(self, region, country, extract_type):
         """
 
-        Maps the input region to:
-            region: 'alpha_2', 'alpha_3', 'name' or 'official_name'.
-            currency: 'currency_alpha_3', 'currency_numeric' or 'currency_name'.
+        Extract a type of information about a region from its `pycountry` object (see ``map_region_to_type()``).
 
         :param region: any region
         :type region: ``str``
-        :param extract_type: the type of information about `region` to extract. Must be one of the types listed above.
+        :param country: the `pycountry` object for `region`.
+        :type country: ``pycountry object``
+        :param extract_type: the type of information about `region` to extract.
         :type extract_type: ``str``
         :return: `extract_type` information.
         :rtype: ``str`` or ``None``
         """
-        rslt = self._region_lookup(region)
-        if rslt is None:
-            return None
-
         try:
             if 'currency_' not in extract_type.lower():
-                return self._country_extract(rslt, extract_type.lower())
+                return self._country_extract(country, extract_type.lower())
 
             else:
                 # Get the alpha_3 country code
-                alpha_2 = self._country_extract(rslt, 'alpha_2')
+                alpha_2 = self._country_extract(country, 'alpha_2')
 
                 # Look up
-                currencies = self.alpha2_currency_dict[alpha_2]
+                currencies = self.alpha2_currency_dict.get(alpha_2, [])
 
                 # Extract
                 if len(currencies):
@@ -204,3 +219,38 @@ class PycountryWrap(object):
                     return None
         except:
             return None
+
+    def map_region_to_type(self, region, extract_type='alpha_2'):
+        """
+
+        Maps the input region to:
+            region: 'alpha_2', 'alpha_3', 'name' or 'official_name'.
+            currency: 'currency_alpha_3', 'currency_numeric' or 'currency_name'.
+
+        :param region: any region
+        :type region: ``str``
+        :param extract_type: the type of information about `region` to extract. Must be one of the types listed above.
+        :type extract_type: ``str``
+        :return: `extract_type` information.
+        :rtype: ``str`` or ``None``
+        """
+        rslt = self._region_lookup(region)
+        if rslt is None:
+            return None
+        return self._extract(region, rslt, extract_type)
+
+    def map_region_to_types(self, region, extract_types):
+        """
+
+        Maps the input region to several types of information (see ``map_region_to_type()``),
+        looking the region up only once.
+
+        :param region: any region
+        :type region: ``str``
+        :param extract_types: the types of information about `region` to extract.
+        :type extract_types: ``tuple``
+        :return: the information, in the order of `extract_types` (None where it could not be obtained).
+        :rtype: ``tuple``
+        """
+        rslt = self._region_lookup(region)
+        return tuple(self._extract(region, rslt, t) if rslt is not None else None for t in extract_types)
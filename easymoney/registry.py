@@ -0,0 +1,206 @@
+# coding: utf-8
+
+"""
+
+    Process-Wide Registry of the Data Shared by EasyPeasy Instances
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+# Imports
+import weakref
+import pycountry
+import threading
+
+from easymoney.snapshot import build_snapshot
+from easymoney.sources.databases import currency_mapping_to_dict
+
+
+class SharedData(object):
+    """
+
+    | The data used by ``EasyPeasy()`` which does not depend on an instance's configuration
+    | (e.g., `precision` or `fuzzy_threshold`), i.e., the current ``DataSnapshot()`` as well as
+    | region and currency information.
+    |
+    | Every instance sharing an entry sees the same snapshot, so a refresh performed by any one of them
+    | is seen by all of them.
+
+    :param key: the key of this entry in a ``DataRegistry()``.
+    :type key: ``tuple``
+    :param regions: ISO alpha 2 country codes.
+    :type regions: ``set``
+    :param alpha2_currency_dict: a dictionary mapping alpha2 codes to currencies.
+    :type alpha2_currency_dict: ``dict``
+    :param countries: country names.
+    :type countries: ``list``
+    :param snapshot: the current snapshot.
+    :type snapshot: ``DataSnapshot``
+
+    .. note::
+
+        `coverage` holds the ``CoverageIndex()`` of the most recent snapshot it was requested for
+        (see ``EasyPeasy().available_regions()``).
+    """
+
+    def __init__(self, key, regions, alpha2_currency_dict, countries, snapshot):
+        """
+
+        Initialize the ``SharedData()`` class.
+
+        """
+        self.key = key
+        self.regions = regions
+        self.alpha2_currency_dict = alpha2_currency_dict
+        self.countries = countries
+        self.snapshot = snapshot
+        self.coverage = None
+        self.refresh_lock = threading.Lock()
+        self.references = 0
+
+
+def load_shared_data(source_options, data_path=None, key=None, snapshot=None):
+    """
+
+    Load all of the data shared by ``EasyPeasy()`` instances.
+
+    :param source_options: keyword arguments for ``build_snapshot()``, e.g., ``{"ecb_url": ...}``.
+    :type source_options: ``dict``
+    :param data_path: path to the database file(s). Defaults to None.
+    :type data_path: ``str``
+    :param key: see ``SharedData()``. Defaults to None.
+    :type key: ``tuple``
+    :param snapshot: a snapshot to use, rather than downloading the data. Defaults to None.
+    :type snapshot: ``DataSnapshot``
+    :return: the loaded data.
+    :rtype: ``SharedData``
+    """
+    regions = set([c.alpha_2 for c in list(pycountry.countries)])
+    return SharedData(key=key,
+                      regions=regions,
+                      alpha2_currency_dict=dict(currency_mapping_to_dict(data_path)),
+                      countries=[c.name for c in list(pycountry.countries)],
+                      snapshot=snapshot if snapshot is not None else build_snapshot(**source_options))
+
+
+class DataRegistry(object):
+    """
+
+    | A reference-counted registry of ``SharedData()``, keyed by the data's sources and (database) data path.
+    |
+    | The first ``acquire()`` of a key loads the data; subsequent ones simply share it.
+    | Once every reference has been released (see ``releaser()``), the entry is dropped
+    | (and its memory can be reclaimed).
+
+    """
+
+    def __init__(self):
+        """
+
+        Initialize the ``DataRegistry()`` class.
+
+        """
+        self._entries = dict()
+        self._key_locks = dict()
+        self._lock = threading.Lock()
+
+        # Weak references (with callbacks) created by ``releaser()`` which are yet to be called.
+        self._pending = set()
+
+    @staticmethod
+    def key(source_options, data_path=None):
+        """
+
+        Construct the key for a given set of sources.
+
+        :param source_options: see ``load_shared_data()``.
+        :type source_options: ``dict``
+        :param data_path: see ``load_shared_data()``.
+        :type data_path: ``str``
+        :return: a (hashable) key.
+        :rtype: ``tuple``
+        """
+        return tuple(sorted(source_options.items())), data_path
+
+    def acquire(self, source_options, data_path=None, snapshot=None):
+        """
+
+        Obtain a reference to the data for a given set of sources, loading it if required.
+        Concurrent requests for the same (unloaded) data share a single load.
+
+        :param source_options: see ``load_shared_data()``.
+        :type source_options: ``dict``
+        :param data_path: see ``load_shared_data()``.
+        :type data_path: ``str``
+        :param snapshot: see ``load_shared_data()``. Only used if the data is not already loaded. Defaults to None.
+        :type snapshot: ``DataSnapshot``
+        :return: the shared data.
+        :rtype: ``SharedData``
+        """
+        key = self.key(source_options, data_path)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is None:
+                entry = load_shared_data(source_options, data_path, key, snapshot)
+            with self._lock:
+                self._entries[key] = entry
+                entry.references += 1
+                self._key_locks.pop(key, None)
+        return entry
+
+    def release(self, entry):
+        """
+
+        Release a reference obtained from ``acquire()``.
+
+        :param entry: the shared data.
+        :type entry: ``SharedData``
+        """
+        with self._lock:
+            entry.references -= 1
+            if entry.references <= 0 and self._entries.get(entry.key) is entry:
+                del self._entries[entry.key]
+
+    def releaser(self, owner, entry):
+        """
+
+        | Arrange for a reference obtained from ``acquire()`` to be released once `owner` is garbage collected,
+        | so owners which are never closed do not keep the data loaded.
+        |
+        | The function returned releases the reference sooner (e.g., from `owner`'s ``close()`` method).
+        | Either way, the reference is released only once.
+
+        :param owner: the object holding the reference, e.g., an ``EasyPeasy()`` instance.
+        :type owner: ``object``
+        :param entry: the shared data.
+        :type entry: ``SharedData``
+        :return: a function (of no arguments) which releases the reference.
+        :rtype: ``callable``
+        """
+        if hasattr(weakref, 'finalize'):
+            return weakref.finalize(owner, self.release, entry)
+
+        # ``weakref.finalize()`` was added in Python 3.4. Note: the callback must not refer to `owner`.
+        def release(_=None):
+            try:
+                self._pending.remove(reference)
+            except KeyError:
+                return
+            self.release(entry)
+
+        reference = weakref.ref(owner, release)
+        self._pending.add(reference)
+        return release
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# The registry used by ``EasyPeasy()``.
+DATA_REGISTRY = DataRegistry()
@@ -0,0 +1,223 @@
+# coding: utf-8
+
+"""
+
+    Tools for Resampling Exchange Rate Data
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+# Imports
+import numpy as np
+import pandas as pd
+from datetime import datetime
+
+from easymoney.support_tools import min_max
+from easymoney.support_tools import closest_value
+from easymoney.support_tools import to_epoch_days
+from easymoney.support_tools import EPOCH_ORDINAL
+
+
+RESAMPLE_FREQUENCIES = ('monthly', 'quarterly', 'annual')
+RESAMPLE_HOWS = ('mean', 'last', 'first')
+
+
+def _period_label(year, month, frequency):
+    """
+
+    Construct the label for the period containing a given year and month.
+
+    :param year: a year.
+    :type year: ``int``
+    :param month: a month (1-12).
+    :type month: ``int``
+    :param frequency: one of: 'monthly', 'quarterly' or 'annual'.
+    :type frequency: ``str``
+    :return: 'YYYY-MM' (monthly), 'YYYYQn' (quarterly) or 'YYYY' (annual).
+    :rtype: ``str``
+    """
+    if frequency == 'monthly':
+        return "%04d-%02d" % (year, month)
+    elif frequency == 'quarterly':
+        return "%04dQ%d" % (year, (month - 1) // 3 + 1)
+    elif frequency == 'annual':
+        return "%04d" % (year)
+    else:
+        raise ValueError("`frequency` must be one of: %s." % (", ".join(["'%s'" % f for f in RESAMPLE_FREQUENCIES])))
+
+
+def _period_ordinal(label):
+    """
+
+    Convert a period label into the number of months since year 0 (used to measure distances between periods).
+
+    :param label: a label as produced by ``_period_label()``.
+    :type label: ``str``
+    :return: month count of the first month in the period.
+    :rtype: ``int``
+    """
+    if 'Q' in label:
+        year, quarter = label.split('Q')
+        return int(year) * 12 + (int(quarter) - 1) * 3
+    elif '-' in label:
+        year, month = label.split('-')
+        return int(year) * 12 + int(month) - 1
+    else:
+        return int(label) * 12
+
+
+def period_key(date, frequency, from_format="%d/%m/%Y"):
+    """
+
+    Map a date onto the label of the period which contains it.
+
+    :param date: a date of the form `from_format` (or YYYY-MM-DD) or a datetime. If `frequency` is 'annual',
+                 a year (e.g., 2015) is also accepted.
+    :type date: ``str``, ``datetime`` or ``int``
+    :param frequency: one of: 'monthly', 'quarterly' or 'annual'.
+    :type frequency: ``str``
+    :param from_format: the format of `date`. Defaults to "%d/%m/%Y".
+    :type from_format: ``str``
+    :return: the period label.
+    :rtype: ``str``
+    """
+    if frequency == 'annual' and str(date).isdigit():
+        return _period_label(int(date), 1, frequency)
+    elif isinstance(date, str) and from_format != "%d/%m/%Y":
+        dt = datetime.strptime(date, from_format)
+    else:
+        dt = datetime.fromordinal(EPOCH_ORDINAL + to_epoch_days(date))
+    return _period_label(dt.year, dt.month, frequency)
+
+
+def closest_period(label, labels):
+    """
+
+    Get the closest period label in an iterable of period labels.
+
+    :param label: a period label.
+    :type label: ``str``
+    :param labels: an iterable of period labels of the same frequency as `label`.
+    :type labels: ``iterable``
+    :return: item in `labels` closest to `label`.
+    :rtype: ``str``
+    """
+    ordinals = dict((_period_ordinal(l), l) for l in labels)
+    return ordinals[closest_value(_period_ordinal(label), sorted(ordinals))]
+
+
+def exchange_dict_to_wide_data_frame(exchange_dict, from_format="%d/%m/%Y"):
+    """
+
+    Convert an exchange rate dictionary into a (date x currency) DataFrame.
+
+    :param exchange_dict: a dictionary of the form ``{date: {currency: rate}}``, as returned by ``ecb_xml_exchange_data()``.
+    :type exchange_dict: ``dict``
+    :param from_format: the format of the dates in `exchange_dict`. Defaults to "%d/%m/%Y".
+    :type from_format: ``str``
+    :return: dataframe indexed by date (ascending) with one column per currency.
+    :rtype: ``Pandas DataFrame``
+    """
+    df = pd.DataFrame.from_dict(exchange_dict, orient='index')
+    df.index = pd.to_datetime(df.index, format=from_format)
+    return df.sort_index()
+
+
+def resampled_rate_tables(exchange_dict, frequencies=RESAMPLE_FREQUENCIES, hows=RESAMPLE_HOWS):
+    """
+
+    Resample daily exchange rates into lookup tables of lower frequency.
+
+    :param exchange_dict: a dictionary of the form ``{date: {currency: rate}}``, as returned by ``ecb_xml_exchange_data()``,
+                          or a (date x currency) dataframe (see ``exchange_dict_to_wide_data_frame()``).
+    :type exchange_dict: ``dict`` or ``Pandas DataFrame``
+    :param frequencies: any of: 'monthly', 'quarterly' and 'annual'. Defaults to all three.
+    :type frequencies: ``iterable``
+    :param hows: the statistic(s) used to summarize each period; any of: 'mean', 'last' and 'first'.
+                 Defaults to all three.
+    :type hows: ``iterable``
+    :return: a dictionary of the form ``{(frequency, how): {currency: {period: rate}}}``.
+    :rtype: ``dict``
+    """
+    if isinstance(exchange_dict, pd.DataFrame):
+        df = exchange_dict
+    else:
+        df = exchange_dict_to_wide_data_frame(exchange_dict)
+    years, months = df.index.year, df.index.month
+
+    tables = dict()
+    for frequency in frequencies:
+        labels = [_period_label(y, m, frequency) for y, m in zip(years, months)]
+        grouped = df.groupby(labels)
+        for how in hows:
+            if how not in RESAMPLE_HOWS:
+                raise ValueError("`how` must be one of: %s." % (", ".join(["'%s'" % h for h in RESAMPLE_HOWS])))
+            resampled = getattr(grouped, how)()
+            tables[(frequency, how)] = {c: resampled[c].dropna().to_dict() for c in resampled.columns}
+
+    return tables
+
+
+def rate_table_ranges(rate_tables):
+    """
+
+    Get the earliest and latest period for each currency in each resampled table.
+
+    :param rate_tables: tables as returned by ``resampled_rate_tables()``.
+    :type rate_tables: ``dict``
+    :return: a dictionary of the form ``{(frequency, how): {currency: [first period, last period]}}``.
+    :rtype: ``dict``
+    """
+    return {k: {c: list(min_max(list(periods.keys()))) for c, periods in v.items() if len(periods)}
+            for k, v in rate_tables.items()}
+
+
+def rate_table_arrays(rate_tables, currency_index):
+    """
+
+    Arrange resampled tables into dense arrays (one per frequency), e.g., for compact storage.
+
+    :param rate_tables: tables as returned by ``resampled_rate_tables()`` (for all of ``RESAMPLE_HOWS``).
+    :type rate_tables: ``dict``
+    :param currency_index: a dictionary of the form ``{currency: column}``.
+    :type currency_index: ``dict``
+    :return: a dictionary of the form ``{frequency: (periods, array)}``, where ``array[how, period, currency]``
+             is a rate (NaN if unavailable) and `how` indexes ``RESAMPLE_HOWS``.
+    :rtype: ``dict``
+    """
+    arrays = dict()
+    for frequency in set(f for f, _ in rate_tables):
+        tables = [rate_tables.get((frequency, how), {}) for how in RESAMPLE_HOWS]
+        periods = sorted(set(p for t in tables for rates in t.values() for p in rates), key=_period_ordinal)
+        rows = {p: i for i, p in enumerate(periods)}
+        array = np.full((len(RESAMPLE_HOWS), len(periods), len(currency_index)), np.nan)
+        for h, table in enumerate(tables):
+            for c, rates in table.items():
+                column = currency_index[c]
+                for p, rate in rates.items():
+                    array[h, rows[p], column] = rate
+        array.setflags(write=False)
+        arrays[frequency] = (periods, array)
+    return arrays
+
+
+def rate_tables_from_arrays(arrays, currency_index):
+    """
+
+    Invert ``rate_table_arrays()``.
+
+    :param arrays: a dictionary of the form ``{frequency: (periods, array)}``.
+    :type arrays: ``dict``
+    :param currency_index: a dictionary of the form ``{currency: column}``.
+    :type currency_index: ``dict``
+    :return: a dictionary of the form ``{(frequency, how): {currency: {period: rate}}}``.
+    :rtype: ``dict``
+    """
+    columns = [(c, i) for c, i in currency_index.items() if c != 'EUR']
+    tables = dict()
+    for frequency, (periods, array) in arrays.items():
+        for h, how in enumerate(RESAMPLE_HOWS):
+            reported = ~np.isnan(array[h])
+            tables[(frequency, how)] = {
+                c: dict(zip([periods[r] for r in np.flatnonzero(reported[:, i])], array[h][reported[:, i], i].tolist()))
+                for c, i in columns}
+    return tables
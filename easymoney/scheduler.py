@@ -0,0 +1,198 @@
+# coding: utf-8
+
+"""
+
+    Background Refreshing of the Data Cached by EasyPeasy
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+# Imports
+import threading
+
+from warnings import warn
+from datetime import datetime
+from datetime import timedelta
+
+
+class RefreshScheduler(object):
+    """
+
+    | Keep the data cached by an ``EasyPeasy()`` instance current by refreshing it in a background thread.
+    |
+    | Exchange rate information is refreshed once a day, after `exchange_time`, whereas inflation (CPI) information
+    | is refreshed every `inflation_interval`. Refreshes are performed with ``EasyPeasy().refresh()``, so callers
+    | are never interrupted: they keep using the previous data until the new data is swapped in.
+    |
+    | If the exchange rates have not been published yet (i.e., the refresh finds that they are unchanged), the
+    | refresh is retried every `retry_interval` until the end of the day.
+    |
+    | Usage: ``scheduler = RefreshScheduler(EasyPeasy()).start()``.
+
+    :param easy_peasy: the instance to refresh (any object with a ``refresh(exchange, inflation, incremental)`` method
+                       which returns whether or not the data changed).
+    :type easy_peasy: ``EasyPeasy``
+    :param exchange_time: time of day (w.r.t. `clock`; 'HH:MM') after which exchange rate information is refreshed.
+                          The ECB publishes its rates around 16:00 CET. Defaults to '15:30' (UTC).
+    :type exchange_time: ``str``
+    :param inflation_interval: time between refreshes of inflation information. Defaults to 7 days.
+    :type inflation_interval: ``timedelta``
+    :param retry_interval: time to wait before retrying a refresh which failed or found that the exchange rates
+                           had not changed. Defaults to 15 minutes.
+    :type retry_interval: ``timedelta``
+    :param incremental: if True, only download the exchange rates published in the last 90 days
+                        (see ``EasyPeasy().refresh()``). Defaults to True.
+    :type incremental: ``bool``
+    :param poll_interval: number of seconds the background thread sleeps between checking for pending refreshes.
+                          Defaults to 60.
+    :type poll_interval: ``float`` or ``int``
+    :param clock: a callable which returns the current (UTC) time. Defaults to ``datetime.utcnow``.
+    :type clock: ``callable``
+    """
+
+    def __init__(self
+                 , easy_peasy
+                 , exchange_time="15:30"
+                 , inflation_interval=timedelta(days=7)
+                 , retry_interval=timedelta(minutes=15)
+                 , incremental=True
+                 , poll_interval=60
+                 , clock=None):
+        """
+
+        Initialize the ``RefreshScheduler()`` class.
+
+        """
+        self._easy_peasy = easy_peasy
+        try:
+            self._exchange_time = tuple(int(i) for i in exchange_time.split(":"))
+            datetime(2000, 1, 1, *self._exchange_time)
+        except (AttributeError, TypeError, ValueError):
+            raise ValueError("`exchange_time` must be a string of the form 'HH:MM'.")
+        self._inflation_interval = inflation_interval
+        self._retry_interval = retry_interval
+        self._incremental = incremental
+        self._poll_interval = poll_interval
+        self._clock = clock if clock is not None else datetime.utcnow
+
+        # Schedule (the data is assumed to be current when the scheduler is created).
+        now = self._clock()
+        self.next_exchange_refresh = self._next_exchange_time(now)
+        self.next_inflation_refresh = now + inflation_interval
+        self.last_error = None
+
+        # Threading
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._run_lock = threading.Lock()
+
+    def _next_exchange_time(self, after):
+        """
+
+        Get the first time after `after` that exchange rate information should be refreshed.
+
+        :param after: a time.
+        :type after: ``datetime``
+        :return: the next time (strictly after `after`) of the day equal to `exchange_time`.
+        :rtype: ``datetime``
+        """
+        candidate = after.replace(hour=self._exchange_time[0], minute=self._exchange_time[1], second=0, microsecond=0)
+        return candidate if candidate > after else candidate + timedelta(days=1)
+
+    def run_pending(self):
+        """
+
+        Perform any refreshes which are due (called periodically by the background thread).
+
+        :return: the data which changed; any of: 'exchange' and 'inflation'.
+        :rtype: ``list``
+        """
+        with self._run_lock:
+            now = self._clock()
+            retry = now + self._retry_interval
+            due = [k for k, v in (('exchange', now >= self.next_exchange_refresh),
+                                  ('inflation', now >= self.next_inflation_refresh)) if v]
+
+            # Note: each source is refreshed separately, so the scheduler knows which of them changed.
+            changed, error = list(), None
+            for source in due:
+                try:
+                    refreshed = self._easy_peasy.refresh(exchange=source == 'exchange',
+                                                         inflation=source == 'inflation',
+                                                         incremental=self._incremental)
+                except Exception as e:
+                    error = e
+                    warn("\nRefreshing EasyPeasy's %s data failed (%s: %s).\nRetrying at %s." % (
+                        source, type(e).__name__, str(e), str(retry)))
+                    if source == 'exchange':
+                        self.next_exchange_refresh = retry
+                    else:
+                        self.next_inflation_refresh = retry
+                    continue
+
+                if refreshed:
+                    changed.append(source)
+                if source == 'inflation':
+                    self.next_inflation_refresh = now + self._inflation_interval
+                elif refreshed or retry.date() != now.date():
+                    self.next_exchange_refresh = self._next_exchange_time(now)
+                else:
+                    # The day's rates have not been published yet.
+                    self.next_exchange_refresh = retry
+
+            if due:
+                self.last_error = error
+            return changed
+
+    def _run(self):
+        """
+
+        Body of the background thread.
+
+        """
+        while not self._stop_event.is_set():
+            self.run_pending()
+            self._stop_event.wait(self._poll_interval)
+
+    @property
+    def running(self):
+        """
+
+        Whether or not the background thread is running.
+
+        :rtype: ``bool``
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """
+
+        Start refreshing in a (daemon) background thread.
+
+        :return: this scheduler.
+        :rtype: ``RefreshScheduler``
+        """
+        if self.running:
+            raise RuntimeError("The scheduler is already running.")
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="EasyPeasyRefreshScheduler")
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        """
+
+        Stop the background thread. A refresh which is underway is allowed to finish.
+
+        :param timeout: maximum number of seconds to wait for the thread to finish. Defaults to None (no limit).
+        :type timeout: ``float``, ``int`` or ``None``
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
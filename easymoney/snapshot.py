@@ -0,0 +1,1267 @@
+# coding: utf-8
+
+"""
+
+    Immutable Snapshots of the Data Cached by EasyPeasy
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+# Imports
+import threading
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from collections import OrderedDict
+
+from easymoney.support_tools import file_validators
+from easymoney.support_tools import date_to_epoch_days
+from easymoney.support_tools import epoch_days_to_date
+from easymoney.coverage import availability_bitmaps
+from easymoney.options_tools import cpi_year_index
+from easymoney.resample_tools import rate_table_arrays
+from easymoney.resample_tools import rate_table_ranges
+from easymoney.resample_tools import resampled_rate_tables
+from easymoney.resample_tools import rate_tables_from_arrays
+from easymoney.snapshot_file import read_snapshot_file
+from easymoney.snapshot_file import write_snapshot_file
+from easymoney.sqlite_store import SQLiteStore
+
+# Online Data Sources
+from easymoney.sources.ecb_interface import ECB_URL
+from easymoney.sources.ecb_interface import ECB_90_DAY_XML
+from easymoney.sources.ecb_interface import ECB_HISTORY_XML
+from easymoney.sources.ecb_interface import ecb_xml_exchange_data_if_modified
+from easymoney.sources.ecb_interface import exchange_data_from_frame
+from easymoney.sources.ecb_interface import ecb_exchange_frame_if_modified
+from easymoney.sources.world_bank_interface import CPI_INDICATOR
+from easymoney.sources.world_bank_interface import world_bank_columns
+from easymoney.sources.world_bank_interface import world_bank_columns_to_dict
+
+
+EXCHANGE_FIELDS = ('exchange_dict', 'ecb_currency_codes', 'currency_date_record', 'currency_date_record_range',
+                   'date_axis', 'date_axis_labels', 'rate_matrix', 'currency_index', 'rate_tables',
+                   'rate_table_arrays', 'rate_tables_range', 'currency_availability')
+INFLATION_FIELDS = ('cpi_dict', 'cpi_matrix', 'cpi_years', 'region_index', 'cpi_year_index', 'alpha2_cpi_record',
+                    'indicator_tables')
+
+SNAPSHOT_FIELDS = EXCHANGE_FIELDS + INFLATION_FIELDS + ('source_info', 'created')
+
+# Fields which can be derived from the array-backed fields
+# (and are therefore omitted when a snapshot is pickled or saved).
+DERIVED_FIELDS = ('exchange_dict', 'currency_date_record', 'currency_date_record_range', 'currency_availability',
+                  'date_axis_labels', 'rate_tables', 'rate_tables_range', 'cpi_dict', 'cpi_year_index',
+                  'alpha2_cpi_record')
+
+
+class DataSnapshot(object):
+    """
+
+    | Immutable container for all of the data loaded by ``EasyPeasy()``.
+    |
+    | Readers obtain every piece of data from a single snapshot (i.e., a single reference read),
+    | whereas refreshes build a new snapshot and swap it in. Readers therefore never observe a half-updated state
+    | and never need to take a lock.
+    |
+    | Snapshots are pickled (and saved, see ``write_snapshot()``) in a compact form, without the fields in
+    | ``DERIVED_FIELDS``; these are rebuilt from the array-backed fields when they are first accessed.
+
+    :param fields: a value for each of the names in ``SNAPSHOT_FIELDS`` (those in ``DERIVED_FIELDS`` may be
+                   omitted, in which case they are derived when first accessed).
+    :type fields: ``dict``
+    """
+
+    # Note: snapshots can be referenced weakly, e.g., by the handles of ``EasyPeasy().resolve()``.
+    __slots__ = SNAPSHOT_FIELDS + ('__weakref__',)
+
+    def __init__(self, **fields):
+        """
+
+        Initialize the ``DataSnapshot()`` class.
+
+        """
+        missing = [k for k in EXCHANGE_FIELDS + INFLATION_FIELDS if k not in fields and k not in DERIVED_FIELDS]
+        if len(missing):
+            raise ValueError("Missing snapshot field(s): %s." % (", ".join(missing)))
+        for k in SNAPSHOT_FIELDS:
+            if k in fields or k not in DERIVED_FIELDS:
+                object.__setattr__(self, k, fields.get(k))
+        if self.created is None:
+            object.__setattr__(self, 'created', datetime.utcnow())
+        if self.source_info is None:
+            object.__setattr__(self, 'source_info', dict())
+
+    def __setattr__(self, name, value):
+        raise AttributeError("`DataSnapshot` objects are immutable.")
+
+    def __delattr__(self, name):
+        raise AttributeError("`DataSnapshot` objects are immutable.")
+
+    def __getattr__(self, name):
+        # Only called for fields which have not been set, i.e., those omitted from a compact (unpickled) snapshot.
+        if name not in DERIVED_FIELDS:
+            raise AttributeError(name)
+        value = _DERIVATIONS[name](self)
+        object.__setattr__(self, name, value)
+        return value
+
+    def __reduce__(self):
+        compact = {k: object.__getattribute__(self, k) for k in SNAPSHOT_FIELDS if k not in DERIVED_FIELDS}
+        return _restore_snapshot, (compact,)
+
+    def fields(self):
+        """
+
+        Get all of the snapshot's fields.
+
+        :return: a dictionary of the form ``{field: value}``.
+        :rtype: ``dict``
+        """
+        return {k: getattr(self, k) for k in SNAPSHOT_FIELDS}
+
+    def scoped(self, currencies=None, regions=None):
+        """
+
+        | Get a snapshot holding (at least) the data for given currencies and regions, e.g., to answer a query about
+        | them with. See ``SQLiteSnapshot().scoped()``.
+        |
+        | All of the data of this snapshot is held in memory, so it is returned itself.
+
+        :param currencies: currency codes. Defaults to None.
+        :type currencies: ``iterable`` or ``None``
+        :param regions: ISO alpha 2 country codes. Defaults to None.
+        :type regions: ``iterable`` or ``None``
+        :return: this snapshot.
+        :rtype: ``DataSnapshot``
+        """
+        return self
+
+
+def rate_matrix(exchange_dict, date_axis_labels, ecb_currency_codes):
+    """
+
+    Arrange exchange rates into a dense (date x currency) matrix, for vectorized lookups.
+
+    :param exchange_dict: a dictionary of the form ``{date: {currency: rate}}``.
+    :type exchange_dict: ``dict``
+    :param date_axis_labels: the dates in `exchange_dict`, sorted (one row per date).
+    :type date_axis_labels: ``list``
+    :param ecb_currency_codes: currency codes for which exchange rate information is available (one column each).
+    :type ecb_currency_codes: ``list``
+    :return: the matrix (NaN where no rate was reported; 1.0 for the Euro) and a dictionary of the form
+             ``{currency: column}``.
+    :rtype: ``tuple``
+    """
+    currency_index = {c: i for i, c in enumerate(sorted(set(ecb_currency_codes) | {'EUR'}))}
+    matrix = np.full((len(date_axis_labels), len(currency_index)), np.nan)
+    for row, date in enumerate(date_axis_labels):
+        for c, rate in exchange_dict[date].items():
+            matrix[row, currency_index[c]] = rate
+    matrix[:, currency_index['EUR']] = 1.0
+    matrix.setflags(write=False)
+    return matrix, currency_index
+
+
+def _restore_snapshot(compact):
+    """
+
+    Restore a snapshot pickled in compact form (see ``DataSnapshot()``).
+
+    :param compact: all fields, excluding those in ``DERIVED_FIELDS``.
+    :type compact: ``dict``
+    :return: the snapshot.
+    :rtype: ``DataSnapshot``
+    """
+    snapshot = DataSnapshot.__new__(DataSnapshot)
+    for k, v in compact.items():
+        object.__setattr__(snapshot, k, v)
+    return snapshot
+
+
+def write_snapshot(snapshot, path):
+    """
+
+    Save a snapshot to a file (atomically), in the format described in the `snapshot_file` module.
+
+    :param snapshot: a snapshot.
+    :type snapshot: ``DataSnapshot``
+    :param path: the path of the file.
+    :type path: ``str``
+    """
+    fields, arrays = dict(), dict()
+    for k in SNAPSHOT_FIELDS:
+        if k in DERIVED_FIELDS:
+            continue
+        value = getattr(snapshot, k)
+        if k == 'rate_table_arrays':
+            fields['rate_table_periods'] = {f: periods for f, (periods, _) in value.items()}
+            arrays.update({"rate_tables_%s" % (f): array for f, (_, array) in value.items()})
+        elif k == 'indicator_tables':
+            fields['indicator_axes'] = {i: [years, region_index] for i, (years, region_index, _) in value.items()}
+            arrays.update({"indicator_%s" % (i): matrix for i, (_, _, matrix) in value.items()})
+        elif isinstance(value, np.ndarray):
+            arrays[k] = value
+        else:
+            fields[k] = value
+    write_snapshot_file(path, fields, arrays)
+
+
+def read_snapshot(path, verify=True):
+    """
+
+    Load a snapshot saved by ``write_snapshot()``.
+
+    :param path: the path of the file.
+    :type path: ``str``
+    :param verify: see ``read_snapshot_file()``. Defaults to True.
+    :type verify: ``bool``
+    :return: the snapshot.
+    :rtype: ``DataSnapshot``
+    """
+    fields, arrays = read_snapshot_file(path, verify)
+    compact = dict(fields)
+    compact['rate_table_arrays'] = {f: (periods, arrays.pop("rate_tables_%s" % (f)))
+                                    for f, periods in compact.pop('rate_table_periods').items()}
+    # Note: files written before additional indicators were supported do not have 'indicator_axes'.
+    compact['indicator_tables'] = {i: (years, region_index, arrays.pop("indicator_%s" % (i)))
+                                   for i, (years, region_index) in compact.pop('indicator_axes', {}).items()}
+    compact.update(arrays)
+
+    missing = [k for k in SNAPSHOT_FIELDS if k not in DERIVED_FIELDS and k not in compact]
+    if len(missing):
+        raise ValueError("'%s' is missing snapshot field(s): %s." % (path, ", ".join(missing)))
+    return _restore_snapshot(compact)
+
+
+def _derive_date_axis_labels(snapshot):
+    return [epoch_days_to_date(d) for d in snapshot.date_axis.tolist()]
+
+
+def _derive_exchange_dict(snapshot):
+    columns = [(c, i) for c, i in snapshot.currency_index.items() if c != 'EUR']
+    reported = (~np.isnan(snapshot.rate_matrix)).tolist()
+    return {date: {c: rates[i] for c, i in columns if present[i]}
+            for date, rates, present in zip(snapshot.date_axis_labels, snapshot.rate_matrix.tolist(), reported)}
+
+
+def _derive_currency_date_record(snapshot):
+    labels = snapshot.date_axis_labels
+    currency_date_record = dict()
+    for c, i in snapshot.currency_index.items():
+        rows = np.flatnonzero(~np.isnan(snapshot.rate_matrix[:, i])) if c != 'EUR' else range(len(labels))
+        if len(rows):
+            currency_date_record[c] = [labels[r] for r in rows]
+    return currency_date_record
+
+
+def _derive_currency_date_record_range(snapshot):
+    _, first_row, last_row = snapshot.currency_availability
+    days = snapshot.date_axis.tolist()
+    return {c: [epoch_days_to_date(days[first_row[i]]), epoch_days_to_date(days[last_row[i]])]
+            for c, i in snapshot.currency_index.items() if last_row[i] >= 0}
+
+
+def _derive_currency_availability(snapshot):
+    return availability_bitmaps(snapshot.rate_matrix)
+
+
+def _derive_rate_tables(snapshot):
+    return rate_tables_from_arrays(snapshot.rate_table_arrays, snapshot.currency_index)
+
+
+def _derive_rate_tables_range(snapshot):
+    return rate_table_ranges(snapshot.rate_tables)
+
+
+def _derive_cpi_dict(snapshot):
+    regions = sorted(snapshot.region_index, key=snapshot.region_index.get)
+    reported = (~np.isnan(snapshot.cpi_matrix)).tolist()
+    return {year: {r: v for r, v, present in zip(regions, values, mask) if present}
+            for year, values, mask in zip(snapshot.cpi_years, snapshot.cpi_matrix.tolist(), reported)}
+
+
+def _derive_cpi_year_index(snapshot):
+    return cpi_year_index(snapshot.cpi_years, snapshot.region_index, snapshot.cpi_matrix)
+
+
+def _derive_alpha2_cpi_record(snapshot):
+    return {r: years[::-1].astype(str).tolist() for r, years in snapshot.cpi_year_index.items()}
+
+
+_DERIVATIONS = {"exchange_dict": _derive_exchange_dict,
+                "currency_date_record": _derive_currency_date_record,
+                "currency_date_record_range": _derive_currency_date_record_range,
+                "currency_availability": _derive_currency_availability,
+                "date_axis_labels": _derive_date_axis_labels,
+                "rate_tables": _derive_rate_tables,
+                "rate_tables_range": _derive_rate_tables_range,
+                "cpi_dict": _derive_cpi_dict,
+                "cpi_year_index": _derive_cpi_year_index,
+                "alpha2_cpi_record": _derive_alpha2_cpi_record}
+
+
+def cpi_matrix(cpi_dict):
+    """
+
+    Arrange CPI information into a dense (year x region) matrix.
+
+    :param cpi_dict: a dictionary of the form ``{year: {alpha2: cpi}}``.
+    :type cpi_dict: ``dict``
+    :return: the matrix (NaN where no CPI was reported), the (sorted) years and a dictionary of the form
+             ``{alpha2: column}``.
+    :rtype: ``tuple``
+    """
+    years = sorted(cpi_dict)
+    region_index = {r: i for i, r in enumerate(sorted(set(r for v in cpi_dict.values() for r in v)))}
+    matrix = np.full((len(years), len(region_index)), np.nan)
+    for row, year in enumerate(years):
+        for r, cpi in cpi_dict[year].items():
+            matrix[row, region_index[r]] = cpi
+    matrix.setflags(write=False)
+    return matrix, years, region_index
+
+
+def exchange_fields(exchange_dict, ecb_currency_codes, currency_date_record):
+    """
+
+    Derive all exchange rate fields of a snapshot from the data harvested by ``ecb_xml_exchange_data()``.
+
+    :param exchange_dict: a dictionary of the form ``{date: {currency: rate}}``.
+    :type exchange_dict: ``dict``
+    :param ecb_currency_codes: currency codes for which exchange rate information is available.
+    :type ecb_currency_codes: ``list``
+    :param currency_date_record: a dictionary of the form ``{currency: [sorted dates]}``.
+    :type currency_date_record: ``dict``
+    :return: a dictionary of the form ``{field: value}`` with a value for each of ``EXCHANGE_FIELDS``.
+    :rtype: ``dict``
+    """
+    rate_tables = resampled_rate_tables(exchange_dict)
+    date_axis_labels = currency_date_record['EUR']
+    date_axis = np.array([date_to_epoch_days(d) for d in date_axis_labels], dtype='int64')
+    date_axis.setflags(write=False)
+    matrix, currency_index = rate_matrix(exchange_dict, date_axis_labels, ecb_currency_codes)
+    return {"exchange_dict": exchange_dict,
+            "ecb_currency_codes": ecb_currency_codes,
+            "currency_date_record": currency_date_record,
+            "currency_date_record_range": {k: [v[0], v[-1]] for k, v in currency_date_record.items() if len(v)},
+            "date_axis": date_axis,
+            "date_axis_labels": date_axis_labels,
+            "rate_matrix": matrix,
+            "currency_index": currency_index,
+            "rate_tables": rate_tables,
+            "rate_table_arrays": rate_table_arrays(rate_tables, currency_index),
+            "rate_tables_range": rate_table_ranges(rate_tables)}
+
+
+def exchange_fields_from_frame(frame):
+    """
+
+    | Derive the exchange rate fields of a snapshot directly from a (date x currency) dataframe,
+    | such as that returned by ``ecb_csv_frame()``.
+    |
+    | Only the array-backed fields (and `rate_tables`) are built; the others (see ``DERIVED_FIELDS``)
+    | are derived from them when first accessed.
+
+    :param frame: a dataframe indexed by date (ascending) with one column per currency (NaN where no rate was reported).
+    :type frame: ``Pandas DataFrame``
+    :return: a dictionary of the form ``{field: value}``.
+    :rtype: ``dict``
+    """
+    ecb_currency_codes = ['EUR'] + [c for c in frame.columns if c != 'EUR']
+    currency_index = {c: i for i, c in enumerate(sorted(ecb_currency_codes))}
+
+    matrix = np.full((frame.shape[0], len(currency_index)), np.nan)
+    matrix[:, [currency_index[c] for c in frame.columns]] = frame.values
+    matrix[:, currency_index['EUR']] = 1.0
+    matrix.setflags(write=False)
+
+    date_axis = frame.index.values.astype('datetime64[D]').astype('int64')
+    date_axis.setflags(write=False)
+
+    rate_tables = resampled_rate_tables(frame)
+    return {"ecb_currency_codes": ecb_currency_codes,
+            "date_axis": date_axis,
+            "rate_matrix": matrix,
+            "currency_index": currency_index,
+            "rate_tables": rate_tables,
+            "rate_table_arrays": rate_table_arrays(rate_tables, currency_index)}
+
+
+def _exchange_fields(data):
+    """
+
+    Derive the exchange rate fields of a snapshot from data obtained by ``_fetch_exchange_data()``.
+
+    :param data: a (date x currency) dataframe or data in the form returned by
+                 ``ecb_xml_exchange_data(return_as='dict')``.
+    :type data: ``Pandas DataFrame`` or ``tuple``
+    :return: a dictionary of the form ``{field: value}``.
+    :rtype: ``dict``
+    """
+    if isinstance(data, pd.DataFrame):
+        return exchange_fields_from_frame(data)
+    return exchange_fields(*data)
+
+
+def _reused_fields(snapshot, names):
+    """
+
+    Take fields from an existing snapshot, without deriving any which it has not yet derived.
+
+    :param snapshot: a snapshot.
+    :type snapshot: ``DataSnapshot``
+    :param names: names of fields.
+    :type names: ``iterable``
+    :return: a dictionary of the form ``{field: value}``.
+    :rtype: ``dict``
+    """
+    fields = dict()
+    for k in names:
+        try:
+            fields[k] = object.__getattribute__(snapshot, k)
+        except AttributeError:
+            pass
+    return fields
+
+
+def merge_exchange_data(snapshot, exchange_rate_dict, all_currency_codes):
+    """
+
+    Merge newly harvested exchange rate data (e.g., the last 90 days) into the data of an existing snapshot.
+    Rates in the new data take precedence.
+
+    :param snapshot: an existing snapshot.
+    :type snapshot: ``DataSnapshot``
+    :param exchange_rate_dict: a dictionary of the form ``{date: {currency: rate}}``.
+    :type exchange_rate_dict: ``dict``
+    :param all_currency_codes: the currency codes found in `exchange_rate_dict`.
+    :type all_currency_codes: ``list``
+    :return: the merged data, in the form returned by ``ecb_xml_exchange_data(return_as='dict')``.
+    :rtype: ``tuple``
+    """
+    merged_dict = dict(snapshot.exchange_dict)
+    merged_dict.update(exchange_rate_dict)
+
+    # Track Currency Codes
+    merged_codes = list(snapshot.ecb_currency_codes)
+    merged_codes += [c for c in all_currency_codes if c not in merged_codes]
+
+    # Rebuild the record of dates for each currency
+    currency_dates = dict()
+    for date, rates in merged_dict.items():
+        for c in rates:
+            currency_dates.setdefault(c, []).append(date)
+    currency_dates['EUR'] = list(merged_dict.keys())
+    currency_date_record = {k: sorted(v, key=date_to_epoch_days) for k, v in currency_dates.items()}
+
+    return merged_dict, merged_codes, currency_date_record
+
+
+def load_scopes(currencies=None, cpi_regions=None, start_date=None, end_date=None):
+    """
+
+    Construct the keyword arguments which restrict the data loaded from the European Central Bank
+    (see ``ecb_exchange_frame_if_modified()``) and the World Bank (see ``world_bank_columns()``).
+
+    :param currencies: see ``build_snapshot()``.
+    :type currencies: ``iterable`` or ``None``
+    :param cpi_regions: see ``build_snapshot()``.
+    :type cpi_regions: ``iterable`` or ``None``
+    :param start_date: see ``build_snapshot()``.
+    :type start_date: ``str`` or ``None``
+    :param end_date: see ``build_snapshot()``.
+    :type end_date: ``str`` or ``None``
+    :return: the scope of the exchange rate information and that of the World Bank data.
+    :rtype: ``tuple``
+    """
+    for name, codes in (('currencies', currencies), ('cpi_regions', cpi_regions)):
+        if codes is not None and not len(list(codes)):
+            raise ValueError("`%s` must not be empty (use None to load all of the data)." % (name))
+
+    start = datetime.strptime(start_date, "%d/%m/%Y") if start_date is not None else None
+    end = datetime.strptime(end_date, "%d/%m/%Y") if end_date is not None else None
+    if start is not None and end is not None and start > end:
+        raise ValueError("`start_date` must not be later than `end_date`.")
+
+    exchange_scope = {"currencies": list(currencies) if currencies is not None else None,
+                      "start_date": start.strftime("%Y-%m-%d") if start is not None else None,
+                      "end_date": end.strftime("%Y-%m-%d") if end is not None else None}
+    inflation_scope = {"regions": list(cpi_regions) if cpi_regions is not None else None,
+                       "start_year": start.year if start is not None else None,
+                       "end_year": end.year if end is not None else None}
+    return exchange_scope, inflation_scope
+
+
+def _check_scope_matched(exchange_found, inflation_found, exchange_scope, inflation_scope):
+    """
+
+    Check that data loaded with a scope (see ``load_scopes()``) is not empty, i.e., that the scope matched
+    some currencies (and dates) and some regions (and years).
+
+    :param exchange_found: False if no exchange rates were found for `exchange_scope`.
+    :type exchange_found: ``bool``
+    :param inflation_found: False if no CPI information was found for `inflation_scope`.
+    :type inflation_found: ``bool``
+    :param exchange_scope: see ``load_scopes()``.
+    :type exchange_scope: ``dict``
+    :param inflation_scope: see ``load_scopes()``.
+    :type inflation_scope: ``dict``
+    """
+    def describe(scope):
+        return ", ".join("%s=%r" % (k, scope[k]) for k in sorted(scope))
+
+    if not exchange_found:
+        raise ValueError("No exchange rate information matches the scope requested (%s)." % (describe(exchange_scope)))
+    if not inflation_found:
+        raise ValueError("No CPI information matches the scope requested (%s)." % (describe(inflation_scope)))
+
+
+def _scope_covers(loaded, exchange_scope, inflation_scope):
+    """
+
+    Check whether or not data loaded with one scope contains all of the data of another.
+
+    :param loaded: the (combined) scopes the data was loaded with (None if it was loaded in full).
+    :type loaded: ``dict`` or ``None``
+    :param exchange_scope: see ``load_scopes()``.
+    :type exchange_scope: ``dict``
+    :param inflation_scope: see ``load_scopes()``.
+    :type inflation_scope: ``dict``
+    :return: True if the loaded data covers `exchange_scope` and `inflation_scope`.
+    :rtype: ``bool``
+    """
+    if loaded is None:
+        return True
+    requested = dict(exchange_scope, **inflation_scope)
+    for k in ('currencies', 'regions'):
+        if loaded.get(k) is not None and (requested[k] is None or not set(requested[k]) <= set(loaded[k])):
+            return False
+    for k in ('start_date', 'start_year'):
+        if loaded.get(k) is not None and (requested[k] is None or requested[k] < loaded[k]):
+            return False
+    for k in ('end_date', 'end_year'):
+        if loaded.get(k) is not None and (requested[k] is None or requested[k] > loaded[k]):
+            return False
+    return True
+
+
+def _fetch_exchange_data(validators, ecb_url, incremental, last_day, ecb_source=None, scope=None):
+    """
+
+    Download exchange rate information conditionally, downloading as little as possible.
+
+    :param validators: the validators (e.g., ETags) previously obtained for each URL (or local file).
+    :type validators: ``dict``
+    :param ecb_url: see ``build_snapshot()``.
+    :type ecb_url: ``str``
+    :param incremental: if True, try to only download the exchange rates published in the last 90 days.
+    :type incremental: ``bool``
+    :param last_day: the latest day (since the epoch) of the data already held. None if no data is held.
+    :type last_day: ``int`` or ``None``
+    :param ecb_source: see ``build_snapshot()``. Defaults to None.
+    :type ecb_source: ``str``
+    :param scope: the data to load (see ``load_scopes()``). Defaults to None (all data).
+    :type scope: ``dict`` or ``None``
+    :return: the data (None if it has not changed), the validators for each URL requested and whether or not
+             the data only covers the last 90 days. The data is in the form returned by
+             ``ecb_xml_exchange_data(return_as='dict')`` or, if `ecb_source` is supplied, a (date x currency)
+             dataframe (see ``ecb_exchange_frame_if_modified()``).
+    :rtype: ``tuple``
+    """
+    validators, scope = dict(validators), scope or dict()
+
+    if ecb_source is not None:
+        # Sources are read in full (if they have changed); `incremental` does not apply.
+        data, validators[ecb_source] = ecb_exchange_frame_if_modified(ecb_source, validators.get(ecb_source), **scope)
+        return data, validators, False
+
+    if incremental and last_day is not None:
+        url = ecb_url + ECB_90_DAY_XML
+        recent, validators[url] = ecb_xml_exchange_data_if_modified(validators.get(url), ECB_90_DAY_XML, ecb_url,
+                                                                    **scope)
+        if recent is None:
+            return None, validators, True
+        # Only use the recent data if it overlaps with (or is adjacent to) the data already held.
+        if len(recent[2]['EUR']) and date_to_epoch_days(recent[2]['EUR'][0]) <= last_day + 7:
+            return recent, validators, True
+
+    url = ecb_url + ECB_HISTORY_XML
+    history, validators[url] = ecb_xml_exchange_data_if_modified(validators.get(url), ECB_HISTORY_XML, ecb_url,
+                                                                 **scope)
+    return history, validators, False
+
+
+def _refreshed_exchange_fields(base, ecb_url, incremental, ecb_source=None, scope=None):
+    """
+
+    Reload exchange rate information for an existing snapshot, downloading as little as possible.
+
+    :param base: the snapshot being refreshed.
+    :type base: ``DataSnapshot``
+    :param ecb_url: see ``build_snapshot()``.
+    :type ecb_url: ``str``
+    :param incremental: see ``build_snapshot()``.
+    :type incremental: ``bool``
+    :param ecb_source: see ``build_snapshot()``. Defaults to None.
+    :type ecb_source: ``str``
+    :param scope: see ``_fetch_exchange_data()``. Defaults to None.
+    :type scope: ``dict`` or ``None``
+    :return: the new exchange fields (None if the data has not changed) and the validators for each URL requested.
+    :rtype: ``tuple``
+    """
+    # Without any data to merge into, the data is reloaded in full.
+    last_day = int(base.date_axis[-1]) if base.date_axis.size else None
+    data, validators, recent_only = _fetch_exchange_data(base.source_info.get('exchange', {}).get('validators', {}),
+                                                         ecb_url, incremental, last_day, ecb_source, scope)
+    if data is None:
+        return None, validators
+    elif recent_only:
+        return exchange_fields(*merge_exchange_data(base, data[0], data[1])), validators
+    else:
+        return _exchange_fields(data), validators
+
+
+def _fetch_indicator_data(indicator, validators, source=None, scope=None):
+    """
+
+    Obtain the data for a World Bank indicator from its API or, if it has changed, a local copy of it.
+
+    :param indicator: World Bank Indicator.
+    :type indicator: ``str``
+    :param validators: the validators previously obtained for `source` (None if there are none).
+    :type validators: ``dict`` or ``None``
+    :param source: the path to a local copy of the data. Defaults to None.
+    :type source: ``str``
+    :param scope: the data to load (see ``load_scopes()``). Defaults to None (all data).
+    :type scope: ``dict`` or ``None``
+    :return: the data, as returned by ``world_bank_columns()`` (None if the local copy has not changed),
+             and the validators of `source` (None if it was not supplied).
+    :rtype: ``tuple``
+    """
+    if source is None:
+        return world_bank_columns(indicator, **(scope or {})), None
+    new_validators = file_validators(source)
+    if validators == new_validators:
+        return None, validators
+    return world_bank_columns(indicator, source, **(scope or {})), new_validators
+
+
+def _fetch_world_bank_data(indicators, validators, sources, scope=None):
+    """
+
+    | Obtain the data for several World Bank indicators concurrently (see ``_fetch_indicator_data()``).
+    | Without ``concurrent.futures`` (i.e., on Python 2 without the `futures` backport), they are obtained in turn.
+
+    :param indicators: World Bank Indicators.
+    :type indicators: ``iterable``
+    :param validators: a dictionary of the form ``{indicator: validators}``.
+    :type validators: ``dict``
+    :param sources: a dictionary of the form ``{indicator: path to a local copy}``.
+    :type sources: ``dict``
+    :param scope: see ``_fetch_indicator_data()``. Defaults to None.
+    :type scope: ``dict`` or ``None``
+    :return: a dictionary of the form ``{indicator: (data, validators)}``.
+    :rtype: ``dict``
+    """
+    indicators = list(indicators)
+    try:
+        from concurrent.futures import ThreadPoolExecutor
+    except ImportError:
+        ThreadPoolExecutor = None
+
+    if len(indicators) <= 1 or ThreadPoolExecutor is None:
+        return {i: _fetch_indicator_data(i, validators.get(i), sources.get(i), scope) for i in indicators}
+    with ThreadPoolExecutor(max_workers=len(indicators)) as executor:
+        futures = {i: executor.submit(_fetch_indicator_data, i, validators.get(i), sources.get(i), scope)
+                   for i in indicators}
+    return {i: f.result() for i, f in futures.items()}
+
+
+def _world_bank_sources(world_bank_source):
+    """
+
+    Normalize the `world_bank_source` parameter of ``build_snapshot()``.
+
+    :param world_bank_source: see ``build_snapshot()``.
+    :type world_bank_source: ``str``, ``dict``, ``tuple`` or ``None``
+    :return: a dictionary of the form ``{indicator: path to a local copy}``.
+    :rtype: ``dict``
+    """
+    if world_bank_source is None:
+        return dict()
+    elif isinstance(world_bank_source, str):
+        return {CPI_INDICATOR: world_bank_source}
+    return dict(world_bank_source)
+
+
+def indicator_table(columns):
+    """
+
+    Arrange the data for a World Bank indicator into a dense (year x region) matrix.
+
+    :param columns: the data, as returned by ``world_bank_columns()``.
+    :type columns: ``dict``
+    :return: the (sorted) years, a dictionary of the form ``{alpha2: column}`` and the matrix
+             (NaN where no value was reported).
+    :rtype: ``tuple``
+    """
+    years, year_rows = np.unique(columns['year'], return_inverse=True)
+    region_index = {r: i for i, r in enumerate(sorted(columns['regions']))}
+    region_columns = np.array([region_index[r] for r in columns['regions']], dtype='int64')
+
+    matrix = np.full((len(years), len(region_index)), np.nan)
+    matrix[year_rows, region_columns[columns['region']]] = columns['value']
+    matrix.setflags(write=False)
+    return [str(y) for y in years.tolist()], region_index, matrix
+
+
+def _indicator_tables(base, data, source_info, now):
+    """
+
+    Build the tables of additional indicators (see ``build_snapshot()``), reusing those of `base`
+    for any indicator whose data has not changed.
+
+    :param base: the snapshot being refreshed (None if there is none).
+    :type base: ``DataSnapshot``
+    :param data: a dictionary of the form ``{indicator: (data, validators)}``, as returned by
+                 ``_fetch_world_bank_data()``.
+    :type data: ``dict``
+    :param source_info: the source information of the new snapshot (its 'indicators' entry is updated).
+    :type source_info: ``dict``
+    :param now: the current time.
+    :type now: ``datetime``
+    :return: a dictionary of the form ``{indicator: (years, region_index, matrix)}`` and whether or not
+             it differs from that of `base`.
+    :rtype: ``tuple``
+    """
+    previous_tables = base.indicator_tables if base is not None else dict()
+    previous_info = source_info.get('indicators', {})
+
+    tables, info = dict(), dict()
+    for indicator, (columns, validators) in data.items():
+        tables[indicator] = indicator_table(columns) if columns is not None else previous_tables[indicator]
+        info[indicator] = {"validators": validators,
+                           "checked": now,
+                           "loaded": now if columns is not None else previous_info.get(indicator, {}).get('loaded')}
+    source_info['indicators'] = info
+
+    changed = any(columns is not None for columns, _ in data.values()) or set(tables) != set(previous_tables)
+    return tables, changed
+
+
+def _load_world_bank_data(base, indicators, world_bank_source, source_info, now, cpi=True, scope=None):
+    """
+
+    (Re)load CPI information and the data for any additional indicators, concurrently.
+
+    :param base: the snapshot being refreshed (None if there is none).
+    :type base: ``DataSnapshot``
+    :param indicators: see ``build_snapshot()``.
+    :type indicators: ``iterable``
+    :param world_bank_source: see ``build_snapshot()``.
+    :type world_bank_source: ``str``, ``dict``, ``tuple`` or ``None``
+    :param source_info: the source information of the new snapshot (updated in place).
+    :type source_info: ``dict``
+    :param now: the current time.
+    :type now: ``datetime``
+    :param cpi: if False, only load the additional indicators. Defaults to True.
+    :type cpi: ``bool``
+    :param scope: see ``_fetch_indicator_data()``. Defaults to None.
+    :type scope: ``dict`` or ``None``
+    :return: the CPI data, as returned by ``world_bank_columns()`` (None if it has not changed or was not loaded),
+             the tables of the additional indicators (see ``_indicator_tables()``) and whether or not they changed.
+    :rtype: ``tuple``
+    """
+    indicators = tuple(i for i in indicators if i != CPI_INDICATOR)
+    previous = source_info.get('inflation', {})
+    validators = {i: v.get('validators') for i, v in source_info.get('indicators', {}).items()
+                  if base is not None and i in base.indicator_tables}
+    validators[CPI_INDICATOR] = previous.get('validators')
+
+    data = _fetch_world_bank_data(((CPI_INDICATOR,) if cpi else ()) + indicators, validators,
+                                  _world_bank_sources(world_bank_source), scope)
+
+    cpi_columns = None
+    if cpi:
+        cpi_columns, cpi_validators = data.pop(CPI_INDICATOR)
+        source_info['inflation'] = {"validators": cpi_validators,
+                                    "checked": now,
+                                    "loaded": now if cpi_columns is not None else previous.get('loaded')}
+
+    tables, tables_changed = _indicator_tables(base, data, source_info, now)
+    return cpi_columns, tables, tables_changed
+
+
+def inflation_fields_from_columns(columns):
+    """
+
+    | Derive the inflation fields of a snapshot directly from the columns harvested by ``world_bank_columns()``.
+    |
+    | The others (see ``DERIVED_FIELDS``), e.g., `cpi_dict`, are derived from the CPI matrix when first accessed.
+
+    :param columns: the columns.
+    :type columns: ``dict``
+    :return: a dictionary of the form ``{field: value}``.
+    :rtype: ``dict``
+    """
+    cpi_years, region_index, matrix = indicator_table(columns)
+    return {"cpi_matrix": matrix,
+            "cpi_years": cpi_years,
+            "region_index": region_index}
+
+
+def inflation_fields(cpi_dict):
+    """
+
+    Derive the inflation fields of a snapshot from the data harvested by ``world_bank_pull()``.
+
+    :param cpi_dict: a dictionary of the form ``{year: {alpha2: cpi}}``.
+    :type cpi_dict: ``dict``
+    :return: a dictionary of the form ``{field: value}`` with a value for each of ``INFLATION_FIELDS``
+             (other than those in ``DERIVED_FIELDS``, which are derived when first accessed).
+    :rtype: ``dict``
+    """
+    matrix, years, region_index = cpi_matrix(cpi_dict)
+    return {"cpi_dict": cpi_dict,
+            "cpi_matrix": matrix,
+            "cpi_years": years,
+            "region_index": region_index}
+
+
+def _scope_days(exchange_scope):
+    """
+
+    Get the range of days of an exchange rate scope (see ``load_scopes()``).
+
+    :param exchange_scope: see ``load_scopes()``.
+    :type exchange_scope: ``dict``
+    :return: the first and last day (since the epoch) of the scope (None where it is not limited).
+    :rtype: ``tuple``
+    """
+    return tuple(date_to_epoch_days(exchange_scope[k], "%Y-%m-%d") if exchange_scope[k] is not None else None
+                 for k in ('start_date', 'end_date'))
+
+
+def _scoped_codes(codes, scope_codes):
+    """
+
+    Restrict the codes requested by a query to those of the scope the data was loaded with.
+
+    :param codes: currency codes or ISO alpha 2 country codes (None for all of those in `scope_codes`).
+    :type codes: ``iterable`` or ``None``
+    :param scope_codes: the codes of the scope (None for all codes).
+    :type scope_codes: ``list`` or ``None``
+    :return: the codes to read.
+    :rtype: ``list`` or ``None``
+    """
+    if codes is None:
+        return scope_codes
+    return [c for c in codes if scope_codes is None or c in scope_codes]
+
+
+def sqlite_exchange_fields(store, currencies, exchange_scope):
+    """
+
+    | Read the exchange rate fields of a snapshot from a SQLite database, using its indexes.
+    |
+    | The date axis holds every day in the database (within `exchange_scope`), whichever currencies are read,
+    | so rows (and the rates of the Euro) are the same as those of a snapshot of all of the data.
+
+    :param store: the database.
+    :type store: ``SQLiteStore``
+    :param currencies: the currency codes to read (None for all of those in `exchange_scope`).
+    :type currencies: ``iterable`` or ``None``
+    :param exchange_scope: the scope the data was loaded with (see ``load_scopes()``).
+    :type exchange_scope: ``dict``
+    :return: a dictionary of the form ``{field: value}`` (see ``exchange_fields_from_frame()``).
+    :rtype: ``dict``
+    """
+    start_day, end_day = _scope_days(exchange_scope)
+    queried = _scoped_codes([c for c in currencies if c != 'EUR'] if currencies is not None else None,
+                            exchange_scope['currencies'])
+    rows = store.exchange_rates(queried, start_day, end_day)
+    frame = pd.DataFrame(rows, columns=['day', 'currency', 'rate']).pivot(index='day', columns='currency',
+                                                                          values='rate')
+    days = store.days(exchange_scope['currencies'], start_day, end_day)
+    frame = frame.reindex(index=days).astype('float64')
+    frame.index = np.array(days, dtype='int64').astype('datetime64[D]')
+    frame.columns.name = None
+    return exchange_fields_from_frame(frame)
+
+
+def sqlite_inflation_fields(store, regions, inflation_scope):
+    """
+
+    Read the inflation fields of a snapshot from a SQLite database, using its indexes.
+
+    :param store: the database.
+    :type store: ``SQLiteStore``
+    :param regions: the ISO alpha 2 country codes to read (None for all of those in `inflation_scope`).
+    :type regions: ``iterable`` or ``None``
+    :param inflation_scope: the scope the data was loaded with (see ``load_scopes()``).
+    :type inflation_scope: ``dict``
+    :return: a dictionary of the form ``{field: value}`` (see ``inflation_fields()``).
+    :rtype: ``dict``
+    """
+    cpi_dict = store.cpi_data(_scoped_codes(regions, inflation_scope['regions']), inflation_scope['start_year'],
+                              inflation_scope['end_year'])
+    return inflation_fields(cpi_dict or dict())
+
+
+class SQLiteSnapshot(DataSnapshot):
+    """
+
+    | A snapshot of the data kept in a SQLite database (see ``SQLiteStore()``), which is read from the database
+    | as it is needed rather than held in memory.
+    |
+    | Queries about a few currencies and regions are answered with a snapshot of only their data
+    | (see ``scoped()``), read using the database's indexes, and queries about which data is available are
+    | answered with a summary of the database (see ``coverage_summary()``). All of the data is read (once) only if
+    | a field of this snapshot is accessed directly, e.g., by ``EasyPeasy().options(range_table_dates=False)``.
+    |
+    | Data is read from the database as it is when first needed, so new data written to the database by other
+    | processes may be seen; refreshing (see ``build_snapshot()``) replaces the snapshot.
+
+    :param sqlite_path: the path of the database.
+    :type sqlite_path: ``str``
+    :param exchange_scope: the scope of the exchange rate information (see ``load_scopes()``).
+    :type exchange_scope: ``dict``
+    :param inflation_scope: the scope of the CPI information (see ``load_scopes()``).
+    :type inflation_scope: ``dict``
+    :param ecb_currency_codes: the currency codes with exchange rates in the database (within `exchange_scope`).
+    :type ecb_currency_codes: ``list``
+    :param indicator_tables: see ``build_snapshot()`` (this data is not kept in the database).
+    :type indicator_tables: ``dict``
+    :param source_info: information about each source. Defaults to None.
+    :type source_info: ``dict``
+    :param created: when the snapshot was created. Defaults to None (now).
+    :type created: ``datetime``
+    """
+
+    __slots__ = ('sqlite_path', 'exchange_scope', 'inflation_scope', '_scoped', '_summary', '_lock')
+
+    # The number of scoped snapshots kept (see ``scoped()``).
+    max_scoped = 64
+
+    def __init__(self, sqlite_path, exchange_scope, inflation_scope, ecb_currency_codes, indicator_tables,
+                 source_info=None, created=None):
+        """
+
+        Initialize the ``SQLiteSnapshot()`` class.
+
+        """
+        for k, v in (('sqlite_path', sqlite_path), ('exchange_scope', exchange_scope),
+                     ('inflation_scope', inflation_scope), ('ecb_currency_codes', ecb_currency_codes),
+                     ('indicator_tables', indicator_tables), ('source_info', source_info or dict()),
+                     ('created', created or datetime.utcnow()), ('_scoped', OrderedDict()), ('_summary', None),
+                     ('_lock', threading.Lock())):
+            object.__setattr__(self, k, v)
+
+    def __getattr__(self, name):
+        # Only called for fields which have not been read from the database yet.
+        if name in DERIVED_FIELDS or name not in SNAPSHOT_FIELDS:
+            return DataSnapshot.__getattr__(self, name)
+        with self._lock:
+            if not self._read_in_full():
+                for k, v in self._read().items():
+                    object.__setattr__(self, k, v)
+        return object.__getattribute__(self, name)
+
+    def __reduce__(self):
+        # The database holds the data, so only a reference to it is pickled.
+        return SQLiteSnapshot, (self.sqlite_path, self.exchange_scope, self.inflation_scope, self.ecb_currency_codes,
+                                self.indicator_tables, self.source_info, self.created)
+
+    def _read_in_full(self):
+        """
+
+        Check whether or not all of the data has been read from the database.
+
+        :rtype: ``bool``
+        """
+        try:
+            object.__getattribute__(self, 'rate_matrix')
+        except AttributeError:
+            return False
+        return True
+
+    def _read(self, currencies=None, regions=None):
+        """
+
+        Read the exchange rate and inflation fields of a snapshot from the database.
+
+        :param currencies: see ``sqlite_exchange_fields()``. Defaults to None (all).
+        :type currencies: ``iterable`` or ``None``
+        :param regions: see ``sqlite_inflation_fields()``. Defaults to None (all).
+        :type regions: ``iterable`` or ``None``
+        :return: a dictionary of the form ``{field: value}``.
+        :rtype: ``dict``
+        """
+        store = SQLiteStore(self.sqlite_path)
+        try:
+            fields = sqlite_exchange_fields(store, currencies, self.exchange_scope)
+            fields.update(sqlite_inflation_fields(store, regions, self.inflation_scope))
+        finally:
+            store.close()
+        return fields
+
+    def coverage_summary(self):
+        """
+
+        | Summarize which data is in the database (within the scopes of this snapshot), using its indexes.
+        |
+        | The Euro is given the range of every day with an exchange rate, as in a snapshot of all of the data.
+
+        :return: a tuple of the form ``({currency: (first day, last day)}, {alpha2: (first year, last year)})``.
+        :rtype: ``tuple``
+        """
+        with self._lock:
+            if self._summary is None:
+                start_day, end_day = _scope_days(self.exchange_scope)
+                store = SQLiteStore(self.sqlite_path)
+                try:
+                    currency_ranges = store.currency_ranges(self.exchange_scope['currencies'], start_day, end_day)
+                    region_ranges = store.region_ranges(**self.inflation_scope)
+                finally:
+                    store.close()
+                if currency_ranges:
+                    currency_ranges['EUR'] = (min(first for first, _ in currency_ranges.values()),
+                                              max(last for _, last in currency_ranges.values()))
+                object.__setattr__(self, '_summary', (currency_ranges, region_ranges))
+        return self._summary
+
+    def currencies_on(self, day):
+        """
+
+        Find the currencies with an exchange rate on a given day, using the database's indexes.
+
+        :param day: days since the epoch.
+        :type day: ``int``
+        :return: currency codes (sorted, including the Euro where any rate was reported).
+        :rtype: ``list``
+        """
+        start_day, end_day = _scope_days(self.exchange_scope)
+        if (start_day is not None and day < start_day) or (end_day is not None and day > end_day):
+            return list()
+        store = SQLiteStore(self.sqlite_path)
+        try:
+            currencies = store.currencies(self.exchange_scope['currencies'], day, day)
+        finally:
+            store.close()
+        return sorted(currencies + ['EUR']) if currencies else list()
+
+    def scoped(self, currencies=None, regions=None):
+        """
+
+        | Get a snapshot of only the data for given currencies and regions (and every date), e.g., to answer a query
+        | about them with. Such snapshots are kept (see `max_scoped`), so repeated queries do not read the database.
+        |
+        | Once all of the data has been read (see ``SQLiteSnapshot()``), this snapshot itself is returned.
+
+        :param currencies: currency codes. Defaults to None.
+        :type currencies: ``iterable`` or ``None``
+        :param regions: ISO alpha 2 country codes. Defaults to None.
+        :type regions: ``iterable`` or ``None``
+        :return: a snapshot holding the data for `currencies` and `regions`.
+        :rtype: ``DataSnapshot``
+        """
+        if self._read_in_full():
+            return self
+
+        key = (tuple(sorted(set(currencies or ()))), tuple(sorted(set(regions or ()))))
+        snapshot = self._scoped.get(key)
+        if snapshot is None:
+            with self._lock:
+                snapshot = self._scoped.get(key)
+                if snapshot is None:
+                    snapshot = DataSnapshot(source_info=self.source_info, created=self.created,
+                                            indicator_tables=self.indicator_tables, **self._read(*key))
+                    if len(self._scoped) >= self.max_scoped:
+                        self._scoped.popitem(last=False)
+                    self._scoped[key] = snapshot
+        return snapshot
+
+
+def _build_sqlite_snapshot(exchange, inflation, base, ecb_url, incremental, sqlite_path, ecb_source, world_bank_source,
+                           indicators, exchange_scope, inflation_scope):
+    """
+
+    | Build a snapshot backed by a SQLite database (see ``SQLiteStore()``). See ``build_snapshot()``.
+    |
+    | New data is upserted into the database and snapshots read its contents (within the scopes requested;
+    | see ``load_scopes()``) as they are needed (see ``SQLiteSnapshot()``). If the database already holds data
+    | (for these scopes), a new snapshot (i.e., `base` is None) is built without downloading anything (other than
+    | the data for any additional `indicators`, which is not kept in the database).
+
+    :return: a new snapshot (or `base`, if the data in the database has not changed).
+    :rtype: ``SQLiteSnapshot``
+    """
+    store = SQLiteStore(sqlite_path)
+    try:
+        source_info = store.source_info()
+        now = datetime.utcnow()
+
+        scope = dict(exchange_scope, **inflation_scope)
+        if not _scope_covers(source_info.get('scope'), exchange_scope, inflation_scope):
+            # The database may lack some of the data requested, so it is reloaded.
+            source_info = {"scope": scope}
+        elif not len(source_info):
+            source_info['scope'] = scope
+
+        warm_start = base is None and 'exchange' in source_info and 'inflation' in source_info
+
+        # The validators recorded in the database describe the data loaded for its own scope, so they
+        # are neither used nor replaced when loading a narrower scope (see ``load_scopes()``).
+        own_scope = source_info.get('scope', {k: None for k in scope}) == scope
+        if not own_scope:
+            source_info = {k: v for k, v in source_info.items() if k not in ('exchange', 'inflation')}
+        if warm_start:
+            exchange, inflation = False, False
+            exchange_changed, inflation_changed = True, True
+        else:
+            exchange_changed, inflation_changed = False, False
+
+        tables, tables_changed = base.indicator_tables if base is not None else dict(), False
+        if warm_start and len(indicators):
+            _, tables, tables_changed = _load_world_bank_data(base, indicators, world_bank_source, source_info, now,
+                                                              cpi=False, scope=inflation_scope)
+
+        if exchange:
+            previous = source_info.get('exchange', {})
+            data, validators, _ = _fetch_exchange_data(previous.get('validators', {}), ecb_url, incremental,
+                                                       store.last_day(), ecb_source, exchange_scope)
+            if isinstance(data, pd.DataFrame):
+                data = exchange_data_from_frame(data)
+            exchange_changed = data is not None and store.upsert_exchange_rates(data[0]) > 0
+            source_info['exchange'] = {"validators": validators,
+                                       "checked": now,
+                                       "loaded": now if exchange_changed else previous.get('loaded')}
+
+        if inflation:
+            columns, tables, tables_changed = _load_world_bank_data(base, indicators, world_bank_source, source_info,
+                                                                    now, scope=inflation_scope)
+            inflation_changed = columns is not None and store.upsert_cpi(world_bank_columns_to_dict(columns)) > 0
+
+        if own_scope:
+            store.set_source_info(source_info)
+
+        if base is not None and not (exchange_changed or inflation_changed or tables_changed):
+            return base
+
+        # Only the currencies and regions held are read here; the data itself is read as it is needed.
+        currencies = store.currencies(exchange_scope['currencies'], *_scope_days(exchange_scope))
+        regions = store.regions(**inflation_scope)
+    finally:
+        store.close()
+    _check_scope_matched(len(currencies) > 0, len(regions) > 0, exchange_scope, inflation_scope)
+
+    return SQLiteSnapshot(sqlite_path, exchange_scope, inflation_scope, ['EUR'] + currencies, tables, source_info)
+
+
+def build_snapshot(exchange=True, inflation=True, base=None, ecb_url=ECB_URL, incremental=False,
+                   snapshot_path=None, sqlite_path=None, ecb_source=None, world_bank_source=None, indicators=(),
+                   currencies=None, cpi_regions=None, start_date=None, end_date=None):
+    """
+
+    | Load data from the European Central Bank and the World Bank (or local copies of their data)
+    | into a new ``DataSnapshot()``.
+    |
+    | When refreshing (i.e., `base` is supplied), exchange rate information is requested conditionally
+    | and local copies are only read if they have been modified; if no source has changed, `base` itself is returned.
+
+    :param exchange: if True, (re)load exchange rate information. Defaults to True.
+    :type exchange: ``bool``
+    :param inflation: if True, (re)load inflation (CPI) information. Defaults to True.
+    :type inflation: ``bool``
+    :param base: a snapshot to take any data which is not being (re)loaded from. Defaults to None.
+    :type base: ``DataSnapshot``
+    :param ecb_url: the European Central Bank's website (or a mirror of it). Defaults to ``"http://www.ecb.europa.eu/"``.
+    :type ecb_url: ``str``
+    :param incremental: if True and `base` is supplied, only download the exchange rates published in the last 90 days
+                        and merge them into the data in `base`. Defaults to False.
+    :type incremental: ``bool``
+    :param snapshot_path: if supplied, load all of the data from this snapshot file (see ``write_snapshot()``),
+                          rather than from the European Central Bank and the World Bank. In this case, `exchange`,
+                          `inflation`, `ecb_url`, `incremental` and the scope of the data to load (`currencies`,
+                          `cpi_regions`, `start_date` and `end_date`) are ignored. Defaults to None.
+    :type snapshot_path: ``str``
+    :param sqlite_path: if supplied, keep the data in this SQLite database (see ``SQLiteStore()``): downloaded data
+                        is upserted into it and snapshots are built from it. Defaults to None.
+    :type sqlite_path: ``str``
+    :param ecb_source: if supplied, the path to (or URL of) a copy of the European Central Bank's exchange rate
+                       information (an XML or CSV file, or a ZIP archive containing either;
+                       see ``ecb_exchange_frame_if_modified()``), which is used instead of `ecb_url`. Defaults to None.
+    :type ecb_source: ``str``
+    :param world_bank_source: if supplied, the path to a local copy of the World Bank's CPI information
+                              (a JSON or CSV file; see ``world_bank_columns()``), which is used instead of its API.
+                              Alternatively, a dictionary (or tuple of pairs) of the form ``{indicator: path}``,
+                              e.g., for `indicators`. Defaults to None.
+    :type world_bank_source: ``str``, ``dict`` or ``tuple``
+    :param indicators: World Bank Indicators to load in addition to CPI information, e.g., ``("NY.GDP.DEFL.ZS",)``
+                       (the GDP deflator). Their data is loaded concurrently (and refreshed along with it) into the
+                       `indicator_tables` field. Defaults to ().
+    :type indicators: ``iterable``
+    :param currencies: if supplied, only load exchange rates for these currency codes. Defaults to None (all).
+    :type currencies: ``iterable``
+    :param cpi_regions: if supplied, only load CPI information (and the data for `indicators`) for these
+                        ISO alpha 2 country codes. Defaults to None (all).
+    :type cpi_regions: ``iterable``
+    :param start_date: if supplied (of the form 'DD/MM/YYYY'), only load exchange rates from this date on and
+                       World Bank data from its year on. Defaults to None (no limit).
+    :type start_date: ``str``
+    :param end_date: as `start_date`, but the latest date to load. Defaults to None (no limit).
+    :type end_date: ``str``
+    :return: a new snapshot (or `base`, see above).
+    :rtype: ``DataSnapshot``
+    """
+    if snapshot_path is not None:
+        snapshot = read_snapshot(snapshot_path)
+        unchanged = base is not None and snapshot.created == base.created and snapshot.source_info == base.source_info
+        return base if unchanged else snapshot
+
+    if base is None and not (exchange and inflation):
+        raise ValueError("`base` must be supplied if `exchange` or `inflation` is False.")
+
+    exchange_scope, inflation_scope = load_scopes(currencies, cpi_regions, start_date, end_date)
+    if sqlite_path is not None:
+        return _build_sqlite_snapshot(exchange, inflation, base, ecb_url, incremental, sqlite_path, ecb_source,
+                                      world_bank_source, indicators, exchange_scope, inflation_scope)
+
+    fields = dict()
+    source_info = dict(base.source_info) if base is not None else dict()
+    now = datetime.utcnow()
+
+    new_exchange_fields = None
+    if exchange:
+        if base is None:
+            history, validators, _ = _fetch_exchange_data({}, ecb_url, False, None, ecb_source, exchange_scope)
+            new_exchange_fields = _exchange_fields(history)
+        else:
+            new_exchange_fields, validators = _refreshed_exchange_fields(base, ecb_url, incremental, ecb_source,
+                                                                         exchange_scope)
+        source_info['exchange'] = {"validators": validators,
+                                   "checked": now,
+                                   "loaded": now if new_exchange_fields is not None else
+                                   source_info.get('exchange', {}).get('loaded')}
+
+    new_inflation_fields = None
+    if inflation:
+        columns, tables, tables_changed = _load_world_bank_data(base, indicators, world_bank_source, source_info, now,
+                                                                scope=inflation_scope)
+        if columns is not None:
+            new_inflation_fields = inflation_fields_from_columns(columns)
+        elif tables_changed:
+            new_inflation_fields = _reused_fields(base, INFLATION_FIELDS)
+        if new_inflation_fields is not None:
+            new_inflation_fields['indicator_tables'] = tables
+
+    if new_exchange_fields is None and new_inflation_fields is None:
+        # Nothing has changed.
+        return base
+    _check_scope_matched(new_exchange_fields is None or len(new_exchange_fields['date_axis']) > 0,
+                         new_inflation_fields is None or len(new_inflation_fields['region_index']) > 0 and
+                         len(new_inflation_fields['cpi_years']) > 0, exchange_scope, inflation_scope)
+
+    fields.update(new_exchange_fields or _reused_fields(base, EXCHANGE_FIELDS))
+    fields.update(new_inflation_fields or _reused_fields(base, INFLATION_FIELDS))
+
+    return DataSnapshot(source_info=source_info, **fields)
@@ -0,0 +1,167 @@
+# coding: utf-8
+
+"""
+
+    Binary Snapshot File Format
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    A snapshot file stores the (compact) fields of a ``DataSnapshot()`` so that it can be loaded
+    with a handful of buffer reads and without parsing any of the bulk data.
+
+    Layout (all integers are little-endian):
+
+    ======  ========  ==================================================================
+    Offset  Size      Content
+    ======  ========  ==================================================================
+    0       8         Magic number: ``b"EASYSNAP"``.
+    8       4         Format version (uint32); see ``FORMAT_VERSION``.
+    12      4         Length of the header, `n` (uint32).
+    16      32        SHA-256 digest of the header.
+    48      `n`       Header: UTF-8 encoded JSON (see below).
+    ...     ...       Array buffers, each starting at a multiple of 8 bytes from the start of the file.
+    ======  ========  ==================================================================
+
+    The header is an object with the keys:
+
+    - 'fields': every field which is not an array (e.g., `created`, `source_info`, `ecb_currency_codes`,
+      `currency_index` and `region_index`). Datetimes are encoded as ``{"$datetime": "<ISO 8601>"}``.
+    - 'arrays': ``{name: {"dtype", "shape", "offset", "nbytes", "sha256"}}`` for each array buffer.
+      ``offset`` is measured from the start of the file.
+
+    Files are published atomically (written to a temporary file in the same directory and then renamed),
+    so readers never observe a partially written file.
+
+"""
+# Imports
+import os
+import json
+import struct
+import hashlib
+import tempfile
+import numpy as np
+
+from datetime import datetime
+
+
+MAGIC = b"EASYSNAP"
+FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct("<8sII32s")
+_ALIGNMENT = 8
+
+
+def json_default(obj):
+    """
+
+    Encode objects which JSON does not support natively (used as the `default` of ``json.dumps()``).
+
+    :param obj: an object.
+    :return: a JSON-serializable equivalent of `obj`.
+    """
+    if isinstance(obj, datetime):
+        return {"$datetime": obj.isoformat()}
+    raise TypeError("Cannot encode objects of type '%s' as JSON." % (type(obj).__name__))
+
+
+def json_object_hook(obj):
+    """
+
+    Invert ``json_default()`` (used as a JSON `object_hook`).
+
+    :param obj: a decoded JSON object.
+    :type obj: ``dict``
+    :return: `obj`, or the object it encodes.
+    """
+    if len(obj) == 1 and "$datetime" in obj:
+        iso = obj["$datetime"]
+        return datetime.strptime(iso, "%Y-%m-%dT%H:%M:%S.%f" if "." in iso else "%Y-%m-%dT%H:%M:%S")
+    return obj
+
+
+def write_snapshot_file(path, fields, arrays):
+    """
+
+    Atomically write a snapshot file.
+
+    :param path: the path of the file.
+    :type path: ``str``
+    :param fields: JSON-serializable fields (datetimes are also permitted).
+    :type fields: ``dict``
+    :param arrays: a dictionary of the form ``{name: ndarray}``.
+    :type arrays: ``dict``
+    """
+    # Lay out the array buffers (after the header, which is padded to the alignment).
+    buffers, entries = list(), dict()
+    for name, array in sorted(arrays.items()):
+        buffer = np.ascontiguousarray(array).tobytes()
+        entries[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": None,
+                         "nbytes": len(buffer), "sha256": hashlib.sha256(buffer).hexdigest()}
+        buffers.append((name, buffer))
+
+    # The header contains the offsets, so its length is fixed first (offsets are padded to a fixed width).
+    for name, _ in buffers:
+        entries[name]["offset"] = 10 ** 15
+    header_length = len(json.dumps({"fields": fields, "arrays": entries}, default=json_default).encode('utf-8'))
+    position = -(-(_PREAMBLE.size + header_length) // _ALIGNMENT) * _ALIGNMENT
+    for name, buffer in buffers:
+        entries[name]["offset"] = position
+        position += -(-len(buffer) // _ALIGNMENT) * _ALIGNMENT
+    header = json.dumps({"fields": fields, "arrays": entries}, default=json_default).encode('utf-8')
+    header += b" " * (header_length - len(header))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temp_path = tempfile.mkstemp(dir=directory, prefix=".snapshot-", suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as f:
+            f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header), hashlib.sha256(header).digest()))
+            f.write(header)
+            for name, buffer in buffers:
+                f.seek(entries[name]["offset"])
+                f.write(buffer)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temp_path, 0o644)
+        getattr(os, 'replace', os.rename)(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def read_snapshot_file(path, verify=True):
+    """
+
+    Read a snapshot file.
+
+    :param path: the path of the file.
+    :type path: ``str``
+    :param verify: if True, check the checksum of every array. Defaults to True.
+                   (The header's checksum is always checked.)
+    :type verify: ``bool``
+    :return: the fields and arrays written by ``write_snapshot_file()``.
+    :rtype: ``tuple``
+    """
+    with open(path, "rb") as f:
+        content = f.read()
+
+    if len(content) < _PREAMBLE.size:
+        raise ValueError("'%s' is not an EasyMoney snapshot file." % (path))
+    magic, version, header_length, header_digest = _PREAMBLE.unpack_from(content)
+    if magic != MAGIC:
+        raise ValueError("'%s' is not an EasyMoney snapshot file." % (path))
+    if version != FORMAT_VERSION:
+        raise ValueError("'%s' uses snapshot format version %s; version %s is required." % (
+            path, version, FORMAT_VERSION))
+
+    header = content[_PREAMBLE.size:_PREAMBLE.size + header_length]
+    if len(header) != header_length or hashlib.sha256(header).digest() != header_digest:
+        raise ValueError("The header of '%s' is corrupt." % (path))
+    header = json.loads(header.decode('utf-8'), object_hook=json_object_hook)
+
+    arrays = dict()
+    for name, entry in header['arrays'].items():
+        buffer = memoryview(content)[entry['offset']:entry['offset'] + entry['nbytes']]
+        if len(buffer) != entry['nbytes'] or (verify and hashlib.sha256(buffer).hexdigest() != entry['sha256']):
+            raise ValueError("The '%s' array in '%s' is corrupt." % (name, path))
+        arrays[name] = np.frombuffer(buffer, dtype=np.dtype(entry['dtype'])).reshape(entry['shape'])
+
+    return header['fields'], arrays
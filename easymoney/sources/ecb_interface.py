@@ -8,12 +8,23 @@
 """
 # Modules
 import re
+import io
+import zipfile
 import requests
+import numpy as np
 import pandas as pd
 
 from collections import defaultdict
 from easymoney.support_tools import date_sort
 from easymoney.support_tools import date_reformat
+from easymoney.support_tools import file_validators
+from easymoney.resample_tools import exchange_dict_to_wide_data_frame
+
+
+ECB_URL = "http://www.ecb.europa.eu/"
+ECB_HISTORY_XML = "stats/eurofxref/eurofxref-hist.xml"
+ECB_90_DAY_XML = "stats/eurofxref/eurofxref-hist-90d.xml"
+ECB_HISTORY_ZIP = "stats/eurofxref/eurofxref-hist.zip"
 
 
 def _ecb_data_frame(exchange_rate_dict):
@@ -53,33 +64,60 @@ def _ecb_data_frame(exchange_rate_dict):
     return df.reset_index(drop=True)
 
 
-def ecb_xml_exchange_data(return_as='dict', ecb_extension="stats/eurofxref/eurofxref-hist.xml"):
+def _ecb_request(url, validators=None):
     """
 
-    | This tool harvests XML data European Central Bank via their generously provided API.
-    | Expects the follwing in the XML data: 'time', 'currency' and 'rate'.
-    | Returns either a Pandas DataFrame or nested dictionary of the form: ``{time: {currency: rate}}``.
-    | Please do not write procedures that slam their servers.
+    Request data from the European Central Bank's website.
 
-    :param return_as: 'dict' for dictionary (nested); 'df' for Pandas DataFrame OR 'both' for both a dict and DataFrame.
-    :type return_as: ``str``
-    :param ecb_extension: URL to the exchange rate XML data on ``"http://www.ecb.europa.eu"``.
-                          Defaults to ``'/stats/eurofxref/eurofxref-hist.xml'``.
-    :type ecb_extension: ``str``
-    :return: exchange rate with EUR as the base-currency.
-    :rtype: ``dict`` or ``Pandas DataFrame``
+    :param url: a URL.
+    :type url: ``str``
+    :param validators: a dict with the 'etag' and/or 'last_modified' headers of a previous response to the same URL.
+                       If supplied, the request is conditional. Defaults to None.
+    :type validators: ``dict`` or ``None``
+    :return: the content of the response (None if the server reports it has not been modified) and
+             the validators of the response.
+    :rtype: ``tuple``
     """
-    # Currency Codes
-    all_currency_codes = ['EUR']
-
-    # Constuct the URL to the XML data on the ECB's website.
-    xmlpath = "http://www.ecb.europa.eu/" + ecb_extension
+    headers = dict()
+    if validators:
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
 
     # Request the data from the sever.
-    url_request = requests.get(xmlpath)
+    url_request = requests.get(url, headers=headers)
+    if url_request.status_code == 304:
+        return None, validators
+
+    response_headers = getattr(url_request, 'headers', None) or {}
+    return url_request.content, {"etag": response_headers.get('ETag'),
+                                 "last_modified": response_headers.get('Last-Modified')}
+
+
+def _ecb_xml_parse(xml_content, currencies=None, start_date=None, end_date=None):
+    """
+
+    Parse the European Central Bank's exchange rate XML data.
+
+    :param xml_content: the XML data.
+    :type xml_content: ``bytes`` or ``str``
+    :param currencies: currency codes to keep. Rates for other currencies are skipped as they are read.
+                       Defaults to None (all currencies).
+    :type currencies: ``iterable`` or ``None``
+    :param start_date: the earliest date (inclusive, of the form 'YYYY-MM-DD') to keep. Defaults to None (no limit).
+    :type start_date: ``str`` or ``None``
+    :param end_date: the latest date (inclusive, of the form 'YYYY-MM-DD') to keep. Defaults to None (no limit).
+    :type end_date: ``str`` or ``None``
+    :return: a nested dictionary of the form ``{time: {currency: rate}}``, a list of all currency codes and
+             a dictionary of the form ``{currency: [sorted dates]}``.
+    :rtype: ``tuple``
+    """
+    # Currency Codes
+    all_currency_codes = ['EUR']
 
     # Convert the XML to str, split on 'Cube><Cube' and remove the first element.
-    parsed_xml = str(url_request.content).split("Cube><Cube")[1:]
+    parsed_xml = str(xml_content).split("Cube><Cube")[1:]
 
     # Initialize the exchange rate dict
     exchange_rate_dict = dict()
@@ -87,11 +125,21 @@ def ecb_xml_exchange_data(return_as='dict', ecb_extension="stats/eurofxref/eurof
     # Initialize dict to track dates by currency
     currency_date_record = defaultdict(set)
 
+    currencies = set(currencies) if currencies is not None else None
+
     # Iterate though the parsed XML
     for j in parsed_xml:
         date = re.findall(r'time="(.*?)"', j)[0]
+        # Note: ISO dates can be compared as strings.
+        if (start_date is not None and date < start_date) or (end_date is not None and date > end_date):
+            continue
         ccodes = re.findall(r'currency="(.*?)" rate=', j)
         rates = re.findall(r'rate="(.*?)"', j)
+        if currencies is not None:
+            kept = [(c, r) for c, r in zip(ccodes, rates) if c in currencies]
+            ccodes, rates = [c for c, _ in kept], [r for _, r in kept]
+            if not len(ccodes):
+                continue
 
         # Reformat Date
         reformatted_date = date_reformat(date, from_format="%Y-%m-%d")
@@ -110,6 +158,185 @@ def ecb_xml_exchange_data(return_as='dict', ecb_extension="stats/eurofxref/eurof
     currency_date_record_sorted = {k: date_sort(v) for k, v in currency_date_record.items()}
     currency_date_record_sorted['EUR'] = date_sort(list(exchange_rate_dict.keys()))
 
+    return exchange_rate_dict, all_currency_codes, currency_date_record_sorted
+
+
+def ecb_csv_frame(csv_content, currencies=None, start_date=None, end_date=None):
+    """
+
+    | Parse exchange rate information in CSV form (vectorized). Two layouts are understood:
+    |     - the European Central Bank's, i.e., a 'Date' column followed by one column per currency
+    |       (missing rates are empty or 'N/A'), as distributed in 'eurofxref-hist.zip'.
+    |     - EasyMoney's, i.e., 'Date', 'Currency' and 'Rate' columns (one row per rate).
+    | Dates must be of the form 'YYYY-MM-DD'.
+
+    :param csv_content: the CSV data.
+    :type csv_content: ``bytes``
+    :param currencies: see ``_ecb_xml_parse()``. Columns for other currencies are not parsed.
+    :type currencies: ``iterable`` or ``None``
+    :param start_date: see ``_ecb_xml_parse()``.
+    :type start_date: ``str`` or ``None``
+    :param end_date: see ``_ecb_xml_parse()``.
+    :type end_date: ``str`` or ``None``
+    :return: a dataframe indexed by date (ascending) with one column per currency (NaN where no rate was reported).
+    :rtype: ``Pandas DataFrame``
+    """
+    keep = set(currencies) | {'date', 'currency', 'rate'} if currencies is not None else None
+
+    # Note: 'round_trip' parses each rate to exactly the float ``float()`` would, as the XML parser does.
+    frame = pd.read_csv(io.BytesIO(csv_content), na_values=['N/A'], skipinitialspace=True, dtype={0: str},
+                        float_precision='round_trip',
+                        usecols=(lambda c: c.strip() in keep or c.strip().lower() in keep) if keep else None)
+    frame.columns = [str(c).strip() for c in frame.columns]
+
+    if [c.lower() for c in frame.columns] == ['date', 'currency', 'rate']:
+        frame.columns = ['Date', 'Currency', 'Rate']
+        if currencies is not None:
+            frame = frame[frame['Currency'].str.strip().isin(keep)]
+        frame = frame.set_index('Date')
+    elif len(frame.columns) and frame.columns[0].lower() == 'date':
+        frame = frame.set_index(frame.columns[0])
+        # The ECB's files end each line with a comma, which produces an (empty) unnamed column.
+        frame = frame[[c for c in frame.columns if c != '' and not c.startswith('Unnamed:')]]
+    else:
+        raise ValueError("Unrecognized exchange rate CSV layout (header: %s)." % (", ".join(frame.columns)))
+
+    dates = frame.index.str.strip()
+    if start_date is not None or end_date is not None:
+        # Note: ISO dates can be compared as strings.
+        in_window = np.ones(len(dates), dtype=bool)
+        if start_date is not None:
+            in_window &= np.asarray(dates >= start_date)
+        if end_date is not None:
+            in_window &= np.asarray(dates <= end_date)
+        frame, dates = frame[in_window], dates[in_window]
+
+    if 'Rate' in frame.columns and 'Currency' in frame.columns:
+        frame = frame.assign(Date=dates).dropna(subset=['Rate']).pivot(index='Date', columns='Currency', values='Rate')
+        dates = frame.index
+    frame.index = pd.to_datetime(dates, format='%Y-%m-%d')
+    frame.index.name, frame.columns.name = None, None
+    frame = frame.astype('float64').dropna(how='all').dropna(axis=1, how='all')
+    return frame.sort_index()
+
+
+def exchange_data_from_frame(frame):
+    """
+
+    Convert a (date x currency) dataframe, such as that returned by ``ecb_csv_frame()``,
+    into the form returned by ``ecb_xml_exchange_data(return_as='dict')``.
+
+    :param frame: a dataframe indexed by date (ascending) with one column per currency.
+    :type frame: ``Pandas DataFrame``
+    :return: see ``_ecb_xml_parse()``.
+    :rtype: ``tuple``
+    """
+    labels = frame.index.strftime('%d/%m/%Y').tolist()
+    currency_codes = [c for c in frame.columns if c != 'EUR']
+    values = frame[currency_codes].values
+    present = ~np.isnan(values)
+
+    exchange_rate_dict = {d: {c: r for c, r, p in zip(currency_codes, rates, mask) if p}
+                          for d, rates, mask in zip(labels, values.tolist(), present.tolist())}
+    currency_date_record = {c: [labels[i] for i in np.flatnonzero(present[:, j]).tolist()]
+                            for j, c in enumerate(currency_codes)}
+    currency_date_record['EUR'] = labels
+
+    return exchange_rate_dict, ['EUR'] + currency_codes, currency_date_record
+
+
+def _ecb_source_request(source, validators=None):
+    """
+
+    Obtain the content of a copy of the European Central Bank's exchange rate information, conditionally.
+
+    :param source: a URL (e.g., ``ECB_URL + ECB_HISTORY_ZIP``) or the path to a local file.
+    :type source: ``str``
+    :param validators: the validators of a previous request for `source`. Defaults to None.
+    :type validators: ``dict`` or ``None``
+    :return: the content (None if it has not been modified) and its validators.
+    :rtype: ``tuple``
+    """
+    if re.match(r'^https?://', source):
+        content, validators = _ecb_request(source, validators)
+    else:
+        new_validators = file_validators(source)
+        if validators == new_validators:
+            return None, validators
+        with open(source, 'rb') as f:
+            content, validators = f.read(), new_validators
+
+    if content is not None and zipfile.is_zipfile(io.BytesIO(content)):
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            members = [m for m in archive.namelist() if m.lower().endswith(('.xml', '.csv'))]
+            if not len(members):
+                raise ValueError("'%s' does not contain an XML or CSV file." % (source))
+            content = archive.read(members[0])
+    return content, validators
+
+
+def ecb_exchange_frame_if_modified(source, validators=None, currencies=None, start_date=None, end_date=None):
+    """
+
+    | Load a copy of the European Central Bank's exchange rate information into a (date x currency) dataframe,
+    | if it has changed since the `validators` were obtained.
+    |
+    | The ECB's zipped CSV file (``ECB_HISTORY_ZIP``) is far smaller, and faster to parse, than its XML file.
+
+    :param source: a URL or the path to a local file. The data may be XML (e.g., 'eurofxref-hist.xml'),
+                   CSV (see ``ecb_csv_frame()``) or a ZIP archive containing either (e.g., 'eurofxref-hist.zip').
+    :type source: ``str``
+    :param validators: the validators returned by a previous call to this function. Defaults to None.
+    :type validators: ``dict`` or ``None``
+    :param currencies: currency codes to load (see ``_ecb_xml_parse()``). Defaults to None (all currencies).
+    :type currencies: ``iterable`` or ``None``
+    :param start_date: the earliest date to load (see ``_ecb_xml_parse()``). Defaults to None (no limit).
+    :type start_date: ``str`` or ``None``
+    :param end_date: the latest date to load (see ``_ecb_xml_parse()``). Defaults to None (no limit).
+    :type end_date: ``str`` or ``None``
+    :return: the dataframe (see ``ecb_csv_frame()``; None if the data has not been modified) and its validators.
+    :rtype: ``tuple``
+    """
+    content, validators = _ecb_source_request(source, validators)
+    if content is None:
+        return None, validators
+    elif content.lstrip()[:1] == b'<':
+        exchange_rate_dict = _ecb_xml_parse(content, currencies, start_date, end_date)[0]
+        return exchange_dict_to_wide_data_frame(exchange_rate_dict), validators
+    return ecb_csv_frame(content, currencies, start_date, end_date), validators
+
+
+def ecb_xml_exchange_data(return_as='dict', ecb_extension=ECB_HISTORY_XML, ecb_url=ECB_URL, source=None):
+    """
+
+    | This tool harvests XML data European Central Bank via their generously provided API.
+    | Expects the follwing in the XML data: 'time', 'currency' and 'rate'.
+    | Returns either a Pandas DataFrame or nested dictionary of the form: ``{time: {currency: rate}}``.
+    | Please do not write procedures that slam their servers.
+
+    :param return_as: 'dict' for dictionary (nested); 'df' for Pandas DataFrame OR 'both' for both a dict and DataFrame.
+    :type return_as: ``str``
+    :param ecb_extension: URL to the exchange rate XML data on `ecb_url`.
+                          Defaults to ``'stats/eurofxref/eurofxref-hist.xml'``.
+    :type ecb_extension: ``str``
+    :param ecb_url: the ECB's website (or a mirror of it). Defaults to ``"http://www.ecb.europa.eu/"``.
+    :type ecb_url: ``str``
+    :param source: a URL or the path to a local copy of the data (see ``ecb_exchange_frame_if_modified()``).
+                   If supplied, it is used instead of `ecb_url` and `ecb_extension`. Defaults to None.
+    :type source: ``str``
+    :return: exchange rate with EUR as the base-currency.
+    :rtype: ``dict`` or ``Pandas DataFrame``
+    """
+    if source is not None:
+        frame, _ = ecb_exchange_frame_if_modified(source)
+        exchange_rate_dict, all_currency_codes, currency_date_record_sorted = exchange_data_from_frame(frame)
+    else:
+        # Constuct the URL to the XML data on the ECB's website and request it.
+        xml_content, _ = _ecb_request(ecb_url + ecb_extension)
+
+        # Parse
+        exchange_rate_dict, all_currency_codes, currency_date_record_sorted = _ecb_xml_parse(xml_content)
+
     # return as dict
     if return_as == 'dict':
         return exchange_rate_dict, all_currency_codes, currency_date_record_sorted
@@ -120,6 +347,35 @@ def ecb_xml_exchange_data(return_as='dict', ecb_extension="stats/eurofxref/eurof
     else:
         raise ValueError("`return_as` must be one of: 'dict', 'data_frame' or `both`.")
 
+
+def ecb_xml_exchange_data_if_modified(validators=None, ecb_extension=ECB_HISTORY_XML, ecb_url=ECB_URL,
+                                      currencies=None, start_date=None, end_date=None):
+    """
+
+    | Conditional version of ``ecb_xml_exchange_data(return_as='dict')``.
+    | The data is only downloaded (and parsed) if it has changed since the response `validators` were obtained.
+
+    :param validators: the validators returned by a previous call to this function. Defaults to None.
+    :type validators: ``dict`` or ``None``
+    :param ecb_extension: see ``ecb_xml_exchange_data()``.
+    :type ecb_extension: ``str``
+    :param ecb_url: see ``ecb_xml_exchange_data()``.
+    :type ecb_url: ``str``
+    :param currencies: see ``ecb_exchange_frame_if_modified()``.
+    :type currencies: ``iterable`` or ``None``
+    :param start_date: see ``ecb_exchange_frame_if_modified()``.
+    :type start_date: ``str`` or ``None``
+    :param end_date: see ``ecb_exchange_frame_if_modified()``.
+    :type end_date: ``str`` or ``None``
+    :return: ``(None, validators)`` if the data has not been modified; otherwise
+             ``((exchange_rate_dict, all_currency_codes, currency_date_record), new_validators)``.
+    :rtype: ``tuple``
+    """
+    xml_content, new_validators = _ecb_request(ecb_url + ecb_extension, validators)
+    if xml_content is None:
+        return None, new_validators
+    return _ecb_xml_parse(xml_content, currencies, start_date, end_date), new_validators
+
 ecb_currency_to_alpha2_dict = {   "CYP": "CY"
                                 , "EEK": "EE"
                                 , "LTL": "LT"
@@ -7,60 +7,177 @@
 
 """
 # Imports
-import re
+import json
 import wbdata
 import numpy as np
 import pandas as pd
 
-from easymoney.easy_pandas import twoD_nested_dict
+from array import array
 
 
-def _wb_rowwise_extractor(wb_row, dict_keys):
-    """
+# Consumer price index (2010 = 100)
+CPI_INDICATOR = "FP.CPI.TOTL"
 
-    Extracts desired (see return) row information from the raw World Bank download.
 
-    :param wb_row: a row of the raw World Bank Data (as a dataframe).
-    :type wb_row: dict
-    :return: dict with keys: Country, country id, Indicator, CPI, Year
-    :rtype: dict
+def _wb_columns(rows, indicator, regions=None, start_year=None, end_year=None):
     """
-    # dict with empty keys
-    extracted_data_dict = dict.fromkeys(dict_keys)
 
-    # Populate extracted_data_dict
-    extracted_data_dict[dict_keys[0]]  =  wb_row['country']['value']
-    extracted_data_dict[dict_keys[1]]  =  wb_row['country']['id']
-    extracted_data_dict[dict_keys[2]]  =  wb_row['indicator']['value']
-    extracted_data_dict[dict_keys[3]]  =  wb_row['value']
-    extracted_data_dict[dict_keys[4]]  =  wb_row['date']
+    | Stream rows of World Bank data (in the form returned by ``wbdata.get_data()``) into typed columns.
+    | Each row is reduced to a region code, a year and a value as it is read, so no intermediate
+    | (per-row) structures are kept. Rows which lack any of these (or are outside the scope requested) are skipped.
 
-    return extracted_data_dict
+    :param rows: an iterable of rows.
+    :type rows: ``iterable``
+    :param indicator: World Bank Indicator. Rows for other indicators are skipped.
+    :type indicator: ``str``
+    :param regions: see ``world_bank_columns()``.
+    :type regions: ``iterable`` or ``None``
+    :param start_year: see ``world_bank_columns()``.
+    :type start_year: ``int`` or ``None``
+    :param end_year: see ``world_bank_columns()``.
+    :type end_year: ``int`` or ``None``
+    :return: see ``world_bank_columns()``.
+    :rtype: ``dict``
+    """
+    region_codes, countries = dict(), list()
+    region, year, value = array('l'), array('l'), array('d')
+    indicator_name = None
+    regions = set(regions) if regions is not None else None
+
+    for row in rows:
+        row_indicator = row.get('indicator') or {}
+        if row_indicator.get('id', indicator) != indicator:
+            continue
+        country = row.get('country') or {}
+        if row.get('value') is None or not row.get('date') or not country.get('id'):
+            continue
+        if regions is not None and country['id'] not in regions:
+            continue
+        row_year = int(row['date'])
+        if (start_year is not None and row_year < start_year) or (end_year is not None and row_year > end_year):
+            continue
+        code = region_codes.get(country['id'])
+        if code is None:
+            code = region_codes[country['id']] = len(countries)
+            countries.append(country.get('value'))
+        region.append(code)
+        year.append(row_year)
+        value.append(float(row['value']))
+        indicator_name = indicator_name or row_indicator.get('value')
+
+    return {"regions": sorted(region_codes, key=region_codes.get),
+            "countries": countries,
+            "indicator": indicator_name or indicator,
+            "region": np.frombuffer(region, dtype=np.dtype('l')).astype('int32'),
+            "year": np.frombuffer(year, dtype=np.dtype('l')).astype('int32'),
+            "value": np.frombuffer(value, dtype='float64')}
+
+
+def _wb_csv_columns(source, indicator, regions=None, start_year=None, end_year=None):
+    """
 
+    Read a CSV copy of World Bank data (see ``world_bank_columns()``) directly into typed columns.
 
-def _wb_pull(dict_keys, raw_data):
+    :param source: the path to the file.
+    :type source: ``str``
+    :param indicator: World Bank Indicator.
+    :type indicator: ``str``
+    :param regions: see ``world_bank_columns()``.
+    :type regions: ``iterable`` or ``None``
+    :param start_year: see ``world_bank_columns()``.
+    :type start_year: ``int`` or ``None``
+    :param end_year: see ``world_bank_columns()``.
+    :type end_year: ``int`` or ``None``
+    :return: see ``world_bank_columns()``.
+    :rtype: ``dict``
+    """
+    header = pd.read_csv(source, nrows=0).columns
+    columns = {c.strip().lower(): c for c in header}
+    value_column = next((columns[c] for c in ('value', 'cpi') if c in columns), None)
+    if value_column is None or not all(c in columns for c in ('country', 'alpha2', 'year')):
+        raise ValueError("'%s' must have 'Country', 'Alpha2', 'Year' and 'Value' (or 'CPI') columns." % (source))
+
+    usecols = [columns[c] for c in ('country', 'alpha2', 'year', 'indicator') if c in columns] + [value_column]
+    df = pd.read_csv(source, usecols=usecols, keep_default_na=False, na_values=[''],
+                     dtype={columns['alpha2']: str, columns['country']: str}, float_precision='round_trip')
+    df = df.dropna(subset=[columns['alpha2'], columns['year'], value_column])
+    if regions is not None:
+        df = df[df[columns['alpha2']].isin(set(regions))]
+    if start_year is not None:
+        df = df[df[columns['year']] >= start_year]
+    if end_year is not None:
+        df = df[df[columns['year']] <= end_year]
+
+    regions, region = np.unique(df[columns['alpha2']].values, return_inverse=True)
+    first_rows = np.unique(region, return_index=True)[1]
+    return {"regions": regions.tolist(),
+            "countries": df[columns['country']].values[first_rows].tolist(),
+            "indicator": df[columns['indicator']].iloc[0] if 'indicator' in columns and df.shape[0] else indicator,
+            "region": region.astype('int32'),
+            "year": df[columns['year']].values.astype('int32'),
+            "value": df[value_column].values.astype('float64')}
+
+
+def world_bank_columns(indicator=CPI_INDICATOR, source=None, regions=None, start_year=None, end_year=None):
     """
 
-    Parse the information pulled from the World Bank's API.
+    | Harvest the data for an indicator from the World Bank Group (or a local copy of it) into typed columns,
+    | i.e., one entry per (region, year) for which a value is available.
+    |
+    | Local copies can be:
+    |     - JSON: the rows returned by ``wbdata.get_data()`` or a page of the World Bank API's response
+    |       (i.e., ``[metadata, rows]``).
+    |     - CSV: 'Country', 'Alpha2', 'Year' and value (e.g., 'CPI' or 'Value') columns, and an optional
+    |       'Indicator' column, e.g., EasyMoney's 'ConsumerPriceIndexDB.csv'.
 
-    :param dict_keys:
-    :return: DataFrame with the requested indicator information.
-    :rtype: Pandas Dataframe
+    :param indicator: World Bank Indicator. Defaults to "FP.CPI.TOTL".
+    :type indicator: ``str``
+    :param source: the path to a local copy of the data. If supplied, it is used instead of the World Bank's API.
+                   Defaults to None.
+    :type source: ``str``
+    :param regions: ISO alpha 2 codes of the regions to keep. Defaults to None (all regions).
+    :type regions: ``iterable`` or ``None``
+    :param start_year: the earliest year (inclusive) to keep. Defaults to None (no limit).
+    :type start_year: ``int`` or ``None``
+    :param end_year: the latest year (inclusive) to keep. Defaults to None (no limit).
+    :type end_year: ``int`` or ``None``
+    :return: a dictionary with the keys: 'regions' (the ISO alpha 2 codes of the regions), 'countries' (their names),
+             'indicator' (the indicator's name) and the columns 'region' (an index into 'regions'), 'year' and 'value'.
+    :rtype: ``dict``
     """
-    # Generate a list populated with dicts for each row of the raw data
-    dictionaries = [_wb_rowwise_extractor(w, dict_keys) for w in raw_data]
+    if source is None:
+        return _wb_columns(wbdata.get_data(indicator), indicator, regions, start_year, end_year)
+
+    with open(source, 'rb') as f:
+        start = f.read(64).decode('utf-8-sig', 'ignore').lstrip()[:1]
+    if start not in ('[', '{'):
+        return _wb_csv_columns(source, indicator, regions, start_year, end_year)
 
-    # Merge by key
-    merged_dict = {k: [x[k] for x in dictionaries] for k in dictionaries[0]}
+    with open(source, 'rb') as f:
+        raw_data = json.loads(f.read().decode('utf-8-sig'))
+    if isinstance(raw_data, list) and len(raw_data) == 2 and isinstance(raw_data[0], dict) and 'page' in raw_data[0]:
+        raw_data = raw_data[1] or list()
+    return _wb_columns(raw_data, indicator, regions, start_year, end_year)
+
+
+def world_bank_columns_to_dict(columns):
+    """
 
-    # Merge into a single data frame
-    data_frame = pd.DataFrame.from_dict(merged_dict)
+    Convert columns (see ``world_bank_columns()``) into a dictionary of the form ``{year: {alpha2: value}}``.
 
-    # Sort by region and year
-    return data_frame.sort_values(['Alpha2', 'Year'], ascending = [1, 0]).reset_index(drop=True)
+    :param columns: columns as returned by ``world_bank_columns()``.
+    :type columns: ``dict``
+    :return: the dictionary (years are strings).
+    :rtype: ``dict``
+    """
+    regions = columns['regions']
+    values_dict = dict()
+    for r, y, v in zip(columns['region'].tolist(), columns['year'].tolist(), columns['value'].tolist()):
+        values_dict.setdefault(str(y), dict())[regions[r]] = v
+    return values_dict
 
 
-def world_bank_pull(value_true_name=None, indicator="FP.CPI.TOTL", return_as='data_frame'):
+def world_bank_pull(value_true_name=None, indicator="FP.CPI.TOTL", return_as='data_frame', source=None):
     """
 
     | Tool to harvest data for specific indicator from the World Bank Group via their generously provided API.
@@ -81,57 +198,32 @@ def world_bank_pull(value_true_name=None, indicator="FP.CPI.TOTL", return_as='da
     :type indicator: ``str``
     :param return_as: 'data_frame' or 'dict'
     :type return_as: ``str``
+    :param source: the path to a local copy of the data (see ``world_bank_columns()``). If supplied, it is used
+                   instead of the World Bank's API. Defaults to None.
+    :type source: ``str``
     :return: DataFrame with the requested indicator information or a dictionary
     :rtype: ``dict`` or ``Pandas DateFrame``
     """
-    raw_data = wbdata.get_data(indicator)
-    readable_name = value_true_name.split(".")[1] if value_true_name != None else value_true_name
-    dict_keys = ['Country', 'Alpha2', 'Indicator', readable_name, 'Year']
+    if return_as not in ('data_frame', 'dict', 'both'):
+        raise ValueError("Invalid option passed to `return_as`.")
 
-    # Convert to DataFrame
-    df = _wb_pull(dict_keys, raw_data)
+    columns = world_bank_columns(indicator, source)
+    if return_as == 'dict':
+        return world_bank_columns_to_dict(columns)
 
-    # Fill Empty Values with NaNs
-    df = df.fillna(value=np.NaN).dropna(subset=['Year', 'Alpha2', readable_name]).reset_index(drop=True)
+    readable_name = value_true_name.split(".")[1] if value_true_name != None else value_true_name
+    regions, countries = np.array(columns['regions'], dtype=object), np.array(columns['countries'], dtype=object)
+
+    # Sort by region and year (descending).
+    order = np.lexsort((-columns['year'], regions[columns['region']] if len(regions) else columns['region']))
+    df = pd.DataFrame({'Country': countries[columns['region'][order]] if len(regions) else [],
+                       'Alpha2': regions[columns['region'][order]] if len(regions) else [],
+                       'Indicator': columns['indicator'],
+                       readable_name: columns['value'][order],
+                       'Year': columns['year'][order].astype(str).astype(object)},
+                      columns=['Country', 'Alpha2', 'Indicator', readable_name, 'Year'])
 
     if return_as == 'data_frame':
         return df
-    elif return_as == 'dict':
-        return twoD_nested_dict(df, 'Year', 'Alpha2', readable_name)
-    elif return_as == 'both':
-        return df, twoD_nested_dict(df, 'Year', 'Alpha2', readable_name)
     else:
-        raise ValueError("Invalid option passed to `return_as`.")
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+        return df, world_bank_columns_to_dict(columns)
@@ -0,0 +1,416 @@
+# coding: utf-8
+
+"""
+
+    SQLite Storage for Exchange Rate and CPI Information
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+# Imports
+import json
+import sqlite3
+import threading
+
+from easymoney.support_tools import date_to_epoch_days
+from easymoney.support_tools import epoch_days_to_date
+from easymoney.snapshot_file import json_default
+from easymoney.snapshot_file import json_object_hook
+
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS exchange_rates (
+    currency TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    rate REAL NOT NULL,
+    PRIMARY KEY (currency, day)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS exchange_rates_by_day ON exchange_rates (day, currency, rate);
+CREATE TABLE IF NOT EXISTS cpi (
+    alpha2 TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    cpi REAL NOT NULL,
+    PRIMARY KEY (alpha2, year)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS cpi_by_year ON cpi (year, alpha2, cpi);
+CREATE TABLE IF NOT EXISTS source_info (
+    source TEXT PRIMARY KEY,
+    info TEXT NOT NULL
+);
+"""
+
+
+class SQLiteStore(object):
+    """
+
+    | Exchange rate (ECB) and CPI (World Bank) information, stored in a local SQLite database.
+    |
+    | Rates are keyed by (currency, day), where a day is the number of days since 01/01/1970, and CPI values by
+    | (alpha2, year); both are also indexed by date, so range queries over many currencies (or regions) are cheap.
+    | The Euro is the base currency and is not stored. New data is upserted, so refreshes only write what changed.
+    | The database uses write-ahead logging, so many processes can read it while it is being updated.
+
+    :param path: the path of the database file (created if it does not exist).
+    :type path: ``str``
+    :param timeout: number of seconds to wait for a lock held by another connection. Defaults to 30.
+    :type timeout: ``float`` or ``int``
+    """
+
+    def __init__(self, path, timeout=30):
+        """
+
+        Initialize the ``SQLiteStore()`` class.
+
+        """
+        self.path = path
+        self._timeout = timeout
+        self._local = threading.local()
+
+        # The connection opened by each thread, of the form (thread, connection); see ``close()``.
+        self._connections = list()
+        self._lock = threading.Lock()
+
+        connection = self._connection()
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            raise ValueError("'%s' uses schema version %s; version %s is required." % (path, version, SCHEMA_VERSION))
+        with connection:
+            connection.executescript(_SCHEMA)
+            connection.execute("PRAGMA user_version = %d" % (SCHEMA_VERSION))
+
+    def _connection(self):
+        """
+
+        | Get this thread's connection to the database (SQLite connections cannot be shared between threads).
+        |
+        | Connections are only used by the thread which opened them, but can be closed by any thread
+        | (see ``close()``). Those of threads which have exited are closed when a new one is opened.
+
+        :rtype: ``sqlite3.Connection``
+        """
+        local = self._local
+        connection = getattr(local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self._timeout, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode = WAL")
+            with self._lock:
+                exited = [c for t, c in self._connections if not t.is_alive()]
+                self._connections = [(t, c) for t, c in self._connections if t.is_alive()]
+                self._connections.append((threading.current_thread(), connection))
+            for c in exited:
+                c.close()
+            local.connection = connection
+        return connection
+
+    @staticmethod
+    def _filter(column, values, range_column, start=None, end=None):
+        """
+
+        Construct the WHERE clause of a query restricted to given values of one column and a range of another.
+
+        :param column: the name of the column to restrict to `values`.
+        :type column: ``str``
+        :param values: the values to include (None for all values).
+        :type values: ``iterable`` or ``None``
+        :param range_column: the name of the column to restrict to the range from `start` to `end`.
+        :type range_column: ``str``
+        :param start: the start of the range (inclusive). Defaults to None (no limit).
+        :type start: ``int`` or ``None``
+        :param end: the end of the range (inclusive). Defaults to None (no limit).
+        :type end: ``int`` or ``None``
+        :return: the clause (an empty string if there are no restrictions) and its parameters,
+                 or None if `values` is empty (i.e., nothing can match).
+        :rtype: ``tuple`` or ``None``
+        """
+        clauses, params = list(), list()
+        if values is not None:
+            values = list(values)
+            if not len(values):
+                return None
+            clauses.append("%s IN (%s)" % (column, ", ".join("?" * len(values))))
+            params += values
+        if start is not None:
+            clauses.append("%s >= ?" % (range_column))
+            params.append(int(start))
+        if end is not None:
+            clauses.append("%s <= ?" % (range_column))
+            params.append(int(end))
+        return (" WHERE " + " AND ".join(clauses) if len(clauses) else ""), params
+
+    def upsert_exchange_rates(self, exchange_dict):
+        """
+
+        Insert (or replace) exchange rates.
+
+        :param exchange_dict: a dictionary of the form ``{date: {currency: rate}}``, as returned by
+                              ``ecb_xml_exchange_data()``.
+        :type exchange_dict: ``dict``
+        :return: the number of rows inserted or changed.
+        :rtype: ``int``
+        """
+        rows = [(c, date_to_epoch_days(date), rate) for date, rates in exchange_dict.items()
+                for c, rate in rates.items() if c != 'EUR']
+        connection = self._connection()
+        with connection:
+            before = connection.total_changes
+            # Only rows which are new or differ are written.
+            connection.executemany("INSERT OR IGNORE INTO exchange_rates (currency, day, rate) VALUES (?, ?, ?)", rows)
+            connection.executemany("UPDATE exchange_rates SET rate = ? WHERE currency = ? AND day = ? AND rate != ?",
+                                   [(r, c, d, r) for c, d, r in rows])
+            return connection.total_changes - before
+
+    def upsert_cpi(self, cpi_dict):
+        """
+
+        Insert (or replace) CPI information.
+
+        :param cpi_dict: a dictionary of the form ``{year: {alpha2: cpi}}``, as returned by ``world_bank_pull()``.
+        :type cpi_dict: ``dict``
+        :return: the number of rows inserted or changed.
+        :rtype: ``int``
+        """
+        rows = [(r, int(year), cpi) for year, values in cpi_dict.items() for r, cpi in values.items()]
+        connection = self._connection()
+        with connection:
+            before = connection.total_changes
+            connection.executemany("INSERT OR IGNORE INTO cpi (alpha2, year, cpi) VALUES (?, ?, ?)", rows)
+            connection.executemany("UPDATE cpi SET cpi = ? WHERE alpha2 = ? AND year = ? AND cpi != ?",
+                                   [(v, r, y, v) for r, y, v in rows])
+            return connection.total_changes - before
+
+    def source_info(self):
+        """
+
+        Get the information recorded about each source, e.g., when it was last loaded.
+
+        :return: a dictionary of the form ``{source: info}``.
+        :rtype: ``dict``
+        """
+        rows = self._connection().execute("SELECT source, info FROM source_info").fetchall()
+        return {source: json.loads(info, object_hook=json_object_hook) for source, info in rows}
+
+    def set_source_info(self, source_info):
+        """
+
+        Record information about each source.
+
+        :param source_info: a dictionary of the form ``{source: info}``.
+        :type source_info: ``dict``
+        """
+        connection = self._connection()
+        with connection:
+            connection.executemany("INSERT OR REPLACE INTO source_info (source, info) VALUES (?, ?)",
+                                   [(k, json.dumps(v, default=json_default)) for k, v in source_info.items()])
+
+    def last_day(self):
+        """
+
+        Get the latest day for which any exchange rate is stored.
+
+        :return: days since the epoch (None if the database holds no exchange rates).
+        :rtype: ``int`` or ``None``
+        """
+        return self._connection().execute("SELECT MAX(day) FROM exchange_rates").fetchone()[0]
+
+    def exchange_rates(self, currencies=None, start_day=None, end_day=None):
+        """
+
+        Query exchange rates.
+
+        :param currencies: currency codes to include. Defaults to None (all currencies).
+        :type currencies: ``iterable`` or ``None``
+        :param start_day: earliest day (inclusive) to include. Defaults to None (no limit).
+        :type start_day: ``int`` or ``None``
+        :param end_day: latest day (inclusive) to include. Defaults to None (no limit).
+        :type end_day: ``int`` or ``None``
+        :return: ``(day, currency, rate)`` tuples, ordered by day and then currency.
+        :rtype: ``list``
+        """
+        where = self._filter('currency', currencies, 'day', start_day, end_day)
+        if where is None:
+            return list()
+        query = "SELECT day, currency, rate FROM exchange_rates%s ORDER BY day, currency" % (where[0])
+        return self._connection().execute(query, where[1]).fetchall()
+
+    def currencies(self, currencies=None, start_day=None, end_day=None):
+        """
+
+        Find the currencies for which exchange rates are stored.
+
+        :param currencies: see ``exchange_rates()``.
+        :type currencies: ``iterable`` or ``None``
+        :param start_day: see ``exchange_rates()``.
+        :type start_day: ``int`` or ``None``
+        :param end_day: see ``exchange_rates()``.
+        :type end_day: ``int`` or ``None``
+        :return: the currency codes with at least one rate from `start_day` to `end_day` (sorted).
+        :rtype: ``list``
+        """
+        where = self._filter('currency', currencies, 'day', start_day, end_day)
+        if where is None:
+            return list()
+        query = "SELECT DISTINCT currency FROM exchange_rates%s ORDER BY currency" % (where[0])
+        return [c for (c,) in self._connection().execute(query, where[1])]
+
+    def days(self, currencies=None, start_day=None, end_day=None):
+        """
+
+        Find the days for which exchange rates are stored.
+
+        :param currencies: see ``exchange_rates()``.
+        :type currencies: ``iterable`` or ``None``
+        :param start_day: see ``exchange_rates()``.
+        :type start_day: ``int`` or ``None``
+        :param end_day: see ``exchange_rates()``.
+        :type end_day: ``int`` or ``None``
+        :return: the days (since the epoch) on which a rate was reported for any of `currencies` (sorted).
+        :rtype: ``list``
+        """
+        where = self._filter('currency', currencies, 'day', start_day, end_day)
+        if where is None:
+            return list()
+        query = "SELECT DISTINCT day FROM exchange_rates%s ORDER BY day" % (where[0])
+        return [d for (d,) in self._connection().execute(query, where[1])]
+
+    def currency_ranges(self, currencies=None, start_day=None, end_day=None):
+        """
+
+        Find the first and last day for which each currency has an exchange rate.
+
+        :param currencies: see ``exchange_rates()``.
+        :type currencies: ``iterable`` or ``None``
+        :param start_day: see ``exchange_rates()``.
+        :type start_day: ``int`` or ``None``
+        :param end_day: see ``exchange_rates()``.
+        :type end_day: ``int`` or ``None``
+        :return: a dictionary of the form ``{currency: (first day, last day)}``.
+        :rtype: ``dict``
+        """
+        where = self._filter('currency', currencies, 'day', start_day, end_day)
+        if where is None:
+            return dict()
+        query = "SELECT currency, MIN(day), MAX(day) FROM exchange_rates%s GROUP BY currency" % (where[0])
+        return {c: (first, last) for (c, first, last) in self._connection().execute(query, where[1])}
+
+    def cpi(self, regions=None, start_year=None, end_year=None):
+        """
+
+        Query CPI information.
+
+        :param regions: ISO alpha 2 country codes to include. Defaults to None (all regions).
+        :type regions: ``iterable`` or ``None``
+        :param start_year: earliest year (inclusive) to include. Defaults to None (no limit).
+        :type start_year: ``int`` or ``None``
+        :param end_year: latest year (inclusive) to include. Defaults to None (no limit).
+        :type end_year: ``int`` or ``None``
+        :return: ``(year, alpha2, cpi)`` tuples, ordered by year and then region.
+        :rtype: ``list``
+        """
+        where = self._filter('alpha2', regions, 'year', start_year, end_year)
+        if where is None:
+            return list()
+        query = "SELECT year, alpha2, cpi FROM cpi%s ORDER BY year, alpha2" % (where[0])
+        return self._connection().execute(query, where[1]).fetchall()
+
+    def regions(self, regions=None, start_year=None, end_year=None):
+        """
+
+        Find the regions for which CPI information is stored.
+
+        :param regions: see ``cpi()``.
+        :type regions: ``iterable`` or ``None``
+        :param start_year: see ``cpi()``.
+        :type start_year: ``int`` or ``None``
+        :param end_year: see ``cpi()``.
+        :type end_year: ``int`` or ``None``
+        :return: the ISO alpha 2 country codes with CPI information from `start_year` to `end_year` (sorted).
+        :rtype: ``list``
+        """
+        where = self._filter('alpha2', regions, 'year', start_year, end_year)
+        if where is None:
+            return list()
+        query = "SELECT DISTINCT alpha2 FROM cpi%s ORDER BY alpha2" % (where[0])
+        return [r for (r,) in self._connection().execute(query, where[1])]
+
+    def region_ranges(self, regions=None, start_year=None, end_year=None):
+        """
+
+        Find the first and last year for which each region has CPI information.
+
+        :param regions: see ``cpi()``.
+        :type regions: ``iterable`` or ``None``
+        :param start_year: see ``cpi()``.
+        :type start_year: ``int`` or ``None``
+        :param end_year: see ``cpi()``.
+        :type end_year: ``int`` or ``None``
+        :return: a dictionary of the form ``{alpha2: (first year, last year)}``.
+        :rtype: ``dict``
+        """
+        where = self._filter('alpha2', regions, 'year', start_year, end_year)
+        if where is None:
+            return dict()
+        query = "SELECT alpha2, MIN(year), MAX(year) FROM cpi%s GROUP BY alpha2" % (where[0])
+        return {a: (first, last) for (a, first, last) in self._connection().execute(query, where[1])}
+
+    def exchange_data(self, currencies=None, start_day=None, end_day=None):
+        """
+
+        Read all exchange rate information (within a given scope).
+
+        :param currencies: see ``exchange_rates()``.
+        :type currencies: ``iterable`` or ``None``
+        :param start_day: see ``exchange_rates()``.
+        :type start_day: ``int`` or ``None``
+        :param end_day: see ``exchange_rates()``.
+        :type end_day: ``int`` or ``None``
+        :return: the data, in the form returned by ``ecb_xml_exchange_data(return_as='dict')``
+                 (None if the database holds no exchange rates).
+        :rtype: ``tuple`` or ``None``
+        """
+        exchange_dict, currency_dates, labels = dict(), dict(), dict()
+        for day, currency, rate in self.exchange_rates(currencies, start_day, end_day):
+            if day not in labels:
+                labels[day] = epoch_days_to_date(day)
+                exchange_dict[labels[day]] = dict()
+            exchange_dict[labels[day]][currency] = rate
+            currency_dates.setdefault(currency, []).append(labels[day])
+        if not len(exchange_dict):
+            return None
+
+        # Note: rows are ordered by day, so each list of dates is already sorted.
+        currency_dates['EUR'] = [labels[d] for d in sorted(labels)]
+        return exchange_dict, ['EUR'] + sorted(c for c in currency_dates if c != 'EUR'), currency_dates
+
+    def cpi_data(self, regions=None, start_year=None, end_year=None):
+        """
+
+        Read all CPI information (within a given scope).
+
+        :param regions: see ``cpi()``.
+        :type regions: ``iterable`` or ``None``
+        :param start_year: see ``cpi()``.
+        :type start_year: ``int`` or ``None``
+        :param end_year: see ``cpi()``.
+        :type end_year: ``int`` or ``None``
+        :return: a dictionary of the form ``{year: {alpha2: cpi}}`` (None if the database holds no CPI information).
+        :rtype: ``dict`` or ``None``
+        """
+        cpi_dict = dict()
+        for year, alpha2, cpi in self.cpi(regions, start_year, end_year):
+            cpi_dict.setdefault(str(year), dict())[alpha2] = cpi
+        return cpi_dict if len(cpi_dict) else None
+
+    def close(self):
+        """
+
+        | Close every connection to the database (i.e., that of each thread which has used this store).
+        |
+        | The store can still be used afterwards; threads simply open new connections.
+
+        """
+        with self._lock:
+            connections, self._connections = self._connections, list()
+            self._local = threading.local()
+        for _, connection in connections:
+            connection.close()
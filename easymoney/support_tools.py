@@ -7,9 +7,12 @@
 
 """
 # Imports
+import os
 import re
+import numpy as np
 import pandas as pd
 import dateutil.parser
+from datetime import date as datetime_date
 from datetime import datetime
 
 
@@ -78,6 +81,21 @@ def sort_range_reverse(iterable, action='range'):
         return iterable
 
 
+def file_validators(path):
+    """
+
+    Get information which identifies the current version of a local file
+    (the local counterpart of the 'ETag' and 'Last-Modified' HTTP headers).
+
+    :param path: the path of a file.
+    :type path: ``str``
+    :return: a dictionary of the form ``{"mtime": modification time, "size": size in bytes}``.
+    :rtype: ``dict``
+    """
+    stat = os.stat(path)
+    return {"mtime": stat.st_mtime, "size": stat.st_size}
+
+
 # ----------------------------------------------------------------------------------------------------------
 # Mathematical
 # ----------------------------------------------------------------------------------------------------------
@@ -238,6 +256,101 @@ def date_format_check(date, from_format="%d/%m/%Y"):
                          "Please supply a date of the form: %s." % (_canonical_datetime(from_format)))
 
 
+EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+
+def date_to_epoch_days(date, from_format="%d/%m/%Y"):
+    """
+
+    Convert a date string into the number of days since 01/01/1970.
+
+    :param date: a date.
+    :type date: ``str``
+    :param from_format: the format of `date`. Defaults to "%d/%m/%Y".
+    :type from_format: ``str``
+    :return: days since the epoch.
+    :rtype: ``int``
+    """
+    # Fast path for zero-padded DD/MM/YYYY strings.
+    if from_format == "%d/%m/%Y" and len(date) == 10 and date[2] == '/' and date[5] == '/':
+        try:
+            return datetime(int(date[6:]), int(date[3:5]), int(date[:2])).toordinal() - EPOCH_ORDINAL
+        except ValueError:
+            pass
+    try:
+        return datetime.strptime(date, from_format).toordinal() - EPOCH_ORDINAL
+    except ValueError:
+        date_format_check(date, from_format)
+        raise
+
+
+def is_datetime_like(date):
+    """
+
+    Check whether an object is a (native) date, i.e., a ``datetime``, ``date``, ``numpy.datetime64``
+    or ``pandas.Timestamp``.
+
+    :param date: an object.
+    :return: True if `date` is a date, else False.
+    :rtype: ``bool``
+    """
+    return isinstance(date, (datetime_date, np.datetime64))
+
+
+def to_epoch_days(date):
+    """
+
+    | Convert a date into the number of days since 01/01/1970.
+    |
+    | Native dates (see ``is_datetime_like()``) are converted with integer arithmetic (any time of day is ignored);
+    | strings may be of the form DD/MM/YYYY or YYYY-MM-DD (ISO 8601).
+    |
+    | Arrays of dates (e.g., a ``pandas.DatetimeIndex``) are converted as a whole; if their dtype is datetime64,
+    | this is a single vectorized cast.
+
+    :param date: a date or an array of dates.
+    :type date: ``str``, ``datetime``, ``date``, ``numpy.datetime64``, ``pandas.Timestamp``, ``ndarray``,
+                ``pandas.Index`` or ``pandas.Series``
+    :return: days since the epoch (an array of the same shape, if `date` is an array).
+    :rtype: ``int`` or ``ndarray``
+    """
+    if isinstance(date, (np.ndarray, pd.Index, pd.Series)):
+        dates = np.asarray(date)
+        if not np.issubdtype(dates.dtype, np.datetime64):
+            return np.array([to_epoch_days(d) for d in dates.ravel()], dtype='int64').reshape(dates.shape)
+        if np.isnat(dates).any():
+            raise ValueError("Invalid Date Supplied. Dates must not be missing (NaT).")
+        return dates.astype('datetime64[D]').astype('int64')
+    elif isinstance(date, str):
+        # Fast path for ISO 8601 dates.
+        if len(date) == 10 and date[4] == '-' and date[7] == '-':
+            try:
+                return datetime(int(date[:4]), int(date[5:7]), int(date[8:])).toordinal() - EPOCH_ORDINAL
+            except ValueError:
+                pass
+        return date_to_epoch_days(date)
+    elif is_datetime_like(date) and not pd.isnull(date):
+        if isinstance(date, np.datetime64):
+            return int(date.astype('datetime64[D]').astype('int64'))
+        return date.toordinal() - EPOCH_ORDINAL
+    raise ValueError("Invalid Date Supplied. Dates must be of the form DD/MM/YYYY, YYYY-MM-DD or datetimes.")
+
+
+def epoch_days_to_date(days, to_format="%d/%m/%Y"):
+    """
+
+    Convert a number of days since 01/01/1970 into a date string (the inverse of ``date_to_epoch_days()``).
+
+    :param days: days since the epoch.
+    :type days: ``int``
+    :param to_format: the format of the date returned. Defaults to "%d/%m/%Y".
+    :type to_format: ``str``
+    :return: a date.
+    :rtype: ``str``
+    """
+    return datetime.fromordinal(EPOCH_ORDINAL + int(days)).strftime(to_format)
+
+
 def year_extract(date):
     """
 
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+
+"""
+
+    Benchmarks for EasyMoney
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Run with: ``python tests/easy_benchmarks.py``.
+    All data is local (the recorded copies of the ECB and World Bank data used by ``easy_tests.py``)
+    or synthetic, so no network connection is required.
+
+    | Results can be saved as JSON (``--output results.json``) and compared with those saved previously, e.g., for
+    | the last release (``--compare baseline.json``); the comparison exits with a non-zero status if any benchmark
+    | has slowed by more than ``--threshold``.
+
+"""
+# Imports
+import os
+import sys
+import json
+import timeit
+import argparse
+import platform
+import tempfile
+import warnings
+import numpy as np
+import pandas as pd
+from datetime import datetime
+
+# Allow access to modules
+sys.path.insert(0, os.path.abspath("."))
+sys.path.insert(0, os.path.abspath("../"))
+
+from easymoney.money import EasyPeasy
+from easymoney.easy_pandas import twoD_nested_dict
+from easymoney.support_tools import epoch_days_to_date
+
+# Local copies of the ECB and World Bank data
+tests_path = os.path.dirname(os.path.abspath(__file__))
+data_path = os.path.join(os.path.dirname(tests_path), "easymoney", "sources", "data")
+sources = {"ecb_source": os.path.join(tests_path, "test_data", "ExchangeRatesDB.csv"),
+           "world_bank_source": os.path.join(tests_path, "test_data", "ConsumerPriceIndexDB.csv")}
+
+
+def cpi_like_frame(scale=1, seed=0):
+    """
+
+    Generate a dataframe shaped like the World Bank's CPI information
+    (264 regions x 57 years, i.e., ~15,000 rows, with ~20% of values missing).
+
+    :param scale: multiply the number of regions by this factor. Defaults to 1.
+    :type scale: ``int``
+    :param seed: random seed. Defaults to 0.
+    :type seed: ``int``
+    :return: a dataframe with 'Year', 'Alpha2' and 'CPI' columns.
+    :rtype: ``Pandas DataFrame``
+    """
+    rng = np.random.RandomState(seed)
+    regions = ["%s%d" % (chr(65 + i % 26) + chr(65 + (i // 26) % 26), i // 676) for i in range(264 * scale)]
+    years = np.arange(1960, 2017)
+    df = pd.DataFrame({'Year': np.tile(years, len(regions)).astype(str),
+                       'Alpha2': np.repeat(regions, len(years)),
+                       'CPI': rng.uniform(1, 200, len(regions) * len(years))})
+    return df[rng.uniform(size=df.shape[0]) > 0.2].reset_index(drop=True)
+
+
+def mask_scan_nester(data_frame, nest_col_a, nest_col_b, nest_col_c):
+    """
+
+    The engine ``twoD_nested_dict()`` used previously (kept as a baseline): one boolean mask over
+    the whole dataframe per distinct key, i.e., O(keys x rows).
+
+    """
+    data_frame = data_frame.copy()
+    data_frame[nest_col_a] = data_frame[nest_col_a].astype(str).str.upper()
+    data_frame[nest_col_b] = data_frame[nest_col_b].astype(str)
+    nested_dict = dict.fromkeys(data_frame[nest_col_a].unique())
+    for k in nested_dict.keys():
+        df_slice = data_frame[data_frame[nest_col_a] == k]
+        nested_dict[k] = dict(zip(df_slice[nest_col_b], df_slice[nest_col_c]))
+    return nested_dict
+
+
+def best_of(function, repeat=5):
+    """
+
+    Time a function.
+
+    :param function: a function which takes no arguments.
+    :type function: ``callable``
+    :param repeat: number of runs. Defaults to 5.
+    :type repeat: ``int``
+    :return: the fastest run, in seconds.
+    :rtype: ``float``
+    """
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+def benchmark_nested_dict(scales=(1, 10)):
+    """
+
+    Benchmark ``twoD_nested_dict()`` against the previous engine, with CPI-sized (and larger) dataframes.
+
+    :param scales: see ``cpi_like_frame()``.
+    :type scales: ``tuple``
+    :return: a list of dictionaries with the keys 'rows', 'baseline', 'single_pass' and 'speedup'.
+    :rtype: ``list``
+    """
+    results = list()
+    for scale in scales:
+        df = cpi_like_frame(scale)
+        if twoD_nested_dict(df, 'Year', 'Alpha2', 'CPI') != mask_scan_nester(df, 'Year', 'Alpha2', 'CPI'):
+            raise AssertionError("The engines disagree.")
+        baseline = best_of(lambda: mask_scan_nester(df, 'Year', 'Alpha2', 'CPI'), repeat=3)
+        single_pass = best_of(lambda: twoD_nested_dict(df, 'Year', 'Alpha2', 'CPI'))
+        results.append({"rows": df.shape[0], "baseline": baseline, "single_pass": single_pass,
+                        "speedup": baseline / single_pass})
+    return results
+
+
+def per_call(function, number=1, repeat=5):
+    """
+
+    Time a function.
+
+    :param function: a function which takes no arguments.
+    :type function: ``callable``
+    :param number: number of calls per run. Defaults to 1.
+    :type number: ``int``
+    :param repeat: number of runs. Defaults to 5.
+    :type repeat: ``int``
+    :return: a dictionary with the fastest ('best') and the median run, in seconds per call,
+             as well as `number` and `repeat`.
+    :rtype: ``dict``
+    """
+    runs = sorted(t / number for t in timeit.repeat(function, number=number, repeat=repeat))
+    return {"best": runs[0], "median": runs[len(runs) // 2], "number": number, "repeat": repeat}
+
+
+def workloads(ep, records=1000, seed=0):
+    """
+
+    Draw random requests from the data held by an ``EasyPeasy()`` instance.
+
+    :param ep: an ``EasyPeasy()`` instance.
+    :type ep: ``EasyPeasy``
+    :param records: number of requests of each kind. Defaults to 1000.
+    :type records: ``int``
+    :param seed: random seed. Defaults to 0.
+    :type seed: ``int``
+    :return: a dictionary of lists of requests:
+             'conversions' and 'weekend_conversions' (``(amount, from_currency, to_currency, date)``;
+             rates are not reported on weekends, so the latter all fall back), 'inflation' and 'inflation_fall_backs'
+             (``(amount, region, year_a, year_b)``; years after the last one with data fall back) as well as
+             'normalize' (``(amount, region, from_year, to_year, base_currency, exchange_date)``).
+    :rtype: ``dict``
+    """
+    rng = np.random.RandomState(seed)
+    axis = ep._snapshot.date_axis
+    recent = axis[axis >= axis[-1] - 2 * 365]
+    weekdays = [epoch_days_to_date(int(d)) for d in rng.choice(recent, records)]
+    saturdays = recent[:-1][np.diff(recent) > 1] + 1
+    weekends = [epoch_days_to_date(int(d)) for d in rng.choice(saturdays, records)]
+
+    currencies = ep.available_currencies(start_date=epoch_days_to_date(int(recent[0])),
+                                         end_date=epoch_days_to_date(int(recent[-1])))
+    inflation_regions = ep.available_regions(1995, 2015, info='inflation')
+    regions = [r for r in ep.available_regions(2005, 2015, info='all') if r in inflation_regions]
+
+    def pairs(options):
+        return [tuple(rng.choice(options, 2, replace=False)) for _ in range(records)]
+
+    amounts = rng.uniform(1, 10000, records).round(2).tolist()
+    years = rng.randint(1995, 2016, (records, 2)).tolist()
+    inflation = list(zip(amounts, rng.choice(inflation_regions, records), years))
+    return {"conversions": [(a, c[0], c[1], d) for a, c, d in zip(amounts, pairs(currencies), weekdays)],
+            "weekend_conversions": [(a, c[0], c[1], d) for a, c, d in zip(amounts, pairs(currencies), weekends)],
+            "inflation": [(a, r, y[0], y[1]) for a, r, y in inflation],
+            "inflation_fall_backs": [(a, r, y[0], 2030) for a, r, y in inflation],
+            "normalize": [(a, r, 2005, 2015, "USD", d) for a, r, d in zip(amounts, rng.choice(regions, records),
+                                                                          weekdays)]}
+
+
+def benchmark_construction(repeat=3):
+    """
+
+    Benchmark the creation of ``EasyPeasy()`` instances from the local data.
+
+    | 'cold': the data is parsed from the (local) sources.
+    | 'warm': the data is already held by another instance, so it is shared (see `shared`).
+    | 'snapshot file': the data is read from a snapshot file (see ``save_snapshot()``).
+
+    :param repeat: number of runs. Defaults to 3.
+    :type repeat: ``int``
+    :return: a dictionary of the form ``{name: timing}`` (see ``per_call()``).
+    :rtype: ``dict``
+    """
+    results = dict()
+    results['cold'] = per_call(lambda: EasyPeasy(data_path=data_path, **sources).close(), repeat=repeat)
+
+    with EasyPeasy(data_path=data_path, **sources) as ep:
+        results['warm'] = per_call(lambda: EasyPeasy(data_path=data_path, **sources).close(), repeat=repeat)
+
+        snapshot_dir = tempfile.mkdtemp()
+        snapshot_path = os.path.join(snapshot_dir, "snapshot.bin")
+        try:
+            ep.save_snapshot(snapshot_path)
+            results['snapshot file'] = per_call(lambda: EasyPeasy(data_path=data_path, snapshot_path=snapshot_path,
+                                                                  shared=False).close(), repeat=repeat)
+        finally:
+            os.remove(snapshot_path)
+            os.rmdir(snapshot_dir)
+    return results
+
+
+def benchmark_calls(ep, requests, repeat=5, scalar_number=200):
+    """
+
+    Benchmark scalar and batched conversions, inflation adjustments and normalizations,
+    with and without falling back to the closest date (year).
+
+    :param ep: an ``EasyPeasy()`` instance (created with ``fall_back_warnings=False``).
+    :type ep: ``EasyPeasy``
+    :param requests: see ``workloads()``.
+    :type requests: ``dict``
+    :param repeat: number of runs. Defaults to 5.
+    :type repeat: ``int``
+    :param scalar_number: number of calls per run for scalar benchmarks. Defaults to 200.
+    :type scalar_number: ``int``
+    :return: a dictionary of the form ``{(group, name): timing}`` (see ``per_call()``).
+             Batched timings are per request.
+    :rtype: ``dict``
+    """
+    results = dict()
+    conversions, weekends = requests['conversions'], requests['weekend_conversions']
+    canada, usd = ep.resolve("Canada"), ep.resolve("USD")
+
+    def scalar(name, function):
+        results[('scalar', name)] = per_call(function, number=scalar_number, repeat=repeat)
+
+    def batch(group, name, requested, function):
+        timing = per_call(lambda: function(requested), repeat=repeat)
+        results[(group, name)] = dict(timing, best=timing['best'] / len(requested),
+                                      median=timing['median'] / len(requested), requests=len(requested))
+
+    scalar("currency_converter (codes)", lambda: ep.currency_converter(100, "CAD", "USD", "02/09/2016"))
+    scalar("currency_converter (regions)", lambda: ep.currency_converter(100, "Canada", "United States",
+                                                                         "02/09/2016"))
+    scalar("currency_converter (handles)", lambda: ep.currency_converter(100, canada, usd, "02/09/2016"))
+    scalar("currency_converter (weekend)", lambda: ep.currency_converter(100, "CAD", "USD", "03/09/2016"))
+    scalar("inflation_calculator", lambda: ep.inflation_calculator(100, "CA", 2005, 2015))
+    scalar("normalize", lambda: ep.normalize(100, "CA", 2005, 2015, base_currency="USD",
+                                             exchange_date="02/09/2016"))
+    scalar("normalize (handles)", lambda: ep.normalize(100, canada, 2005, 2015, base_currency=usd,
+                                                       exchange_date="02/09/2016"))
+
+    stream = sorted(conversions, key=lambda r: r[3][6:] + r[3][3:5] + r[3][:2])
+    batch('batch', "currency_converter_batch", conversions, ep.currency_converter_batch)
+    batch('batch', "currency_converter (loop)", conversions, lambda rs: [ep.currency_converter(*r) for r in rs])
+    batch('batch', "convert_stream (date order)", stream, lambda rs: list(ep.convert_stream(rs)))
+    batch('batch', "inflation_calculator (loop)", requests['inflation'],
+          lambda rs: [ep.inflation_calculator(*r) for r in rs])
+    batch('batch', "normalize (loop)", requests['normalize'],
+          lambda rs: [ep.normalize(r[0], r[1], r[2], r[3], base_currency=r[4], exchange_date=r[5]) for r in rs])
+
+    batch('fall backs', "currency_converter_batch", weekends, ep.currency_converter_batch)
+    batch('fall backs', "currency_converter (loop)", weekends, lambda rs: [ep.currency_converter(*r) for r in rs])
+    batch('fall backs', "inflation_calculator (loop)", requests['inflation_fall_backs'],
+          lambda rs: [ep.inflation_calculator(*r) for r in rs])
+    return results
+
+
+def benchmark_options(ep, repeat=5):
+    """
+
+    Benchmark ``options()`` tables, built from scratch and (once built) from the cache.
+
+    :param ep: an ``EasyPeasy()`` instance.
+    :type ep: ``EasyPeasy``
+    :param repeat: number of runs. Defaults to 5.
+    :type repeat: ``int``
+    :return: a dictionary of the form ``{name: timing}`` (see ``per_call()``).
+    :rtype: ``dict``
+    """
+    def build(**kwargs):
+        ep._options_cache = (None, dict())
+        return ep.options(pretty_print=False, **kwargs)
+
+    results = dict()
+    results['table (all)'] = per_call(lambda: build(info='all'), repeat=repeat)
+    results['table (overlap only)'] = per_call(lambda: build(info='all', table_overlap_only=True), repeat=repeat)
+    results['table (all dates)'] = per_call(lambda: build(info='all', range_table_dates=False), repeat=repeat)
+    results['list (exchange)'] = per_call(lambda: build(info='exchange', rformat='list'), repeat=repeat)
+    results['table (cached)'] = per_call(lambda: ep.options(info='all', pretty_print=False), number=20, repeat=repeat)
+    return results
+
+
+def run_benchmarks(repeat=5, records=1000, label=None):
+    """
+
+    Run all of the benchmarks.
+
+    :param repeat: number of runs of each benchmark. Defaults to 5.
+    :type repeat: ``int``
+    :param records: number of requests in each batch. Defaults to 1000.
+    :type records: ``int``
+    :param label: a label for the results, e.g., a release. Defaults to None.
+    :type label: ``str``
+    :return: a dictionary with the keys 'meta' (the environment) and 'results' (a list of dictionaries with the
+             keys 'group', 'name', 'best' and 'median' (in seconds per call), 'number' and 'repeat').
+    :rtype: ``dict``
+    """
+    results = list()
+
+    def add(group, timings):
+        for name, timing in timings.items():
+            results.append(dict(group=group, name=name, **timing))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        add('construction', benchmark_construction(repeat=max(1, repeat // 2)))
+        with EasyPeasy(data_path=data_path, fall_back_warnings=False, **sources) as ep:
+            for (group, name), timing in sorted(benchmark_calls(ep, workloads(ep, records), repeat).items()):
+                add(group, {name: timing})
+            add('options', benchmark_options(ep, repeat))
+
+    for r in benchmark_nested_dict():
+        for engine in ('baseline', 'single_pass'):
+            results.append({"group": "twoD_nested_dict", "name": "%s (%d rows)" % (engine, r['rows']),
+                            "best": r[engine], "median": r[engine], "number": 1, "repeat": None})
+
+    meta = {"label": label, "created": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "python": platform.python_version(), "platform": platform.platform(), "numpy": np.__version__,
+            "pandas": pd.__version__, "records": records, "repeat": repeat}
+    return {"meta": meta, "results": results}
+
+
+def compare(results, baseline, threshold=1.5):
+    """
+
+    Compare results with those of a previous run.
+
+    :param results: see ``run_benchmarks()``.
+    :type results: ``dict``
+    :param baseline: results of a previous run (see ``run_benchmarks()``).
+    :type baseline: ``dict``
+    :param threshold: benchmarks whose (best) time has grown by more than this factor are regressions.
+                      Defaults to 1.5.
+    :type threshold: ``float``
+    :return: a list of dictionaries with the keys 'group', 'name', 'baseline', 'best', 'ratio' and 'regression'
+             (for the benchmarks present in both).
+    :rtype: ``list``
+    """
+    previous = dict(((r['group'], r['name']), r['best']) for r in baseline['results'])
+    comparison = list()
+    for r in results['results']:
+        before = previous.get((r['group'], r['name']))
+        if before:
+            ratio = r['best'] / before
+            comparison.append({"group": r['group'], "name": r['name'], "baseline": before, "best": r['best'],
+                               "ratio": ratio, "regression": ratio > threshold})
+    return comparison
+
+
+def _seconds(value):
+    """
+
+    Format a duration.
+
+    """
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if value >= scale:
+            return "%8.2f %-2s" % (value / scale, unit)
+    return "%8.0f ns" % (value / 1e-9)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks for EasyMoney (no network connection is required).")
+    parser.add_argument("--output", help="save the results, as JSON, to this path.")
+    parser.add_argument("--compare", help="compare the results with those saved previously (as JSON) at this path.")
+    parser.add_argument("--threshold", type=float, default=1.5,
+                        help="slow down (factor) above which a benchmark is reported as a regression.")
+    parser.add_argument("--label", help="a label for the results, e.g., a release.")
+    parser.add_argument("--repeat", type=int, default=5, help="number of runs of each benchmark.")
+    parser.add_argument("--records", type=int, default=1000, help="number of requests in each batch.")
+    args = parser.parse_args()
+
+    rslt = run_benchmarks(repeat=args.repeat, records=args.records, label=args.label)
+    print("%-16s  %-36s  %11s  %11s" % ("group", "benchmark", "best", "median"))
+    for r in rslt['results']:
+        print("%-16s  %-36s  %s  %s" % (r['group'], r['name'], _seconds(r['best']), _seconds(r['median'])))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(rslt, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            comparison = compare(rslt, json.load(f), args.threshold)
+        print("\n%-16s  %-36s  %11s  %11s  %7s" % ("group", "benchmark", "baseline", "now", "ratio"))
+        for c in comparison:
+            print("%-16s  %-36s  %s  %s  %6.2fx%s" % (c['group'], c['name'], _seconds(c['baseline']),
+                                                     _seconds(c['best']), c['ratio'],
+                                                     "  <-- regression" if c['regression'] else ""))
+        if any(c['regression'] for c in comparison):
+            sys.exit(1)
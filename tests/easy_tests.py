@@ -8,10 +8,27 @@
 
 """
 # Imports
+import gc
 import os
 import sys
+import json
+import pickle
+import sqlite3
+import shutil
+import tempfile
+import zipfile
 import unittest
+import warnings
+import weakref
+import threading
+import numpy as np
 import pandas as pd
+from datetime import datetime
+
+try:
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+except ImportError:
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
 
 # Allow access to modules
 sys.path.insert(0, os.path.abspath("."))
@@ -19,13 +36,59 @@ sys.path.insert(0, os.path.abspath("../"))
 
 # Import the tool
 from easymoney.money import EasyPeasy
+from easymoney.coalescer import ConversionCoalescer
+from easymoney.scheduler import RefreshScheduler
+from easymoney.registry import DATA_REGISTRY
+from easymoney.sqlite_store import SQLiteStore
+from easymoney.snapshot import DataSnapshot
+from easymoney.snapshot import build_snapshot
+from easymoney.snapshot import INFLATION_FIELDS
+from easymoney.snapshot import _reused_fields
+from easymoney.snapshot import exchange_fields_from_frame
 from easymoney.easy_pandas import items_null
+from easymoney.easy_pandas import twoD_nested_dict
+from easymoney.options_tools import closest_sorted
+from easymoney.coverage import bitmap_contains
+from easymoney.coverage import closest_available
+from easymoney.support_tools import date_to_epoch_days
+from easymoney.support_tools import to_epoch_days
+from easymoney.sources.ecb_interface import ecb_csv_frame
+from easymoney.sources.ecb_interface import _ecb_xml_parse
+from easymoney.sources.ecb_interface import exchange_data_from_frame
+from easymoney.sources.world_bank_interface import world_bank_pull
+
+try:
+    from concurrent.futures import Future
+except ImportError:
+    Future = None
+
+if sys.version_info >= (3, 5):
+    import asyncio
+    from easymoney.async_money import AsyncEasyPeasy
 
 # Set the Data Path
 data_path = str(os.getcwd()).split("/tests")[0] + "/easymoney/sources/data"
 
+# Local copies of the ECB and World Bank data (so the tests do not require a network connection)
+test_data_path = str(os.getcwd()).split("/tests")[0] + "/tests/test_data"
+sources = {"ecb_source": test_data_path + "/ExchangeRatesDB.csv",
+           "world_bank_source": test_data_path + "/ConsumerPriceIndexDB.csv"}
+
+
+def ecb_history_csv():
+    """
+
+    Reformat the exchange rate test data in the ECB's CSV layout, i.e., that of 'eurofxref-hist.zip'
+    (a 'Date' column followed by one column per currency, with a trailing comma on each line).
+
+    """
+    rates = pd.read_csv(sources["ecb_source"], float_precision="round_trip")
+    rates = rates.pivot(index="Date", columns="Currency", values="Rate").sort_index(ascending=False)
+    return "".join(line + ",\n" for line in rates.to_csv(na_rep="N/A").splitlines())
+
+
 # Create an instance of the tool
-ep = EasyPeasy(fuzzy_threshold=85, data_path=data_path)
+ep = EasyPeasy(fuzzy_threshold=85, data_path=data_path, **sources)
 
 
 
@@ -120,6 +183,60 @@ class OptionTests(unittest.TestCase):
         self.assertEqual(max([len(l) for l in all_dates_options_df["ExchangeDates"] if isinstance(l, list)]) > 2, True)
 
 
+    def test_options_cache(self):
+        """
+        General: test the caching of EasyPeasy().options() tables.
+        Specific: test that
+                  (a) changes to a table returned do not affect later requests.
+                  (b) tables are rebuilt once the data has been refreshed.
+        """
+        # (a)
+        options_df = ep.options(info="all", rformat="table", pretty_print=False)
+        rows = options_df.shape[0]
+        options_df.drop(options_df.index[:10], inplace=True)
+        self.assertEqual(ep.options(info="all", rformat="table", pretty_print=False).shape[0], rows)
+
+        # (b)
+        ep_local = EasyPeasy(data_path=data_path, shared=False, **sources)
+        ep_local.options(info="inflation", rformat="table", pretty_print=False)
+        ep_local._data.snapshot = DataSnapshot(**dict(ep_local._snapshot.fields(),
+                                                      cpi_matrix=np.full_like(ep_local._snapshot.cpi_matrix, np.nan)))
+        options_df = ep_local.options(info="inflation", rformat="table", pretty_print=False)
+        self.assertEqual(options_df["InflationDates"].isnull().all(), True)
+        ep_local.close()
+
+
+    def test_availability_queries(self):
+        """
+        General: test EasyPeasy().available_regions() and EasyPeasy().available_currencies().
+        Specific: test that the regions and currencies found agree with the EasyPeasy().options() table.
+        """
+        options_df = ep.options(info="all", rformat="table", pretty_print=False)
+        overlap = options_df[options_df["Overlap"].notnull()]
+
+        def years(dates):
+            dates = dates if isinstance(dates[0], list) else [dates]
+            return min(int(str(d[0])[-4:]) for d in dates), max(int(str(d[1])[-4:]) for d in dates)
+
+        covered = [a for a, i, e in zip(overlap["Alpha2"], overlap["InflationDates"], overlap["ExchangeDates"])
+                   if years([i])[0] <= 2005 and years([i])[1] >= 2015 and years(e)[0] <= 2005 and years(e)[1] >= 2015]
+        self.assertEqual(ep.available_regions(2005, 2015), sorted(covered))
+        self.assertEqual(set(options_df[options_df["InflationDates"].notnull()]["Alpha2"]) <=
+                         set(ep.available_regions(info="inflation")), True)
+        self.assertEqual(ep.available_regions(1900, 2100), [])
+
+        # Currencies with a rate on a given day (a Monday and a Sunday).
+        self.assertEqual(ep.available_currencies(date="04/01/2010"),
+                         sorted(set(ep._snapshot.exchange_dict["04/01/2010"]) | {"EUR"}))
+        self.assertEqual(ep.available_currencies(date="03/01/2010"), [])
+        self.assertEqual("USD" in ep.available_currencies(start_date="04/01/1999", end_date="01/01/2016"), True)
+
+        with self.assertRaises(ValueError):
+            ep.available_regions(info="currencies")
+        with self.assertRaises(ValueError):
+            ep.available_currencies(date="04/01/2010", end_date="01/01/2016")
+
+
 
 class FunctionalityTests(unittest.TestCase):
     """
@@ -186,6 +303,48 @@ class FunctionalityTests(unittest.TestCase):
         self.assertEqual(FR_currency, "France")
 
 
+    def test_resolve(self):
+        """
+        General: Test the EasyPeasy().resolve() method.
+        Specific: Test that handles hold the codes (and columns) of the entities resolved, without keeping
+                  snapshots alive, and that each method gives the same results for a handle as for the region
+                  or currency it was resolved from.
+        """
+        canada, usd = ep.resolve("Canada"), ep.resolve("USD")
+        self.assertEqual([canada.alpha2, canada.alpha3, canada.currency], ["CA", "CAN", "CAD"])
+        self.assertEqual([usd.alpha2, usd.currency], [None, "USD"])
+        self.assertEqual(ep.region_map(canada, "name"), "Canada")
+        self.assertRaises(ValueError, ep.resolve, "XYZ")
+
+        self.assertEqual(ep.currency_converter(100, canada, usd, "03/09/2016"),
+                         ep.currency_converter(100, "Canada", "USD", "03/09/2016"))
+        self.assertEqual(ep.inflation(canada, 2005, 2012), ep.inflation("Canada", 2005, 2012))
+        self.assertEqual(ep.inflation_calculator(100, canada, 2005, 2012),
+                         ep.inflation_calculator(100, "Canada", 2005, 2012))
+        self.assertEqual(ep.normalize(100, canada, 1990, "latest", base_currency=usd),
+                         ep.normalize(100, "Canada", 1990, "latest", base_currency="USD"))
+        self.assertEqual(ep.currency_converter_batch([(100, canada, usd, "03/09/2016")]),
+                         [ep.currency_converter(100, "CAD", "USD", "03/09/2016")])
+        self.assertEqual(list(ep.batch_preflight(currencies=[[canada, usd]], dates=["03/09/2016"])[1]),
+                         ['no_rate_on_date'])
+        self.assertEqual(ep.exchange_rates(canada, "01/09/2016", "05/09/2016").to_dict(),
+                         ep.exchange_rates("CAD", "01/09/2016", "05/09/2016").to_dict())
+
+        # Columns are those of the snapshot last used.
+        snap = ep._snapshot
+        self.assertEqual([canada.cpi_column, canada.rate_column], [snap.region_index["CA"], snap.currency_index["CAD"]])
+        self.assertEqual(repr(pickle.loads(pickle.dumps(canada))), repr(canada))
+
+        # Handles do not keep the snapshot they were last used with alive.
+        other = pickle.loads(pickle.dumps(snap))
+        self.assertEqual(canada.columns(other), (snap.region_index["CA"], snap.currency_index["CAD"]))
+        other_reference = weakref.ref(other)
+        del other
+        gc.collect()
+        self.assertEqual(other_reference() is None, True)
+        self.assertEqual(canada.columns(snap), (snap.region_index["CA"], snap.currency_index["CAD"]))
+
+
     def test_currency_converter_all(self):
         """
         General: Test the EasyPeasy().currency_converter() method.
@@ -215,6 +374,201 @@ class FunctionalityTests(unittest.TestCase):
         self.assertEqual(sept2_2016_usd_to_eur, 89.34)
 
 
+    def test_currency_converter_frequency(self):
+        """
+        General: Test the EasyPeasy().currency_converter() method.
+        Specific: Test converting between EUR and USD using resampled (annual) rates.
+        """
+        # (1) The average ECB EUR --> USD rate in 2015 was 1.1095.
+        annual_mean_2015 = ep.currency_converter(100, "EUR", "USD", date=2015, frequency="annual")
+
+        # Assert (1) is True.
+        self.assertEqual(annual_mean_2015, 110.95)
+
+        # (2) The first ECB EUR --> USD rate in 2015 (02/01/2015) was 1.2043.
+        annual_first_2015 = ep.currency_converter(100, "EUR", "USD", date="15/06/2015", frequency="annual", how="first")
+
+        # Assert (2) is True.
+        self.assertEqual(annual_first_2015, 120.43)
+
+
+    def test_convert_stream(self):
+        """
+        General: Test the EasyPeasy().convert_stream() method.
+        Specific: Test that streamed conversions (ordered, weekend and out of order dates) match currency_converter().
+        """
+        records = [(100, "EUR", "USD", "01/09/2016")
+                   , (100, "USD", "EUR", "02/09/2016")
+                   , (100, "CAD", "USD", "03/09/2016")  # a Saturday --> fall back.
+                   , {"amount": 100, "from_currency": "USD", "to_currency": "CAD", "date": "30/11/2012"}
+                   , {"amount": 100, "from_currency": "EUR", "to_currency": "USD"}]
+
+        # Convert the records one at a time.
+        expected = [ep.currency_converter(*r) if isinstance(r, tuple) else ep.currency_converter(**r) for r in records]
+
+        # Assert the streamed results are the same.
+        self.assertEqual(list(ep.convert_stream(iter(records))), expected)
+
+        # Assert the known value from test_currency_converter_EUR_USD() is obtained.
+        self.assertEqual(expected[1], 89.34)
+
+
+    def test_currency_converter_batch(self):
+        """
+        General: Test the EasyPeasy().currency_converter_batch() method.
+        Specific: Test that batched conversions match currency_converter() and that errors can be returned.
+        """
+        records = [(100, "EUR", "USD", "01/09/2016")
+                   , (100, "USD", "EUR", "02/09/2016")
+                   , (100, "CAD", "USD", "03/09/2016")  # a Saturday --> fall back.
+                   , (100, "Canada", "Ireland")
+                   , {"amount": 100, "from_currency": "France", "to_currency": "Germany"}]
+
+        # Convert the records one at a time.
+        expected = [ep.currency_converter(*r) if isinstance(r, tuple) else ep.currency_converter(**r) for r in records]
+
+        # Assert the batched results are the same.
+        self.assertEqual(ep.currency_converter_batch(records), expected)
+        self.assertEqual(ep.currency_converter_batch(records[:2], frequency='annual'),
+                         [ep.currency_converter(*r, frequency='annual') for r in records[:2]])
+
+        # Assert an invalid record raises, unless exceptions are returned.
+        invalid = records[:1] + [(100, "USD", "EUR", "31/31/2016")]
+        self.assertRaises(ValueError, ep.currency_converter_batch, invalid)
+        rslt = ep.currency_converter_batch(invalid, return_exceptions=True)
+        self.assertEqual(rslt[0], expected[0])
+        self.assertIsInstance(rslt[1], ValueError)
+
+
+    def test_batch_preflight(self):
+        """
+        General: Test the EasyPeasy().batch_preflight() method.
+        Specific: Test that the reason codes agree with the outcome of processing each request
+                  (with dates given as strings or as a DatetimeIndex).
+        """
+        currencies = [["EUR", "USD"], ["CAD", "USD"], ["Canada", "Ireland"], ["USD", "XYZ"], ["USD", "EUR"]]
+        dates = ["01/09/2016", "03/09/2016", "latest", "01/09/2016", "31/31/2016"]
+        servable, reasons = ep.batch_preflight(currencies=currencies, dates=dates)
+        self.assertEqual(list(reasons), ['ok', 'no_rate_on_date', 'ok', 'unknown_currency', 'invalid_date'])
+        self.assertEqual(list(servable), [True, True, True, False, False])
+
+        # Assert dates may also be supplied as a DatetimeIndex (which is converted to days in a single cast).
+        days = pd.DatetimeIndex(["2016-09-01", "2016-09-03", "2016-09-02", None, "2016-09-01"])
+        self.assertEqual(list(to_epoch_days(days[:3])), [17045, 17047, 17046])
+        self.assertEqual(list(ep.batch_preflight(currencies=currencies, dates=days)[1]),
+                         ['ok', 'no_rate_on_date', 'ok', 'unknown_currency', 'ok'])
+        self.assertRaises(ValueError, to_epoch_days, days)
+
+        # Assert that the requests marked as unservable fail (and those which are not do not).
+        rslt = ep.currency_converter_batch([(100, c[0], c[1], d) for c, d in zip(currencies, dates)],
+                                           return_exceptions=True)
+        self.assertEqual([not isinstance(r, Exception) for r in rslt], list(servable))
+
+        regions = ["CA", "Canada", "ZZ", "US"]
+        years = [[2005, 2010], [1800, "latest"], [2005, 2010], ["20x5", 2010]]
+        servable, reasons = ep.batch_preflight(regions=regions, years=years)
+        self.assertEqual(list(reasons), ['ok', 'no_cpi_for_year', 'unknown_region', 'invalid_year'])
+        self.assertEqual(list(servable), [True, True, False, False])
+
+        # Without falling back, requests without data for the date (year) requested cannot be served.
+        ep_strict = EasyPeasy(fall_back=False, data_path=data_path, **sources)
+        self.assertEqual(list(ep_strict.batch_preflight(regions=regions, years=years)[0]), [True, False, False, False])
+        ep_strict.close()
+
+        self.assertRaises(ValueError, ep.batch_preflight, currencies=currencies, dates=dates[:2])
+        self.assertRaises(ValueError, ep.batch_preflight, dates=dates)
+
+
+    def test_fall_back_report(self):
+        """
+        General: Test the EasyPeasy().fall_back_report() method.
+        Specific: Test that fall backs are counted (without warnings, if disabled, and across threads)
+                  and returned by batches, and that repeated fall backs only warn once.
+        """
+        ep_quiet = EasyPeasy(fall_back_warnings=False, data_path=data_path, **sources)
+        records = [(100, "CAD", "USD", "03/09/2016")] * 3 + [(100, "CAD", "USD", "02/09/2016")]
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            rslt, fall_backs = ep_quiet.currency_converter_batch(records, return_fall_backs=True)
+            ep_quiet.inflation_calculator(100, "CA", 1800, 2010)
+        self.assertEqual(len(caught), 0)
+
+        # Assert the results are unaffected and the fall backs made by the batch are summarized.
+        self.assertEqual(rslt, ep.currency_converter_batch(records))
+        self.assertEqual(fall_backs[["Type", "Key", "Requested", "Count"]].values.tolist(),
+                         [["exchange", "CAD", "03/09/2016", 3], ["exchange", "USD", "03/09/2016", 3]])
+
+        # Assert the report for the instance includes both batched and single calls.
+        report = ep_quiet.fall_back_report(reset=True)
+        self.assertEqual(report["Type"].tolist(), ["exchange", "exchange", "inflation"])
+        self.assertEqual(report["Requested"].iloc[-1], "1800")
+        self.assertEqual(ep_quiet.fall_back_report().shape[0], 0)
+
+        # Assert fall backs made by several threads (including those which have finished) are all counted.
+        threads = [threading.Thread(target=ep_quiet.currency_converter_batch, args=(records,)) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        ep_quiet.currency_converter(100, "CAD", "USD", "03/09/2016")
+        self.assertEqual(ep_quiet.fall_back_report(reset=True)["Count"].tolist(), [13, 13])
+        self.assertEqual(ep_quiet.fall_back_report().shape[0], 0)
+        ep_quiet.close()
+
+        # Assert a batch of repeated fall backs only warns once for each currency (until the report is reset).
+        ep_loud = EasyPeasy(data_path=data_path, shared=False, **sources)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            records = [(100, "CAD", "USD", "03/09/2016"), (100, "CAD", "USD", "04/09/2016")] * 50
+            ep_loud.currency_converter_batch(records)
+            self.assertEqual(len(caught), 2)
+            self.assertEqual("fall_back_report()" in str(caught[0].message), True)
+            ep_loud.fall_back_report(reset=True)
+            ep_loud.currency_converter(100, "CAD", "USD", "03/09/2016")
+            self.assertEqual(len(caught), 4)
+        self.assertEqual(ep_loud.fall_back_report()["Count"].tolist(), [1, 1])
+        ep_loud.close()
+
+
+    @unittest.skipIf(Future is None, "requires concurrent.futures (the `futures` package on python 2)")
+    def test_conversion_coalescer(self):
+        """
+        General: Test the ConversionCoalescer() class.
+        Specific: Test that concurrent requests from many threads are batched and receive the correct results.
+        """
+        requests = [(100 + i, "USD", "EUR", "02/09/2016") for i in range(50)] + [(100, "USD", "EUR", "31/31/2016")]
+        expected = [ep.currency_converter(*r) for r in requests[:-1]]
+
+        batches = list()
+        class CountingEasyPeasy(object):
+            def currency_converter_batch(self, records, *args, **kwargs):
+                batches.append(len(records))
+                return ep.currency_converter_batch(records, *args, **kwargs)
+
+        with ConversionCoalescer(CountingEasyPeasy(), max_delay=0.05) as coalescer:
+            results = [None] * len(requests)
+
+            def convert(i):
+                try:
+                    results[i] = coalescer.currency_converter(*requests[i])
+                except ValueError as e:
+                    results[i] = e
+
+            threads = [threading.Thread(target=convert, args=(i,)) for i in range(len(requests))]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        # Assert the results are correct and were obtained in fewer batches than requests.
+        self.assertEqual(results[:-1], expected)
+        self.assertIsInstance(results[-1], ValueError)
+        self.assertLess(len(batches), len(requests))
+
+        # Assert requests are refused once the coalescer has been closed.
+        self.assertRaises(RuntimeError, coalescer.submit, 100, "USD", "EUR")
+
+
     def test_inflation_rate(self):
         """
         General: test the EasyPeasy().inflation_rate() method.
@@ -328,6 +682,482 @@ class FunctionalityTests(unittest.TestCase):
         #       (iii) http://www.bankofcanada.ca/rates/exchange/10-year-converter/
 
 
+    def test_refresh(self):
+        """
+        General: Test the EasyPeasy().refresh() method.
+        Specific: test that refreshing exchange rate information swaps in a new snapshot and leaves the CPI data intact.
+        """
+        # Take a reference to the current snapshot
+        old_snapshot = ep._snapshot
+
+        # Reload exchange rate information only (this will not swap in a new snapshot if the ECB data is unchanged).
+        swapped = ep.refresh(exchange=True, inflation=False)
+
+        # Assert a new snapshot has been swapped in, if reported, and that it shares the CPI information of the old one.
+        self.assertEqual(ep._snapshot is not old_snapshot, swapped)
+        self.assertEqual(ep._snapshot.cpi_dict is old_snapshot.cpi_dict, True)
+
+        # Assert snapshots cannot be altered.
+        self.assertRaises(AttributeError, setattr, ep._snapshot, 'exchange_dict', {})
+
+        # Assert the known value from test_currency_converter_EUR_USD() is still obtained.
+        self.assertEqual(ep.currency_converter(100, "EUR", "USD", date="02/09/2016"), 111.93)
+
+
+    def test_shared_data(self):
+        """
+        General: Test sharing data between EasyPeasy() instances.
+        Specific: test that an instance with the same sources shares the data of `ep` and releases it when closed
+                  or, if it is never closed, when it is garbage collected (once only).
+        """
+        key = DATA_REGISTRY.key(ep._source_options, data_path)
+        references = ep._data.references
+
+        with EasyPeasy(precision=4, data_path=data_path, **sources) as ep_b:
+            # Assert the data is shared, but not the configuration.
+            self.assertEqual(ep_b._snapshot is ep._snapshot, True)
+            self.assertEqual(ep_b._data.references, references + 1)
+            self.assertEqual(ep_b.currency_converter(100, "USD", "CAD", date="02/09/2016"), 130.8228)
+
+        # Assert the reference has been released, but the data is kept for `ep`.
+        self.assertEqual(ep._data.references, references)
+        self.assertEqual(key in DATA_REGISTRY, True)
+
+        ep_c = EasyPeasy(data_path=data_path, **sources)
+        self.assertEqual(ep._data.references, references + 1)
+        del ep_c
+        gc.collect()
+        self.assertEqual(ep._data.references, references)
+
+        ep_d = EasyPeasy(data_path=data_path, **sources)
+        ep_d.close()
+        del ep_d
+        gc.collect()
+        self.assertEqual(ep._data.references, references)
+
+
+    def test_pickling(self):
+        """
+        General: Test pickling EasyPeasy() instances.
+        Specific:
+                (a) an instance unpickled in a process holding the same data shares it.
+                (b) an instance unpickled without that data is restored from the compact payload.
+        """
+        payload = pickle.dumps(ep, pickle.HIGHEST_PROTOCOL)
+
+        # Assert the payload is much smaller than the data pickled naively (i.e., with every field).
+        self.assertLess(len(payload) * 2, len(pickle.dumps(ep._snapshot.fields(), pickle.HIGHEST_PROTOCOL)))
+
+        # (a)
+        restored = pickle.loads(payload)
+        self.assertEqual(restored._data is ep._data, True)
+        self.assertEqual(restored.normalize(100, region="Canadian", from_year=2005, to_year=2012,
+                                            base_currency="USD", exchange_date="30/11/2012"), 114.46)
+        restored.close()
+
+        # (b) Simulate a worker process by restoring the data privately.
+        state = ep.__getstate__()
+        state['config'] = dict(state['config'], shared=False)
+        restored = EasyPeasy.__new__(EasyPeasy)
+        restored.__setstate__(pickle.loads(pickle.dumps(state, pickle.HIGHEST_PROTOCOL)))
+        self.assertEqual(restored._data is ep._data, False)
+        self.assertEqual(restored._snapshot.exchange_dict == ep._snapshot.exchange_dict, True)
+        self.assertEqual(restored._snapshot.currency_date_record_range == ep._snapshot.currency_date_record_range, True)
+        self.assertEqual(restored.currency_converter(100, "CAD", "USD", date="03/09/2016"),
+                         ep.currency_converter(100, "CAD", "USD", date="03/09/2016"))
+
+
+    def test_snapshot_file(self):
+        """
+        General: Test the EasyPeasy().save_snapshot() and EasyPeasy().load_snapshot() methods.
+        Specific:
+                (a) an instance loaded from a snapshot file gives the same results.
+                (b) reloading an unchanged file does not swap in new data.
+                (c) corrupt files are rejected.
+        """
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "easymoney.snapshot")
+            ep.save_snapshot(path)
+
+            # (a)
+            ep_file = EasyPeasy(snapshot_path=path, fuzzy_threshold=85, data_path=data_path)
+            self.assertEqual(ep_file._data is ep._data, False)
+            self.assertEqual(ep_file._snapshot.cpi_dict == ep._snapshot.cpi_dict, True)
+            self.assertEqual(ep_file._snapshot.rate_tables == ep._snapshot.rate_tables, True)
+            self.assertEqual(ep_file.normalize(100, region="Canadian", from_year=2005, to_year=2012,
+                                               base_currency="USD", exchange_date="30/11/2012"), 114.46)
+            self.assertEqual(ep_file.currency_converter(100, "EUR", "USD", date=2015, frequency="annual"), 110.95)
+
+            # Pickled instances refer to the file.
+            self.assertLess(len(pickle.dumps(ep_file)), 1000)
+
+            # (b)
+            self.assertEqual(ep_file.refresh(), False)
+            self.assertEqual(ep_file.load_snapshot(path), False)
+
+            # (c)
+            with open(path, "rb") as f:
+                content = bytearray(f.read())
+            content[-1] ^= 0xFF
+            with open(path, "wb") as f:
+                f.write(bytes(content))
+            self.assertRaises(ValueError, ep_file.load_snapshot, path)
+            with open(path, "wb") as f:
+                f.write(b"not a snapshot")
+            self.assertRaises(ValueError, ep_file.load_snapshot, path)
+            ep_file.close()
+        finally:
+            shutil.rmtree(directory)
+
+
+    def test_sqlite_backend(self):
+        """
+        General: Test keeping EasyPeasy()'s data in a SQLite database.
+        Specific:
+                (a) a second instance starts from the database without downloading anything.
+                (b) results (including exchange_rates(), which queries the database) match the in-memory data.
+                (c) queries (and options()) only read the data for their currencies and regions from the database.
+                (d) closing the store closes the connections opened by every thread.
+        """
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "easymoney.db")
+            EasyPeasy(sqlite_path=path, data_path=data_path, shared=False, **sources).close()
+
+            # (a) These files do not exist, so data could only have been obtained from the database.
+            ep_db = EasyPeasy(sqlite_path=path, data_path=data_path, shared=False,
+                              ecb_source=os.path.join(directory, "missing.csv"),
+                              world_bank_source=os.path.join(directory, "missing.json"))
+            self.assertEqual(ep_db._snapshot.exchange_dict == ep._snapshot.exchange_dict, True)
+            self.assertEqual(ep_db._snapshot.cpi_dict == ep._snapshot.cpi_dict, True)
+
+            # (b)
+            self.assertEqual(ep_db.currency_converter(100, "EUR", "USD", date="02/09/2016"), 111.93)
+            self.assertEqual(ep_db.inflation_calculator(100, "US", 1990, 2015), 181.4)
+            rates = ep_db.exchange_rates(["USD", "Canada"], start_date="01/01/2016", end_date="31/03/2016",
+                                         base_currency="USD")
+            self.assertEqual(list(rates.columns), ["Date", "USD", "CAD"])
+            self.assertEqual(rates.equals(ep.exchange_rates(["USD", "CAD"], "01/01/2016", "31/03/2016", "USD")), True)
+            self.assertEqual(rates['Date'].iloc[0], "04/01/2016")
+            ep_db.close()
+
+            # (c)
+            ep_db = EasyPeasy(sqlite_path=path, data_path=data_path, shared=False, **sources)
+            self.assertEqual(ep_db.currency_converter(100, "USD", "CAD", date="30/11/2012"),
+                             ep.currency_converter(100, "USD", "CAD", date="30/11/2012"))
+            self.assertEqual(ep_db.normalize(100, region="CA", from_year=2005, to_year=2012, base_currency="USD",
+                                             exchange_date="30/11/2012"), 114.46)
+            self.assertEqual(ep_db.currency_converter_batch([(100, "USD", "CAD", "30/11/2012"), (100, "GBP", "JPY")]),
+                             ep.currency_converter_batch([(100, "USD", "CAD", "30/11/2012"), (100, "GBP", "JPY")]))
+            stream = [(100, "USD", "CAD", "30/11/2012"), (100, "CAD", "USD", "03/09/2016"), (100, "GBP", "EUR")]
+            self.assertEqual(list(ep_db.convert_stream(stream)), list(ep.convert_stream(stream)))
+            for db_result, result in zip(ep_db.batch_preflight(currencies=["USD", "CAD", "XYZ"],
+                                                               dates=["30/11/2012", "01/12/2012", "30/11/2012"]),
+                                         ep.batch_preflight(currencies=["USD", "CAD", "XYZ"],
+                                                            dates=["30/11/2012", "01/12/2012", "30/11/2012"])):
+                self.assertEqual(list(db_result), list(result))
+            self.assertEqual(ep_db.available_regions(2005, 2015), ep.available_regions(2005, 2015))
+            self.assertEqual(ep_db.available_currencies("02/09/2016"), ep.available_currencies("02/09/2016"))
+            self.assertEqual(ep_db.options(pretty_print=False).equals(ep.options(pretty_print=False)), True)
+            self.assertEqual(ep_db.options('exchange', 'list', pretty_print=False),
+                             ep.options('exchange', 'list', pretty_print=False))
+            scoped = ep_db._snapshot.scoped(currencies=["CAD", "USD"], regions=["CA"])
+            self.assertEqual(sorted(scoped.currency_index), ['CAD', 'EUR', 'USD'])
+            self.assertEqual(sorted(scoped.region_index), ['CA'])
+            self.assertEqual(scoped.date_axis_labels == ep._snapshot.date_axis_labels, True)
+            self.assertEqual(ep_db._snapshot._read_in_full(), False)
+            ep_db.close()
+
+            # (d)
+            store = SQLiteStore(path)
+            opened, closed, errors = threading.Event(), threading.Event(), list()
+
+            def use_connection():
+                connection = store._connection()
+                opened.set()
+                closed.wait()
+                try:
+                    connection.execute("SELECT 1")
+                except sqlite3.ProgrammingError as e:
+                    errors.append(e)
+
+            thread = threading.Thread(target=use_connection)
+            thread.start()
+            opened.wait()
+            store.close()
+            closed.set()
+            thread.join()
+            self.assertEqual(len(errors), 1)
+            self.assertEqual(store.last_day() is not None, True)
+            store.close()
+        finally:
+            shutil.rmtree(directory)
+
+
+    def test_local_sources(self):
+        """
+        General: Test loading data from local copies of the ECB and World Bank data.
+        Specific:
+                (a) a ZIP archive of the ECB's CSV layout and a page of the World Bank API's JSON give the same results.
+                (b) refreshing reads the files again only once they have been modified.
+        """
+        directory = tempfile.mkdtemp()
+        try:
+            ecb_path = os.path.join(directory, "eurofxref-hist.zip")
+            with zipfile.ZipFile(ecb_path, "w") as archive:
+                archive.writestr("eurofxref-hist.csv", ecb_history_csv())
+
+            cpi = pd.read_csv(sources["world_bank_source"], keep_default_na=False, float_precision="round_trip")
+            wb_path = os.path.join(directory, "cpi.json")
+            with open(wb_path, "w") as f:
+                json.dump([{"page": 1, "pages": 1, "total": cpi.shape[0]},
+                           [{"country": {"id": a, "value": c}, "indicator": {"id": "FP.CPI.TOTL", "value": i},
+                             "value": float(v) if v != "" else None, "date": str(y)}
+                            for c, a, i, v, y in zip(cpi.Country, cpi.Alpha2, cpi.Indicator, cpi.CPI, cpi.Year)]], f)
+
+            # (a)
+            ep_local = EasyPeasy(data_path=data_path, ecb_source=ecb_path, world_bank_source=wb_path, shared=False)
+            self.assertEqual(ep_local._snapshot.exchange_dict == ep._snapshot.exchange_dict, True)
+            self.assertEqual(ep_local._snapshot.cpi_dict == ep._snapshot.cpi_dict, True)
+            self.assertEqual(ep_local.normalize(100, region="CA", from_year=2005, to_year=2012, base_currency="USD",
+                                                exchange_date="30/11/2012"), 114.46)
+
+            # (b)
+            self.assertEqual(ep_local.refresh(), False)
+            os.utime(wb_path, (0, 0))
+            old_snapshot = ep_local._snapshot
+            self.assertEqual(ep_local.refresh(), True)
+            self.assertEqual(ep_local._snapshot.rate_matrix is old_snapshot.rate_matrix, True)
+            ep_local.close()
+        finally:
+            shutil.rmtree(directory)
+
+
+    def test_deflator(self):
+        """
+        General: Test loading additional World Bank Indicators and using them in place of CPI information.
+        Specific:
+                (a) an indicator proportional to CPI gives the same rates of inflation.
+                (b) values which differ from CPI change the result.
+                (c) requesting an indicator which has not been loaded raises a ValueError.
+        """
+        directory = tempfile.mkdtemp()
+        try:
+            deflator = pd.read_csv(sources["world_bank_source"], float_precision="round_trip")
+            deflator["Value"] = deflator.CPI * 2
+            deflator.loc[(deflator.Alpha2 == "US") & (deflator.Year == 2015), "Value"] *= 1.5
+            deflator_path = os.path.join(directory, "deflator.csv")
+            deflator.drop("CPI", axis=1).to_csv(deflator_path, index=False)
+
+            ep_deflator = EasyPeasy(data_path=data_path, ecb_source=sources["ecb_source"], shared=False,
+                                    world_bank_source={"FP.CPI.TOTL": sources["world_bank_source"],
+                                                       "NY.GDP.DEFL.ZS": deflator_path},
+                                    indicators=["NY.GDP.DEFL.ZS"])
+            self.assertEqual(ep_deflator._snapshot.cpi_dict == ep._snapshot.cpi_dict, True)
+
+            # (a)
+            self.assertEqual(ep_deflator.inflation("CA", 2005, 2015, deflator="NY.GDP.DEFL.ZS"),
+                             ep.inflation("CA", 2005, 2015))
+            self.assertEqual(ep_deflator.normalize(100, region="CA", from_year=2005, to_year=2012,
+                                                   base_currency="USD", exchange_date="30/11/2012",
+                                                   deflator="NY.GDP.DEFL.ZS"), 114.46)
+
+            # (b)
+            cpi = ep.inflation("US", 2010, 2015, return_raw_cpi_dict=True)
+            values = ep_deflator.inflation("US", 2010, 2015, return_raw_cpi_dict=True, deflator="NY.GDP.DEFL.ZS")
+            self.assertEqual(values, {k: v * (3 if k == 2015 else 2) for k, v in cpi.items()})
+
+            # (c)
+            with self.assertRaises(ValueError):
+                ep.inflation("CA", 2005, 2015, deflator="NY.GDP.DEFL.ZS")
+            ep_deflator.close()
+        finally:
+            shutil.rmtree(directory)
+
+
+    def test_selective_loading(self):
+        """
+        General: Test restricting the data loaded to given currencies, regions and dates.
+        Specific:
+                (a) only the data requested is loaded, and the results within it are unchanged.
+                (b) the CSV and XML parsers apply the same restrictions.
+                (c) a SQLite database loaded for a narrower scope is reloaded for a wider one.
+                (d) scopes which match no data are rejected, and a snapshot without any dates is refreshed in full.
+        """
+        scope = {"currencies": ["USD", "cad"], "regions": ["US", "CA"], "start_date": 2012, "end_date": "31/12/2015"}
+        ep_scoped = EasyPeasy(data_path=data_path, shared=False, **dict(sources, **scope))
+
+        # (a)
+        snap = ep_scoped._snapshot
+        self.assertEqual(sorted(snap.currency_index), ['CAD', 'EUR', 'USD'])
+        self.assertEqual(sorted(snap.region_index), ['CA', 'US'])
+        self.assertEqual(snap.cpi_years, ['2012', '2013', '2014', '2015'])
+        self.assertEqual(snap.date_axis_labels[0], "02/01/2012")
+        self.assertEqual(ep_scoped.currency_converter(100, "USD", "CAD", date="30/11/2012"),
+                         ep.currency_converter(100, "USD", "CAD", date="30/11/2012"))
+        self.assertEqual(ep_scoped.normalize(100, region="CA", from_year=2012, to_year=2015, base_currency="USD",
+                                             exchange_date="30/11/2015"),
+                         ep.normalize(100, region="CA", from_year=2012, to_year=2015, base_currency="USD",
+                                      exchange_date="30/11/2015"))
+        with self.assertRaises(AttributeError):
+            ep_scoped.currency_converter(100, "USD", "GBP", date="30/11/2012")
+        with self.assertRaises(ValueError):
+            EasyPeasy(data_path=data_path, shared=False, currencies=["Canadian Dollar"], **sources)
+        ep_scoped.close()
+
+        # (b)
+        rates = pd.read_csv(sources["ecb_source"], float_precision="round_trip")
+        xml = "<gesmes:Envelope><Cube>%s</Cube></gesmes:Envelope>" % "".join(
+            '<Cube time="%s">%s</Cube>' % (d, "".join('<Cube currency="%s" rate="%r"/>' % (c, r)
+                                                     for c, r in zip(g.Currency, g.Rate)))
+            for d, g in rates.groupby("Date", sort=False))
+        window = {"currencies": ["USD", "JPY"], "start_date": "2010-03-01", "end_date": "2011-06-30"}
+        from_csv = exchange_data_from_frame(ecb_csv_frame(ecb_history_csv().encode("utf-8"), **window))
+        from_xml = _ecb_xml_parse(xml.encode("utf-8"), **window)
+        self.assertEqual(from_csv[0] == from_xml[0], True)
+        self.assertEqual(sorted(from_csv[1]), ['EUR', 'JPY', 'USD'])
+
+        # (c)
+        directory = tempfile.mkdtemp()
+        try:
+            db_path = os.path.join(directory, "easymoney.db")
+            EasyPeasy(data_path=data_path, shared=False, sqlite_path=db_path, **dict(sources, **scope)).close()
+            ep_db = EasyPeasy(data_path=data_path, shared=False, sqlite_path=db_path, **sources)
+            self.assertEqual(ep_db._snapshot.rate_matrix.shape, ep._snapshot.rate_matrix.shape)
+            ep_db.close()
+        finally:
+            shutil.rmtree(directory)
+
+        # (d)
+        for empty_scope in ({"currencies": ["ZZZ"]}, {"currencies": []}, {"regions": ["ZZ"]},
+                            {"start_date": "01/01/2030"}):
+            with self.assertRaises(ValueError):
+                EasyPeasy(data_path=data_path, shared=False, **dict(sources, **empty_scope))
+        no_dates = pd.DataFrame(columns=["USD"], index=pd.DatetimeIndex([]), dtype=float)
+        empty = DataSnapshot(**dict(exchange_fields_from_frame(no_dates), **_reused_fields(ep._snapshot,
+                                                                                           INFLATION_FIELDS)))
+        refreshed = build_snapshot(True, False, base=empty, incremental=True, **sources)
+        self.assertEqual(refreshed.date_axis_labels == ep._snapshot.date_axis_labels, True)
+
+
+    def test_cpi_year_index(self):
+        """
+        General: test the index of years for which CPI information is available.
+        Specific: test that the index agrees with the CPI information and that the closest years are found.
+        """
+        snap = ep._snapshot
+        expected = {}
+        for year, values in snap.cpi_dict.items():
+            for region in values:
+                expected.setdefault(region, []).append(int(year))
+        self.assertEqual({r: y.tolist() for r, y in snap.cpi_year_index.items()},
+                         {r: sorted(y) for r, y in expected.items()})
+        self.assertEqual(snap.alpha2_cpi_record["CA"][0], str(snap.cpi_year_index["CA"][-1]))
+
+        years = np.array([1990, 2000, 2004, 2010])
+        self.assertEqual([closest_sorted(v, years) for v in (1800, 1995, 2002, 2003, 2007.1, 2100)],
+                         [1990, 2000, 2004, 2004, 2010, 2010])
+
+
+    def test_currency_availability(self):
+        """
+        General: test the bitmaps of the dates for which exchange rates are available.
+        Specific: test that they agree with `currency_date_record` and that the closest dates are found.
+        """
+        snap = ep._snapshot
+        bitmaps, first_row, last_row = snap.currency_availability
+        for currency, column in snap.currency_index.items():
+            rows = [r for r in range(len(snap.date_axis)) if bitmap_contains(bitmaps[column], r)]
+            self.assertEqual([snap.date_axis_labels[r] for r in rows], snap.currency_date_record[currency])
+            self.assertEqual([first_row[column], last_row[column]], [rows[0], rows[-1]])
+
+        # 03/09/2016 is a Saturday (--> Friday) and 04/09/2016 a Sunday (--> Monday).
+        column = snap.currency_index["USD"]
+        for date, expected in (("03/09/2016", "02/09/2016"), ("04/09/2016", "05/09/2016"),
+                               ("01/01/1980", snap.currency_date_record_range["USD"][0])):
+            row = closest_available(bitmaps[column], snap.date_axis, date_to_epoch_days(date),
+                                    first_row[column], last_row[column])
+            self.assertEqual(snap.date_axis_labels[row], expected)
+
+        # Without falling back, dates without a rate cannot be used.
+        ep_strict = EasyPeasy(fall_back=False, data_path=data_path, **sources)
+        self.assertRaises(AttributeError, ep_strict.currency_converter, 100, "USD", "CAD", "03/09/2016")
+        ep_strict.close()
+
+
+    def test_native_dates(self):
+        """
+        General: Test that native dates can be used wherever a date string is accepted.
+        Specific: Test that datetimes, dates, numpy.datetime64, pandas Timestamps and ISO 8601 strings
+                  give the same results as dates of the form DD/MM/YYYY.
+        """
+        dates = [datetime(2016, 9, 3, 15, 30), datetime(2016, 9, 3).date(), np.datetime64('2016-09-03'),
+                 pd.Timestamp('2016-09-03'), "2016-09-03"]
+        expected = ep.currency_converter(100, "USD", "CAD", "03/09/2016")
+        for date in dates:
+            self.assertEqual(ep.currency_converter(100, "USD", "CAD", date), expected)
+            self.assertEqual(ep.currency_converter(100, "USD", "CAD", date, frequency='monthly'),
+                             ep.currency_converter(100, "USD", "CAD", "03/09/2016", frequency='monthly'))
+            self.assertEqual(ep.normalize(100, "CA", 2010, 2015, exchange_date=date),
+                             ep.normalize(100, "CA", 2010, 2015, exchange_date="03/09/2016"))
+        self.assertEqual(ep.currency_converter_batch([(100, "USD", "CAD", d) for d in dates]), [expected] * len(dates))
+
+        # Fall backs are reported against the date requested, whatever its type.
+        ep.fall_back_report(reset=True)
+        ep.currency_converter(100, "USD", "CAD", pd.Timestamp('2016-09-03'))
+        self.assertEqual(set(ep.fall_back_report(reset=True)['Requested']), {"03/09/2016"})
+
+        # Arrays of datetime64 can be checked directly.
+        dates = np.array(['2016-09-02', '2016-09-03', 'NaT'], dtype='datetime64[D]')
+        servable, reasons = ep.batch_preflight(currencies=["USD", "USD", "USD"], dates=dates)
+        self.assertEqual(list(reasons), ['ok', 'no_rate_on_date', 'invalid_date'])
+        self.assertEqual(list(ep.batch_preflight(currencies=["USD"], dates=[pd.Timestamp('2016-09-02')])[1]), ['ok'])
+
+        self.assertEqual(ep.available_currencies(date=datetime(2016, 9, 2)), ep.available_currencies(date="02/09/2016"))
+        self.assertRaises(ValueError, ep.currency_converter, 100, "USD", "CAD", pd.NaT)
+
+
+    def test_nested_dict(self):
+        """
+        General: Test easy_pandas.twoD_nested_dict().
+        Specific:
+                (a) CPI information is nested exactly as by ``world_bank_pull(return_as='dict')``.
+                (b) keys are converted to (upper case) strings, later rows take precedence and the
+                    dataframe passed is not altered.
+        """
+        # (a)
+        df = world_bank_pull(source=sources["world_bank_source"])
+        self.assertEqual(twoD_nested_dict(df, 'Year', 'Alpha2', df.columns[3]),
+                         world_bank_pull(return_as='dict', source=sources["world_bank_source"]))
+
+        # (b)
+        df = pd.DataFrame({'a': ['x', 'y', 'x', 'x'], 'b': [1, 2, 3, 1], 'c': [0.5, 1.5, 2.5, 3.5]})
+        self.assertEqual(twoD_nested_dict(df, engine='fast'), {'X': {'1': 3.5, '3': 2.5}, 'Y': {'2': 1.5}})
+        self.assertEqual(list(df['a']), ['x', 'y', 'x', 'x'])
+        self.assertEqual(twoD_nested_dict(df, to_int=['c']), {'X': {'1': 3, '3': 2}, 'Y': {'2': 1}})
+        self.assertEqual(list(df['c']), [0.5, 1.5, 2.5, 3.5])
+        self.assertRaises(ValueError, twoD_nested_dict, df, to_int=['a'], engine='slow')
+
+
+    def test_ecb_csv_parser(self):
+        """
+        General: Test the (vectorized) parser for the ECB's CSV layout.
+        Specific: test that it gives exactly the same data as the XML parser.
+        """
+        rates = pd.read_csv(sources["ecb_source"], float_precision="round_trip")
+        xml = "<gesmes:Envelope><Cube>%s</Cube></gesmes:Envelope>" % "".join(
+            '<Cube time="%s">%s</Cube>' % (d, "".join('<Cube currency="%s" rate="%r"/>' % (c, r)
+                                                     for c, r in zip(g.Currency, g.Rate)))
+            for d, g in rates.groupby("Date", sort=False))
+
+        from_csv = exchange_data_from_frame(ecb_csv_frame(ecb_history_csv().encode("utf-8")))
+        from_xml = _ecb_xml_parse(xml.encode("utf-8"))
+        self.assertEqual(from_csv[0] == from_xml[0], True)
+        self.assertEqual(from_csv[2] == from_xml[2], True)
+        self.assertEqual(sorted(from_csv[1]), sorted(from_xml[1]))
+
+
     def test_fuzzy_search(self):
         """
         General: Test Fuzzy Search instance of EasyPeasy().
@@ -346,6 +1176,174 @@ class FunctionalityTests(unittest.TestCase):
 
 
 
+
+class StandInECBHandler(BaseHTTPRequestHandler):
+    """
+
+    Local stand-in for the European Central Bank's website (supports conditional requests via ETags).
+
+    """
+
+    days = []
+
+
+    def do_GET(self):
+        body = ("<gesmes:Envelope><Cube>%s</Cube></gesmes:Envelope>" % "".join(
+            '<Cube time="%s">%s</Cube>' % (d, "".join('<Cube currency="%s" rate="%s"/>' % cr for cr in rates))
+            for d, rates in self.days)).encode("utf-8")
+        etag = '"%s"' % str(len(self.days))
+
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+        else:
+            self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+
+    def log_message(self, *args):
+        pass
+
+
+
+class RefreshSchedulerTests(unittest.TestCase):
+    """
+
+    Test Battery for EasyMoney/scheduler's RefreshScheduler() class (against a local stand-in for the ECB).
+
+    """
+
+
+    def setUp(self):
+        StandInECBHandler.days = [("2016-09-02", [("USD", "1.1193"), ("CAD", "1.4665")])]
+        self.server = HTTPServer(("127.0.0.1", 0), StandInECBHandler)
+        self.server_thread = threading.Thread(target=self.server.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+
+        # Injectable Clock
+        self.now = datetime(2016, 9, 5, 10, 0)
+
+        self.local_ep = EasyPeasy(ecb_url="http://127.0.0.1:%d/" % self.server.server_address[1],
+                                  world_bank_source=sources['world_bank_source'])
+
+
+    def tearDown(self):
+        self.local_ep.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+    def test_run_pending(self):
+        """
+        General: test the RefreshScheduler().run_pending() method.
+        Specific:
+                (a) nothing is refreshed before it is due.
+                (b) new data is swapped in after the daily exchange rate refresh time.
+                (c) unchanged data (HTTP 304) does not replace the current snapshot, is not reported as refreshed
+                    and is retried after `retry_interval`.
+                (d) the retry picks up rates published later that day.
+                (e) rates which are still unchanged at the end of the day are next requested the following day.
+        """
+        scheduler = RefreshScheduler(self.local_ep, exchange_time="15:30", clock=lambda: self.now)
+
+        # (a) Nothing is due at 10:00.
+        self.assertEqual(scheduler.run_pending(), [])
+        self.assertEqual(self.local_ep.currency_converter(100, "EUR", "USD", date="02/09/2016"), 111.93)
+
+        # (b) The ECB publishes a new day of rates; the scheduler picks it up after 15:30.
+        StandInECBHandler.days = [("2016-09-05", [("USD", "1.1146"), ("CAD", "1.4533")])] + StandInECBHandler.days
+        old_snapshot = self.local_ep._snapshot
+        self.now = datetime(2016, 9, 5, 16, 0)
+        self.assertEqual(scheduler.run_pending(), ["exchange"])
+        self.assertEqual(self.local_ep._snapshot is not old_snapshot, True)
+        self.assertEqual(self.local_ep.currency_converter(100, "EUR", "USD", date="05/09/2016"), 111.46)
+        self.assertEqual(self.local_ep.currency_converter(100, "EUR", "USD", date="02/09/2016"), 111.93)
+        self.assertEqual(scheduler.next_exchange_refresh, datetime(2016, 9, 6, 15, 30))
+
+        # (c) Nothing new has been published by the following day.
+        current_snapshot = self.local_ep._snapshot
+        self.now = datetime(2016, 9, 6, 16, 0)
+        self.assertEqual(scheduler.run_pending(), [])
+        self.assertEqual(self.local_ep._snapshot is current_snapshot, True)
+        self.assertEqual(scheduler.next_exchange_refresh, datetime(2016, 9, 6, 16, 15))
+
+        # (d)
+        StandInECBHandler.days = [("2016-09-06", [("USD", "1.1158"), ("CAD", "1.4512")])] + StandInECBHandler.days
+        self.now = datetime(2016, 9, 6, 16, 15)
+        self.assertEqual(scheduler.run_pending(), ["exchange"])
+        self.assertEqual(self.local_ep.currency_converter(100, "EUR", "USD", date="06/09/2016"), 111.58)
+        self.assertEqual(scheduler.next_exchange_refresh, datetime(2016, 9, 7, 15, 30))
+
+        # (e)
+        self.now = datetime(2016, 9, 7, 23, 50)
+        self.assertEqual(scheduler.run_pending(), [])
+        self.assertEqual(scheduler.next_exchange_refresh, datetime(2016, 9, 8, 15, 30))
+
+
+    def test_background_thread(self):
+        """
+        General: test the RefreshScheduler().start() and RefreshScheduler().stop() methods.
+        """
+        with RefreshScheduler(self.local_ep, poll_interval=0.01, clock=lambda: self.now) as scheduler:
+            self.assertEqual(scheduler.running, True)
+        self.assertEqual(scheduler.running, False)
+
+
+
+
+@unittest.skipIf(sys.version_info < (3, 5), "requires asyncio (python 3.5+)")
+class AsyncTests(unittest.TestCase):
+    """
+
+    Test Battery for EasyMoney/async_money's AsyncEasyPeasy() class.
+
+    """
+
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+
+    def tearDown(self):
+        asyncio.set_event_loop(None)
+        self.loop.close()
+
+
+    def test_create_coalescing(self):
+        """
+        General: test the AsyncEasyPeasy.create() method.
+        Specific: test that concurrent requests for the same data share a single load.
+        """
+        aep_a, aep_b = self.loop.run_until_complete(asyncio.gather(
+            AsyncEasyPeasy.create(data_path=data_path, **sources),
+            AsyncEasyPeasy.create(data_path=data_path, **sources)))
+
+        # Assert both awaiters received the same underlying instance.
+        self.assertEqual(aep_a.easy_peasy is aep_b.easy_peasy, True)
+
+
+    def test_awaitable_methods(self):
+        """
+        General: test the conversion, inflation and normalization coroutines.
+        Specific: test them against the known values used in FunctionalityTests.
+        """
+        aep = AsyncEasyPeasy(ep)
+        results = self.loop.run_until_complete(asyncio.gather(
+            aep.currency_converter(100, "EUR", "USD", date="02/09/2016"),
+            aep.inflation_calculator(100, "US", 1990, 2015),
+            aep.normalize(100, region="CA", from_year=2005, to_year=2012, base_currency="USD",
+                          exchange_date="30/11/2012")))
+
+        # Assert the results are as expected.
+        self.assertEqual(results, [111.93, 181.4, 114.46])
+
+
+
 # Run Tests
 unittest.main()
 